@@ -0,0 +1 @@
+"""Define benchmarks."""
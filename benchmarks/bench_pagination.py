@@ -0,0 +1,72 @@
+"""Benchmark sequential vs. concurrent pagination against a local stub server.
+
+Run with: python -m benchmarks.bench_pagination
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from aiolinkding import Client
+
+from linkding_cli.helpers.pagination import async_iter_pages
+
+from .stub_server import StubServer
+
+
+async def async_time_pagination(server: StubServer, parallel: int) -> float:
+    """Time how long it takes to page through every bookmark.
+
+    Args:
+        server: A running stub server.
+        parallel: The maximum number of concurrent requests.
+
+    Returns:
+        The elapsed wall-clock time (in seconds).
+    """
+    client = Client(server.url, "abcde_1234")
+    result_count = 0
+
+    start = time.perf_counter()
+    async for page in async_iter_pages(
+        client.bookmarks.async_get_all, parallel=parallel
+    ):
+        result_count += len(page["results"])
+    elapsed = time.perf_counter() - start
+
+    assert result_count == server.bookmark_count
+    return elapsed
+
+
+async def async_main(bookmark_count: int, latency: float, parallel: int) -> None:
+    """Run the benchmark.
+
+    Args:
+        bookmark_count: The number of bookmarks in the stub library.
+        latency: The simulated round-trip latency (in seconds).
+        parallel: The maximum number of concurrent requests.
+    """
+    async with StubServer(
+        bookmark_count=bookmark_count, latency=latency
+    ).async_serve() as server:
+        sequential = await async_time_pagination(server, 1)
+        concurrent = await async_time_pagination(server, parallel)
+
+    print(f"{bookmark_count} bookmarks, {latency * 1000:.0f}ms simulated latency")
+    for label, value in (
+        ("sequential:", f"{sequential:.3f}s"),
+        (f"--parallel {parallel}:", f"{concurrent:.3f}s"),
+        ("speedup:", f"{sequential / concurrent:.1f}x"),
+    ):
+        print(f"  {label:<16}{value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookmarks", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--parallel", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(async_main(args.bookmarks, args.latency, args.parallel))
@@ -0,0 +1,110 @@
+"""Benchmark full-text search latency over a large local mirror.
+
+Run with: python -m benchmarks.bench_search
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from linkding_cli.helpers.mirror import Mirror
+
+# Word frequencies in real text roughly follow Zipf's law, so the generated corpus
+# mixes a few very common words (which match most bookmarks) with a long tail:
+VOCABULARY_SIZE = 20000
+ZIPF_EXPONENT = 1.07
+
+QUERIES = (
+    "w0x",
+    "w10x",
+    "w200x",
+    "w5000x",
+    "w1",
+    '"w3x w4x"',
+    "#w20x w30x",
+    "zzz",
+)
+
+
+def _populate(mirror: Mirror, bookmark_count: int) -> None:
+    """Populate a mirror with random bookmarks.
+
+    Args:
+        mirror: The mirror to populate.
+        bookmark_count: The number of bookmarks to generate.
+    """
+    rng = random.Random(0)
+    vocabulary = [f"w{index}x" for index in range(VOCABULARY_SIZE)]
+    cum_weights = list(
+        itertools.accumulate(
+            1 / (index + 1) ** ZIPF_EXPONENT for index in range(VOCABULARY_SIZE)
+        )
+    )
+
+    def words(count: int) -> list[str]:
+        """Pick random words.
+
+        Args:
+            count: The number of words to pick.
+
+        Returns:
+            The words.
+        """
+        return rng.choices(vocabulary, cum_weights=cum_weights, k=count)
+
+    batch = []
+    for bookmark_id in range(1, bookmark_count + 1):
+        batch.append(
+            {
+                "id": bookmark_id,
+                "url": f"https://example.com/{words(1)[0]}/{bookmark_id}",
+                "title": " ".join(words(8)),
+                "description": " ".join(words(25)),
+                "notes": "",
+                "is_archived": rng.random() < 0.1,
+                "tag_names": words(3),
+                "date_added": "2020-09-26T09:46:23.006313Z",
+                "date_modified": "2020-09-26T09:46:23.006313Z",
+            }
+        )
+        if len(batch) == 10000:
+            mirror.upsert_bookmarks(batch)
+            batch.clear()
+    mirror.upsert_bookmarks(batch)
+
+
+def main(bookmark_count: int, repeat: int) -> None:
+    """Run the benchmark.
+
+    Args:
+        bookmark_count: The number of bookmarks in the mirror.
+        repeat: The number of times to run each query.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mirror = Mirror(Path(tmp_dir) / "mirror.sqlite3")
+        _populate(mirror, bookmark_count)
+
+        print(f"{bookmark_count} bookmarks, top 100 results, median of {repeat} runs")
+        for query in QUERIES:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(mirror.search_bookmarks(query, archived=False, limit=100))
+                timings.append(time.perf_counter() - start)
+            print(f"  {query:<16}{statistics.median(timings) * 1000:.2f}ms")
+
+        mirror.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookmarks", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.bookmarks, args.repeat)
@@ -0,0 +1,295 @@
+"""Define a local stub of the linkding API for benchmarking."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from aiohttp import web
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def _generate_bookmark(bookmark_id: int) -> dict[str, Any]:
+    """Generate a fake bookmark.
+
+    Args:
+        bookmark_id: The ID of the bookmark.
+
+    Returns:
+        A bookmark payload.
+    """
+    # Every tenth bookmark is a near-duplicate of the one before it:
+    if bookmark_id % 10 == 9:
+        url = f"http://www.example.com/{bookmark_id - 1}/?utm_source=stub"
+    else:
+        url = f"https://example.com/{bookmark_id}"
+
+    return {
+        "id": bookmark_id,
+        "url": url,
+        "title": f"Example title {bookmark_id}",
+        "description": "Example description",
+        "notes": "Example notes",
+        "website_title": "Website title",
+        "website_description": "Website description",
+        "is_archived": False,
+        "unread": False,
+        "shared": False,
+        "tag_names": ["tag1", "tag2"],
+        "date_added": "2020-09-26T09:46:23.006313Z",
+        "date_modified": "2020-09-26T16:01:14.275335Z",
+    }
+
+
+def _generate_tag(tag_id: int) -> dict[str, Any]:
+    """Generate a fake tag.
+
+    Args:
+        tag_id: The ID of the tag.
+
+    Returns:
+        A tag payload.
+    """
+    return {
+        "id": tag_id,
+        "name": f"tag{tag_id}",
+        "date_added": "2020-09-26T09:46:23.006313Z",
+    }
+
+
+class StubServer:
+    """Define a stub linkding server with a fixed-size library and artificial latency."""
+
+    def __init__(
+        self, *, bookmark_count: int = 1000, latency: float = 0.0, tag_count: int = 100
+    ) -> None:
+        """Initialize.
+
+        Args:
+            bookmark_count: The number of bookmarks in the library.
+            latency: The number of seconds to wait before answering each request.
+            tag_count: The number of tags in the library.
+        """
+        self.bookmark_count = bookmark_count
+        self.latency = latency
+        self.request_count = 0
+        self.tag_count = tag_count
+        self.url = ""
+
+        self._app = web.Application()
+        self._app.router.add_get("/api/bookmarks/", self._async_get_bookmarks)
+        self._app.router.add_get(
+            "/api/bookmarks/archived/", self._async_get_archived_bookmarks
+        )
+        self._app.router.add_get(
+            "/api/bookmarks/{bookmark_id:\\d+}/", self._async_get_bookmark
+        )
+        self._app.router.add_get("/api/tags/", self._async_get_tags)
+        self._app.router.add_get("/api/tags/{tag_id:\\d+}/", self._async_get_tag)
+        self._app.router.add_get("/api/user/profile/", self._async_get_profile)
+
+        # Writes are acknowledged, but don't change the library:
+        self._app.router.add_post("/api/bookmarks/", self._async_create_bookmark)
+        self._app.router.add_patch(
+            "/api/bookmarks/{bookmark_id:\\d+}/", self._async_get_bookmark
+        )
+        self._app.router.add_delete(
+            "/api/bookmarks/{bookmark_id:\\d+}/", self._async_no_content
+        )
+        for action in ("archive", "unarchive"):
+            self._app.router.add_post(
+                f"/api/bookmarks/{{bookmark_id:\\d+}}/{action}/", self._async_no_content
+            )
+        self._app.router.add_post("/api/tags/", self._async_create_tag)
+
+    async def _async_delay(self) -> None:
+        """Count a request and wait for the configured latency."""
+        self.request_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _paginate(
+        self, request: web.Request, count: int, factory: Any
+    ) -> dict[str, Any]:
+        """Generate a paginated payload.
+
+        Args:
+            request: An aiohttp request.
+            count: The total number of items.
+            factory: A callable that generates an item from an ID.
+
+        Returns:
+            A paginated API response payload.
+        """
+        limit = int(request.query.get("limit", DEFAULT_PAGE_SIZE))
+        offset = int(request.query.get("offset", 0))
+        next_offset = offset + limit
+        next_url = None
+        if next_offset < count:
+            next_url = f"{self.url}{request.path}?limit={limit}&offset={next_offset}"
+        return {
+            "count": count,
+            "next": next_url,
+            "previous": None,
+            "results": [factory(i) for i in range(offset, min(next_offset, count))],
+        }
+
+    async def _async_create_bookmark(self, request: web.Request) -> web.Response:
+        """Respond to a bookmark creation request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        payload = await request.json()
+        return web.json_response(
+            {**_generate_bookmark(self.bookmark_count), **payload}, status=201
+        )
+
+    async def _async_create_tag(self, request: web.Request) -> web.Response:
+        """Respond to a tag creation request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.json_response(_generate_tag(self.tag_count), status=201)
+
+    async def _async_get_bookmark(self, request: web.Request) -> web.Response:
+        """Respond to a single bookmark request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.json_response(
+            _generate_bookmark(int(request.match_info["bookmark_id"]))
+        )
+
+    async def _async_get_archived_bookmarks(self, request: web.Request) -> web.Response:
+        """Respond to an archived bookmark listing request (there are none).
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.json_response(self._paginate(request, 0, _generate_bookmark))
+
+    async def _async_get_bookmarks(self, request: web.Request) -> web.Response:
+        """Respond to a bookmark listing request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.json_response(
+            self._paginate(request, self.bookmark_count, _generate_bookmark)
+        )
+
+    async def _async_get_profile(self, _: web.Request) -> web.Response:
+        """Respond to a user profile request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.json_response({"theme": "auto", "enable_sharing": True})
+
+    async def _async_get_tag(self, request: web.Request) -> web.Response:
+        """Respond to a single tag request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.json_response(_generate_tag(int(request.match_info["tag_id"])))
+
+    async def _async_get_tags(self, request: web.Request) -> web.Response:
+        """Respond to a tag listing request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.json_response(self._paginate(request, self.tag_count, _generate_tag))
+
+    async def _async_no_content(self, _: web.Request) -> web.Response:
+        """Respond to a request that returns no content.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_delay()
+        return web.Response(status=204)
+
+    @asynccontextmanager
+    async def async_serve(self) -> AsyncIterator[StubServer]:
+        """Serve the stub API on a random local port.
+
+        Yields:
+            This server, with its URL populated.
+        """
+        runner = web.AppRunner(self._app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        try:
+            yield self
+        finally:
+            await runner.cleanup()
+
+    @contextmanager
+    def serve_in_thread(self) -> Iterator[StubServer]:
+        """Serve the stub API from a background thread (e.g., for subprocesses).
+
+        Yields:
+            This server, with its URL populated.
+        """
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        stop = asyncio.Event()
+
+        async def async_serve_until_stopped() -> None:
+            """Serve until asked to stop."""
+            async with self.async_serve():
+                ready.set()
+                await stop.wait()
+
+        thread = threading.Thread(
+            target=loop.run_until_complete, args=(async_serve_until_stopped(),)
+        )
+        thread.start()
+        ready.wait()
+        try:
+            yield self
+        finally:
+            loop.call_soon_threadsafe(stop.set)
+            thread.join()
+            loop.close()
@@ -0,0 +1,451 @@
+"""Benchmark CLI startup and per-request overhead, and check for regressions.
+
+Measures:
+    - import: the time to import linkding_cli.cli (via `python -X importtime`)
+    - startup.<command>: the time from spawning `linkding <command>` (against a local
+      stub of the linkding API) to the first byte of its output, for every command
+    - daemon.request: the time for the thin client to run `linkding user profile` in a
+      running daemon (a cached read), from connecting to receiving its output
+    - request.client/request.raw: the mean time per API request made through
+      LinkDingClient and through a bare aiohttp session (the difference being the
+      client's overhead)
+
+Run with: python -m benchmarks.suite --output results.json
+
+To fail on regressions, compare against a baseline (e.g., from the main branch):
+    python -m benchmarks.suite --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import typer
+from aiohttp import ClientSession
+
+from linkding_cli.cli import APP
+from linkding_cli.client import LinkDingClient
+from linkding_cli.helpers.daemon import ENV_DAEMON_SOCKET, request
+
+from .stub_server import StubServer
+
+DEFAULT_THRESHOLDS_PATH = Path(__file__).parent / "thresholds.json"
+
+TEST_TOKEN = "abcde_1234"  # noqa: S105
+
+# The arguments to benchmark each command with; a command that's missing from here
+# fails the suite, so that new commands can't go unmeasured. Commands are run in
+# this order (e.g., `bookmarks search` needs the mirror built by `sync`):
+COMMAND_ARGS: dict[str, list[str]] = {
+    "sync": [],
+    "batch": [],
+    "bookmarks all": [],
+    "bookmarks archive": ["1"],
+    "bookmarks create": ["https://example.com"],
+    "bookmarks dedupe": [],
+    "bookmarks delete": ["1"],
+    "bookmarks export": [],
+    "bookmarks get": ["1"],
+    "bookmarks import": ["{import_file}", "--no-skip-existing"],
+    "bookmarks search": ["example"],
+    "bookmarks unarchive": ["1"],
+    "bookmarks update": ["1", "--title", "Example"],
+    "daemon": ["--idle-timeout", "0.1"],
+    "shell": [],
+    "tags all": [],
+    "tags create": ["example"],
+    "tags get": ["1"],
+    "tags merge": ["tag1", "example"],
+    "tags retag": ["--add", "example"],
+    "user profile": [],
+}
+
+# The standard input to run commands that read it with:
+COMMAND_STDIN: dict[str, str] = {
+    "batch": "user profile\n",
+    "shell": "user profile\n",
+}
+
+
+def _iter_command_names() -> Iterator[str]:
+    """Iterate over the full names of every (leaf) command the CLI has.
+
+    Yields:
+        A command name (e.g., "bookmarks get").
+    """
+
+    def walk(command: Any, prefix: str) -> Iterator[str]:
+        """Walk a (possibly nested) command group.
+
+        Args:
+            command: A Click command or group.
+            prefix: The name of the command's parent group.
+
+        Yields:
+            A command name.
+        """
+        for name, subcommand in sorted(command.commands.items()):
+            full_name = f"{prefix} {name}".strip()
+            if hasattr(subcommand, "commands"):
+                yield from walk(subcommand, full_name)
+            else:
+                yield full_name
+
+    yield from walk(typer.main.get_command(APP), "")
+
+
+def _summarize(timings: list[float]) -> dict[str, Any]:
+    """Summarize a set of timings.
+
+    Args:
+        timings: Timings (in milliseconds).
+
+    Returns:
+        The median and the individual timings.
+    """
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "runs_ms": [round(timing, 3) for timing in timings],
+    }
+
+
+def _get_env(tmp_dir: str, server: StubServer) -> dict[str, str]:
+    """Get the environment to run commands against a stub server in.
+
+    Args:
+        tmp_dir: A temporary directory for local data.
+        server: A running stub server.
+
+    Returns:
+        The environment variables.
+    """
+    return {
+        **os.environ,
+        ENV_DAEMON_SOCKET: str(Path(tmp_dir) / "daemon.sock"),
+        "LINKDING_DATA_DIR": tmp_dir,
+        "LINKDING_TOKEN": TEST_TOKEN,
+        "LINKDING_URL": server.url,
+    }
+
+
+def bench_import(runs: int) -> dict[str, Any]:
+    """Benchmark the time to import the CLI.
+
+    Args:
+        runs: The number of times to measure.
+
+    Returns:
+        A benchmark summary.
+    """
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", "import linkding_cli.cli"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        # Each line looks like "import time: <self us> | <cumulative us> | <name>":
+        for line in result.stderr.splitlines():
+            _, cumulative, name = line.split("|")
+            if name.strip() == "linkding_cli.cli":
+                timings.append(int(cumulative) / 1000)
+    return _summarize(timings)
+
+
+def bench_startup(runs: int, server: StubServer) -> dict[str, dict[str, Any]]:
+    """Benchmark the time from spawning each command to the first byte of output.
+
+    Args:
+        runs: The number of times to run each command.
+        server: A running stub server.
+
+    Returns:
+        A benchmark summary per command.
+
+    Raises:
+        RuntimeError: Raised when a command has no benchmark arguments or fails.
+    """
+    if missing := sorted(set(_iter_command_names()) - set(COMMAND_ARGS)):
+        raise RuntimeError(f"No benchmark arguments for: {', '.join(missing)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        import_file = Path(tmp_dir) / "import.ndjson"
+        import_file.write_text(json.dumps({"url": "https://example.com"}) + "\n")
+        env = _get_env(tmp_dir, server)
+
+        for command, args in COMMAND_ARGS.items():
+            argv = [
+                *command.split(),
+                *(arg.format(import_file=import_file) for arg in args),
+            ]
+            timings = []
+            for _ in range(runs):
+                stdin = tempfile.TemporaryFile()
+                stdin.write(COMMAND_STDIN.get(command, "").encode())
+                stdin.seek(0)
+
+                start = time.perf_counter()
+                with (
+                    stdin,
+                    subprocess.Popen(  # noqa: S603
+                        [
+                            sys.executable,
+                            "-c",
+                            "import sys; from linkding_cli.cli import APP; "
+                            "APP(sys.argv[1:], prog_name='linkding')",
+                            *argv,
+                        ],
+                        env=env,
+                        stderr=subprocess.PIPE,
+                        stdin=stdin,
+                        stdout=subprocess.PIPE,
+                    ) as proc,
+                ):
+                    assert proc.stdout
+                    first_byte = proc.stdout.read(1)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    _, stderr = proc.communicate()
+                if proc.returncode or not first_byte:
+                    raise RuntimeError(
+                        f"`linkding {' '.join(argv)}` failed: {stderr.decode()}"
+                    )
+            results[f"startup.{command}"] = _summarize(timings)
+
+    return results
+
+
+def bench_daemon(
+    runs: int, requests_per_run: int, server: StubServer
+) -> dict[str, Any]:
+    """Benchmark the mean time to run a cached read in a daemon.
+
+    Args:
+        runs: The number of times to measure.
+        requests_per_run: The number of sequential commands per measurement.
+        server: A running stub server.
+
+    Returns:
+        A benchmark summary.
+
+    Raises:
+        RuntimeError: Raised when the daemon fails to run the command.
+    """
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = _get_env(tmp_dir, server)
+        with subprocess.Popen(  # noqa: S603
+            [
+                sys.executable,
+                "-c",
+                "from linkding_cli.cli import APP; "
+                "APP(['daemon'], prog_name='linkding')",
+            ],
+            env=env,
+            stdout=subprocess.PIPE,
+        ) as proc:
+            try:
+                assert proc.stdout
+                proc.stdout.readline()
+
+                # The thin client only forwards commands from a matching environment:
+                with patch.dict(os.environ, env, clear=True):
+                    stderr = io.StringIO()
+                    exit_code = request(["user", "profile"], io.StringIO(), stderr)
+                    if exit_code != 0:
+                        raise RuntimeError(
+                            f"The daemon failed ({exit_code}): {stderr.getvalue()}"
+                        )
+                    for _ in range(runs):
+                        start = time.perf_counter()
+                        for _ in range(requests_per_run):
+                            request(["user", "profile"], io.StringIO(), stderr)
+                        timings.append(
+                            (time.perf_counter() - start) * 1000 / requests_per_run
+                        )
+            finally:
+                proc.terminate()
+
+    return _summarize(timings)
+
+
+async def async_bench_requests(
+    runs: int, requests_per_run: int, server: StubServer
+) -> dict[str, dict[str, Any]]:
+    """Benchmark the mean time per API request, with and without the client.
+
+    Args:
+        runs: The number of times to measure.
+        requests_per_run: The number of sequential requests per measurement.
+        server: A running stub server.
+
+    Returns:
+        A benchmark summary for the client and for a bare aiohttp session.
+    """
+    client = LinkDingClient(server.url, TEST_TOKEN)
+    client_timings = []
+    raw_timings = []
+
+    async with client.async_session(), ClientSession() as session:
+        for _ in range(runs):
+            start = time.perf_counter()
+            for _ in range(requests_per_run):
+                await client.user.async_get_profile()
+            client_timings.append(
+                (time.perf_counter() - start) * 1000 / requests_per_run
+            )
+
+            start = time.perf_counter()
+            for _ in range(requests_per_run):
+                async with session.get(
+                    f"{server.url}/api/user/profile/",
+                    headers={"Authorization": f"Token {TEST_TOKEN}"},
+                ) as resp:
+                    await resp.json()
+            raw_timings.append((time.perf_counter() - start) * 1000 / requests_per_run)
+
+    return {
+        "request.client": _summarize(client_timings),
+        "request.raw": _summarize(raw_timings),
+    }
+
+
+def run(runs: int, requests_per_run: int) -> dict[str, Any]:
+    """Run every benchmark.
+
+    Args:
+        runs: The number of times to measure each benchmark.
+        requests_per_run: The number of API requests per request benchmark run.
+
+    Returns:
+        The results, with metadata about the environment they were measured in.
+    """
+    benchmarks: dict[str, Any] = {"import": bench_import(runs)}
+
+    server = StubServer()
+    with server.serve_in_thread():
+        benchmarks.update(bench_startup(runs, server))
+        benchmarks["daemon.request"] = bench_daemon(runs, requests_per_run, server)
+
+    async def async_bench_requests_against_stub() -> dict[str, dict[str, Any]]:
+        """Benchmark requests against a stub server in this event loop.
+
+        Returns:
+            A benchmark summary for the client and for a bare aiohttp session.
+        """
+        async with StubServer().async_serve() as server:
+            return await async_bench_requests(runs, requests_per_run, server)
+
+    benchmarks.update(asyncio.run(async_bench_requests_against_stub()))
+
+    return {
+        "metadata": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def find_regressions(
+    results: dict[str, Any], baseline: dict[str, Any], thresholds: dict[str, Any]
+) -> list[str]:
+    """Compare results with a baseline, returning every regression beyond thresholds.
+
+    A benchmark regresses when its median grows by more than the larger of its
+    `max_increase_ms` and `max_increase_pct` (of the baseline median) thresholds.
+
+    Args:
+        results: The results to check.
+        baseline: The results to compare against.
+        thresholds: A "default" set of thresholds, plus per-benchmark overrides
+            under "benchmarks".
+
+    Returns:
+        A description of each regression.
+    """
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        if (baseline_result := baseline["benchmarks"].get(name)) is None:
+            continue
+        threshold = {
+            **thresholds["default"],
+            **thresholds.get("benchmarks", {}).get(name, {}),
+        }
+        before = baseline_result["median_ms"]
+        after = result["median_ms"]
+        allowed = max(
+            threshold["max_increase_ms"], before * threshold["max_increase_pct"] / 100
+        )
+        if after - before > allowed:
+            regressions.append(
+                f"{name}: {before:.2f}ms -> {after:.2f}ms "
+                f"(+{after - before:.2f}ms, allowed +{allowed:.2f}ms)"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Run the suite from the command line.
+
+    Returns:
+        An exit code (non-zero if any benchmark regressed).
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--baseline", type=Path, help="Results to compare against.")
+    parser.add_argument("--output", type=Path, help="Where to write the results.")
+    parser.add_argument(
+        "--results",
+        type=Path,
+        help="Compare previously written results instead of running the suite.",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS_PATH)
+    args = parser.parse_args()
+
+    if args.results:
+        results = json.loads(args.results.read_text())
+    else:
+        results = run(args.runs, args.requests)
+
+    for name, result in results["benchmarks"].items():
+        print(f"{name:<28}{result['median_ms']:>10.2f}ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if not args.baseline:
+        return 0
+
+    regressions = find_regressions(
+        results,
+        json.loads(args.baseline.read_text()),
+        json.loads(args.thresholds.read_text()),
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""Define the entry point of the CLI."""
+
+from __future__ import annotations
+
+import sys
+
+from linkding_cli.helpers.daemon import forward
+
+
+def main() -> None:
+    """Run the CLI, forwarding the command to a running daemon if there is one."""
+    if (exit_code := forward(sys.argv[1:])) is not None:
+        sys.exit(exit_code)
+
+    # Typer (and everything else) is only imported when running in-process:
+    from linkding_cli.cli import APP  # pylint: disable=import-outside-toplevel
+
+    APP(prog_name="linkding")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,88 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
+import click
 import typer
+from typer.core import TyperGroup
 
+from linkding_cli.commands.batch import batch
 from linkding_cli.commands.bookmark import BOOKMARK_APP
+from linkding_cli.commands.daemon import daemon
+from linkding_cli.commands.shell import shell
+from linkding_cli.commands.sync import sync
 from linkding_cli.commands.tag import TAG_APP
 from linkding_cli.commands.user import USER_APP
-from linkding_cli.const import ENV_CONFIG, ENV_TOKEN, ENV_URL
+from linkding_cli.const import (
+    CONF_METRICS_FILE,
+    ENV_CACHE,
+    ENV_CONFIG,
+    ENV_DATA_DIR,
+    ENV_METRICS_FILE,
+    ENV_OUTPUT,
+    ENV_RATE,
+    ENV_RETRIES,
+    ENV_TOKEN,
+    ENV_URL,
+)
 from linkding_cli.core import LinkDing
 from linkding_cli.helpers.logging import log_exception
 
 
+class LinkDingGroup(TyperGroup):
+    """Define the CLI's root command group."""
+
+    def invoke(self, ctx: click.Context) -> Any:
+        """Invoke the group (and with it, a command).
+
+        Args:
+            ctx: A Click Context object.
+
+        Returns:
+            The command's result.
+        """
+        # Click discards the arguments before it runs the group's callback:
+        args = [*ctx.protected_args, *ctx.args]
+        try:
+            return super().invoke(ctx)
+        except Exception as err:
+            if not isinstance(err, click.exceptions.Exit) or err.exit_code:
+                self._write_failure_metrics(ctx, args)
+            raise
+
+    @staticmethod
+    def _write_failure_metrics(ctx: click.Context, args: list[str]) -> None:
+        """Write metrics for a failed run, unless its command already wrote them.
+
+        A scheduled job that fails before reaching its command (e.g., because of a
+        config error or invalid arguments) mustn't leave the last run's metrics
+        behind.
+
+        Args:
+            ctx: A Click Context object.
+            args: The arguments the group was invoked with.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from linkding_cli.helpers.metrics import MetricsCollector, get_invoked_command
+
+        if (metrics := getattr(ctx.obj, "metrics", None)) is None:
+            if not (metrics_file := ctx.params.get(CONF_METRICS_FILE)):
+                return
+            metrics = MetricsCollector(Path(metrics_file))
+        metrics.close(get_invoked_command(ctx, args))
+
+
 @log_exception()
 def main(
     ctx: typer.Context,
+    cache: bool = typer.Option(
+        None,
+        "--cache/--no-cache",
+        envvar=[ENV_CACHE],
+        help="Cache rarely-changing API responses on disk.",
+        show_default=False,
+    ),
     config: Path = typer.Option(
         None,
         "--config",
@@ -30,6 +98,92 @@ def main(
         metavar="PATH",
         resolve_path=True,
     ),
+    data_dir: Path = typer.Option(
+        None,
+        "--data-dir",
+        envvar=[ENV_DATA_DIR],
+        file_okay=False,
+        dir_okay=True,
+        help="A directory in which to store local data (e.g., the sync mirror).",
+        metavar="PATH",
+        resolve_path=True,
+    ),
+    metrics_file: Path = typer.Option(
+        None,
+        "--metrics-file",
+        envvar=[ENV_METRICS_FILE],
+        dir_okay=False,
+        help=(
+            "Write metrics about the command's run (e.g., for node_exporter's "
+            "textfile collector) to a file at exit."
+        ),
+        metavar="PATH",
+        resolve_path=True,
+    ),
+    output: str = typer.Option(
+        None,
+        "--output",
+        envvar=[ENV_OUTPUT],
+        help=(
+            "The format to output data in (by default, JSON, with one object per "
+            "line for streams of results)."
+        ),
+        metavar="[json|ndjson|csv|tsv]",
+        show_default=False,
+    ),
+    profile: bool = typer.Option(
+        None,
+        "--profile",
+        help=(
+            "Profile the command and print the functions it spent the most time in "
+            "(to stderr) at exit."
+        ),
+        show_default=False,
+    ),
+    profile_file: Path = typer.Option(
+        None,
+        "--profile-file",
+        dir_okay=False,
+        help=(
+            "Save the profile to a file instead (as collapsed stacks, for flame "
+            "graphs, if its name ends in .folded or .collapsed; otherwise, as "
+            "pstats)."
+        ),
+        metavar="PATH",
+        resolve_path=True,
+    ),
+    profile_memory: bool = typer.Option(
+        None,
+        "--profile-memory",
+        help=(
+            "Track the command's memory allocations and print the peak and the top "
+            "allocation sites (to stderr) at exit."
+        ),
+        show_default=False,
+    ),
+    rate: float = typer.Option(
+        None,
+        "--rate",
+        envvar=[ENV_RATE],
+        help=(
+            "The maximum number of API requests to make per second (shared with "
+            "other linkding commands running on this host)."
+        ),
+        metavar="N",
+        show_default=False,
+    ),
+    retries: int = typer.Option(
+        None,
+        "--retries",
+        envvar=[ENV_RETRIES],
+        help=(
+            "The maximum number of times to retry a request that fails because the "
+            "server is busy or unreachable (default: 3)."
+        ),
+        metavar="N",
+        min=0,
+        show_default=False,
+    ),
     token: str = typer.Option(
         None,
         "--token",
@@ -38,6 +192,23 @@ def main(
         help="A linkding API token.",
         metavar="TOKEN",
     ),
+    trace: bool = typer.Option(
+        None,
+        "--trace",
+        help=(
+            "Time every API request and print a summary of their latencies (to "
+            "stderr) at exit."
+        ),
+        show_default=False,
+    ),
+    trace_file: Path = typer.Option(
+        None,
+        "--trace-file",
+        dir_okay=False,
+        help="Also write every traced API request to a file (as JSONL).",
+        metavar="PATH",
+        resolve_path=True,
+    ),
     url: str = typer.Option(
         None,
         "--url",
@@ -57,15 +228,30 @@ def main(
 
     Args:
         ctx: A Typer Context object.
+        cache: Cache rarely-changing API responses on disk.
         config: A path to a config file
+        data_dir: A directory in which to store local data.
+        metrics_file: Write metrics about the command's run to a file at exit.
+        output: The format to output data in.
+        profile: Profile the command and print its hot spots at exit.
+        profile_file: Save the profile to a file instead.
+        profile_memory: Track the command's memory allocations.
+        rate: The maximum number of API requests to make per second.
+        retries: The maximum number of times to retry a failed request.
         token: A linkding API token.
+        trace: Time every API request and print a summary at exit.
+        trace_file: Also write every traced API request to a file.
         url: A URL to a linkding instance.
         verbose: Increase verbosity of standard output.
     """
     ctx.obj = LinkDing(ctx)
 
 
-APP = typer.Typer(callback=main)
+APP = typer.Typer(callback=main, cls=LinkDingGroup)
+APP.command(name="batch")(batch)
 APP.add_typer(BOOKMARK_APP, name="bookmarks", help="Work with bookmarks.")
+APP.command(name="daemon")(daemon)
 APP.add_typer(TAG_APP, name="tags", help="Work with tags.")
+APP.command(name="shell")(shell)
+APP.command(name="sync")(sync)
 APP.add_typer(USER_APP, name="user", help="Work with user info.")
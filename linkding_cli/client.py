@@ -0,0 +1,384 @@
+"""Define an API client."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from http import HTTPStatus
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+    TraceRequestEndParams,
+    TraceResponseChunkReceivedParams,
+)
+from aiolinkding import Client
+from aiolinkding.client import DEFAULT_REQUEST_TIMEOUT
+from aiolinkding.errors import RequestError
+
+from linkding_cli.const import DEFAULT_RETRIES, LOGGER
+from linkding_cli.helpers.cache import ResponseCache
+from linkding_cli.helpers.concurrency import AdaptiveConcurrencyLimiter
+from linkding_cli.helpers.ratelimit import RateLimiter
+from linkding_cli.helpers.retry import get_retry_delay, is_congestion_signal
+from linkding_cli.helpers.tracing import Span, SpanRecorder
+from linkding_cli.helpers.transport import TransportOptions
+
+# The status and headers of the most recent response received by the current
+# request (see LinkDingClient.async_request):
+_RESPONSE_INFO: ContextVar[dict[str, Any] | None] = ContextVar(
+    "_RESPONSE_INFO", default=None
+)
+# The span of the current request, when requests are traced (see
+# LinkDingClient._async_send_once):
+_TRACE_SPAN: ContextVar[Span | None] = ContextVar("_TRACE_SPAN", default=None)
+
+
+async def _async_on_request_end(
+    session: ClientSession,
+    trace_config_ctx: SimpleNamespace,
+    params: TraceRequestEndParams,
+) -> None:
+    """Record the status and headers of a response.
+
+    Args:
+        session: The ClientSession that made the request.
+        trace_config_ctx: The trace context of the request.
+        params: The request/response parameters.
+    """
+    if (response_info := _RESPONSE_INFO.get()) is not None:
+        response_info["status"] = params.response.status
+        response_info["headers"] = params.response.headers
+
+
+async def _async_on_traced_request_end(
+    session: ClientSession,
+    trace_config_ctx: SimpleNamespace,
+    params: TraceRequestEndParams,
+) -> None:
+    """Record when a traced response's headers arrived (and its status).
+
+    Args:
+        session: The ClientSession that made the request.
+        trace_config_ctx: The trace context of the request.
+        params: The request/response parameters.
+    """
+    if span := _TRACE_SPAN.get():
+        span.headers_received = monotonic()
+        span.status = params.response.status
+
+
+async def _async_on_traced_response_chunk_received(
+    session: ClientSession,
+    trace_config_ctx: SimpleNamespace,
+    params: TraceResponseChunkReceivedParams,
+) -> None:
+    """Record when a traced response's body was read (and its size).
+
+    Args:
+        session: The ClientSession that made the request.
+        trace_config_ctx: The trace context of the request.
+        params: The response chunk parameters.
+    """
+    if span := _TRACE_SPAN.get():
+        span.body_received = monotonic()
+        span.size += len(params.chunk)
+
+
+def _generate_span_timestamp_hook(
+    attribute: str,
+) -> Callable[[ClientSession, SimpleNamespace, Any], Awaitable[None]]:
+    """Generate a tracing hook that timestamps a phase of the current request.
+
+    Args:
+        attribute: The span attribute to store the timestamp in.
+
+    Returns:
+        An aiohttp tracing hook.
+    """
+
+    async def async_hook(
+        session: ClientSession, trace_config_ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Timestamp the phase.
+
+        Args:
+            session: The ClientSession that made the request.
+            trace_config_ctx: The trace context of the request.
+            params: The hook's parameters.
+        """
+        if span := _TRACE_SPAN.get():
+            setattr(span, attribute, monotonic())
+
+    return async_hook
+
+
+class LinkDingClient(Client):
+    """Define a linkding API client that can share one HTTP session.
+
+    Every request goes through an adaptive concurrency limit (and an optional rate
+    limit) and is retried (with backoff) when the server is temporarily unable to
+    answer it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        *,
+        cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retries: int = DEFAULT_RETRIES,
+        session: ClientSession | None = None,
+        span_recorders: list[SpanRecorder] | None = None,
+        transport: TransportOptions | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            url: The full URL to a linkding instance.
+            token: A linkding API token.
+            cache: An optional cache of API responses.
+            rate_limiter: An optional limit on the rate of requests.
+            retries: The maximum number of times to retry a failed request.
+            session: An optional aiohttp ClientSession.
+            span_recorders: Optional collectors of request spans (e.g., a tracer).
+            transport: Optional options for the sessions this client opens.
+        """
+        super().__init__(url, token, session=session)
+        self._cache = cache
+        self._rate_limiter = rate_limiter
+        self._retries = retries
+        self._span_recorders = span_recorders or []
+        self._transport = transport or TransportOptions()
+        self.limiter = AdaptiveConcurrencyLimiter()
+
+    async def _async_cached_get(
+        self, cache: ResponseCache, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Make a GET request, answering it from the response cache if possible.
+
+        Fresh cached responses are returned as-is. Stale ones with an ETag or
+        Last-Modified header are revalidated with a conditional request.
+
+        Args:
+            cache: The response cache.
+            endpoint: A relative API endpoint.
+            kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+
+        Raises:
+            RequestError: Raised upon an underlying HTTP error.
+        """
+        params = kwargs.get("params")
+
+        if entry := cache.get(endpoint, params):
+            if entry.fresh:
+                LOGGER.debug("Using cached response for %s", endpoint)
+                return entry.data
+
+            headers = kwargs.setdefault("headers", {})
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response_info: dict[str, Any] = {}
+        token = _RESPONSE_INFO.set(response_info)
+        try:
+            data = await self._async_send("get", endpoint, **kwargs)
+        except RequestError:
+            # A 304 has no JSON body, so aiolinkding treats it as an error:
+            if not entry or response_info.get("status") != HTTPStatus.NOT_MODIFIED:
+                raise
+            LOGGER.debug("Revalidated cached response for %s", endpoint)
+            cache.refresh(endpoint, params)
+            return entry.data
+        finally:
+            _RESPONSE_INFO.reset(token)
+
+        response_headers = response_info.get("headers", {})
+        cache.set(
+            endpoint,
+            params,
+            data,
+            etag=response_headers.get("ETag"),
+            last_modified=response_headers.get("Last-Modified"),
+        )
+        return data
+
+    async def _async_send(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Send an API request, retrying it if the server is temporarily unavailable.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        attempt = 0
+        while True:
+            await self.limiter.async_acquire()
+            try:
+                if self._rate_limiter:
+                    await self._rate_limiter.async_acquire()
+                start = monotonic()
+                data = await self._async_send_once(method, endpoint, attempt, **kwargs)
+            except (asyncio.TimeoutError, ClientError, RequestError) as err:
+                if is_congestion_signal(err):
+                    self.limiter.record_congestion()
+                delay = get_retry_delay(err, method, endpoint, attempt)
+                if delay is None or attempt == self._retries:
+                    raise
+                LOGGER.debug(
+                    "Retrying %s %s in %.2fs (retry %s of %s): %s",
+                    method.upper(),
+                    endpoint,
+                    delay,
+                    attempt + 1,
+                    self._retries,
+                    err,
+                )
+            else:
+                self.limiter.record_latency(monotonic() - start)
+                return data
+            finally:
+                self.limiter.release()
+
+            # Wait without holding a slot:
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _async_send_once(
+        self, method: str, endpoint: str, attempt: int, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Send a single API request (recording its span, if spans are recorded).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            attempt: The number of retries already made.
+            kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        if not self._span_recorders:
+            return await super().async_request(method, endpoint, **kwargs)
+
+        span = Span(method, endpoint, attempt)
+        token = _TRACE_SPAN.set(span)
+        try:
+            data = await super().async_request(method, endpoint, **kwargs)
+        except Exception as err:
+            span.error = str(err) or type(err).__name__
+            raise
+        else:
+            if isinstance(data, dict) and isinstance(data.get("results"), list):
+                span.records = len(data["results"])
+            elif data:
+                span.records = 1
+            return data
+        finally:
+            span.end = monotonic()
+            _TRACE_SPAN.reset(token)
+            for span_recorder in self._span_recorders:
+                span_recorder.record(span)
+
+    async def async_request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Make an API request.
+
+        If a response cache is in use, cacheable GET requests are answered from it
+        and any other request invalidates the cached responses it may affect.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        if self._cache is None:
+            return await self._async_send(method, endpoint, **kwargs)
+
+        if method.lower() == "get":
+            if self._cache.ttl(endpoint) > 0:
+                return await self._async_cached_get(self._cache, endpoint, **kwargs)
+            return await self._async_send(method, endpoint, **kwargs)
+
+        try:
+            return await self._async_send(method, endpoint, **kwargs)
+        finally:
+            self._cache.invalidate(endpoint)
+
+    @asynccontextmanager
+    async def async_session(self) -> AsyncIterator[None]:
+        """Share a single HTTP session across every request made within the context.
+
+        If a session is already open (e.g., from an outer context), it is reused.
+
+        Yields:
+            Nothing; requests made within the context use the shared session.
+        """
+        if self._session and not self._session.closed:
+            yield
+            return
+
+        trace_config = TraceConfig()
+        trace_config.on_request_end.append(_async_on_request_end)
+        if self._span_recorders:
+            for signal, attribute in (
+                (trace_config.on_connection_create_start, "connect_start"),
+                (trace_config.on_connection_create_end, "connect_end"),
+                (trace_config.on_dns_resolvehost_start, "dns_start"),
+                (trace_config.on_dns_resolvehost_end, "dns_end"),
+            ):
+                signal.append(_generate_span_timestamp_hook(attribute))
+            trace_config.on_request_end.append(_async_on_traced_request_end)
+            trace_config.on_response_chunk_received.append(
+                _async_on_traced_response_chunk_received
+            )
+
+        transport = self._transport
+        timeout = (
+            DEFAULT_REQUEST_TIMEOUT if transport.timeout is None else transport.timeout
+        )
+        async with ClientSession(
+            connector=TCPConnector(
+                keepalive_timeout=transport.keepalive_timeout,
+                limit=transport.limit,
+                limit_per_host=transport.limit_per_host,
+                ttl_dns_cache=transport.dns_cache_ttl or None,
+                use_dns_cache=transport.dns_cache_ttl > 0,
+            ),
+            # aiohttp asks for every encoding it can decode unless told otherwise:
+            headers=None if transport.compression else {"Accept-Encoding": "identity"},
+            timeout=ClientTimeout(
+                total=timeout or None,
+                sock_connect=transport.connect_timeout or None,
+                sock_read=transport.read_timeout or None,
+            ),
+            trace_configs=[trace_config],
+        ) as session:
+            self._session = session
+            try:
+                yield
+            finally:
+                self._session = None
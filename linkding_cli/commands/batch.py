@@ -0,0 +1,163 @@
+"""Define the batch command."""
+
+from __future__ import annotations
+
+import io
+import json
+import shlex
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any
+
+import typer
+
+from linkding_cli.errors import LinkDingCliError
+from linkding_cli.helpers.dispatch import OutputCapture, dispatch, get_root_command
+from linkding_cli.helpers.logging import log_exception
+
+
+def _iter_commands(source: typer.FileText) -> Iterator[tuple[int, list[str] | str]]:
+    """Iterate over the commands in a batch file.
+
+    Each non-blank line that isn't a comment is either a command line (e.g.,
+    `bookmarks get 12`) or a JSON object with the command's arguments, as a list
+    (e.g., `{"args": ["bookmarks", "get", "12"]}`) or a single string (e.g.,
+    `{"command": "bookmarks get 12"}`).
+
+    Args:
+        source: The batch file.
+
+    Yields:
+        The line number and either the command's arguments or an error message.
+    """
+    for line_number, line in enumerate(source, start=1):
+        if not (line := line.strip()) or line.startswith("#"):
+            continue
+
+        try:
+            if line.startswith("{"):
+                command = json.loads(line)
+                if isinstance(args := command.get("args"), list):
+                    yield line_number, [str(arg) for arg in args]
+                elif isinstance(command_line := command.get("command"), str):
+                    yield line_number, shlex.split(command_line)
+                else:
+                    yield line_number, 'Expected an "args" list or a "command" string'
+            else:
+                yield line_number, shlex.split(line)
+        except (AttributeError, ValueError) as err:
+            yield line_number, f"Invalid command: {err}"
+
+
+def _parse_output(output: str) -> list[Any]:
+    """Parse a command's output, line by line, keeping JSON lines as JSON.
+
+    Args:
+        output: The command's output.
+
+    Returns:
+        The parsed lines.
+    """
+    parsed: list[Any] = []
+    for line in output.splitlines():
+        try:
+            parsed.append(json.loads(line))
+        except ValueError:
+            parsed.append(line)
+    return parsed
+
+
+@log_exception()
+def batch(
+    ctx: typer.Context,
+    source: typer.FileText = typer.Argument(
+        "-",
+        help="A file of commands (one per line), or - for stdin.",
+        metavar="PATH",
+    ),
+    concurrency: int = typer.Option(
+        1,
+        "--concurrency",
+        help="The maximum number of commands to run at once.",
+        metavar="N",
+        min=1,
+    ),
+) -> None:
+    """Run a file of commands over a single, persistent connection.
+
+    Args:
+        ctx: A Typer Context object.
+        source: A file of commands (one per line).
+        concurrency: The maximum number of commands to run at once.
+
+    Raises:
+        LinkDingCliError: Raised when any of the commands fail.
+    """
+    root = get_root_command()
+    output_capture = OutputCapture()
+    failures = 0
+    total = 0
+
+    def run_command(line_number: int, args: list[str] | str) -> dict[str, Any]:
+        """Run a single command, capturing its output.
+
+        Args:
+            line_number: The line number of the command in the input.
+            args: The command's arguments or an error message.
+
+        Returns:
+            The command's result.
+        """
+        if isinstance(args, str):
+            return {"line": line_number, "exit_code": 2, "output": [], "error": args}
+
+        stderr, stdout = io.StringIO(), io.StringIO()
+        with output_capture.capture(stderr=stderr, stdout=stdout) as captured:
+            exit_code = dispatch(ctx, root, args)
+
+        result = {
+            "line": line_number,
+            "exit_code": exit_code,
+            "output": _parse_output(stdout.getvalue()),
+        }
+        if error := "\n".join([*captured.errors, *stderr.getvalue().splitlines()]):
+            result["error"] = error
+        return result
+
+    def echo_result(result: dict[str, Any]) -> None:
+        """Output a command's result.
+
+        Args:
+            result: The command's result.
+        """
+        nonlocal failures, total
+        total += 1
+        if result["exit_code"]:
+            failures += 1
+        typer.echo(json.dumps(result))
+
+    with ctx.obj.persistent_loop(), output_capture.activate():
+        if concurrency == 1:
+            for line_number, args in _iter_commands(source):
+                echo_result(run_command(line_number, args))
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                pending: set[Future[dict[str, Any]]] = set()
+                for line_number, args in _iter_commands(source):
+                    # Only read as far ahead in the input as there are free workers:
+                    if len(pending) >= concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            echo_result(future.result())
+                    pending.add(executor.submit(run_command, line_number, args))
+                for future in as_completed(pending):
+                    echo_result(future.result())
+
+    if failures:
+        raise LinkDingCliError(f"{failures} of {total} commands failed")
@@ -1,16 +1,51 @@
 """Define the bookmark command."""
+
 # pylint: disable=too-many-positional-arguments
 
 from __future__ import annotations
 
-import asyncio
-import json
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import ExitStack
+from typing import Any, cast
 
+import click
 import typer
 
 from linkding_cli.const import CONF_LIMIT, CONF_OFFSET
+from linkding_cli.errors import LinkDingCliError
+from linkding_cli.helpers.concurrency import async_bounded_map
+from linkding_cli.helpers.exporters import (
+    EXPORT_FORMATS,
+    GZIP_EXTENSION,
+    detect_export_format,
+    open_export_writer,
+)
+from linkding_cli.helpers.importers import (
+    FORMAT_NDJSON,
+    RECORD_ITERATORS,
+    detect_format,
+    iter_bookmarks,
+)
 from linkding_cli.helpers.logging import log_exception
-from linkding_cli.util import generate_api_payload
+from linkding_cli.helpers.output import (
+    OPTION_FIELDS,
+    echo_data,
+    echo_records,
+    open_record_writer,
+    parse_fields,
+)
+from linkding_cli.helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    async_iter_pages,
+    async_write_all_results,
+    generate_page_payload,
+)
+from linkding_cli.helpers.urls import (
+    DEFAULT_IGNORED_PARAMS,
+    build_url_normalizer,
+    hash_url,
+)
+from linkding_cli.util import generate_api_payload, project_record
 
 CONF_DESCRIPTION = "description"
 CONF_IS_ARCHIVED = "is_archived"
@@ -22,20 +57,250 @@ CONF_UNREAD = "unread"
 CONF_URL = "url"
 CONF_NOTES = "notes"
 
+DEDUPE_ACTIONS = ("archive", "delete")
+DEDUPE_KEEP_NEWEST = "newest"
+DEDUPE_KEEP_OLDEST = "oldest"
+DEDUPE_PAGE_SIZE = 1000
+
+EXPORT_PAGE_SIZE = 1000
+
+BULK_OPTION_CONCURRENCY = typer.Option(
+    None,
+    "--concurrency",
+    help=(
+        "The maximum number of requests to have in flight at once (adapted to the "
+        "server by default)."
+    ),
+    metavar="N",
+    min=1,
+)
+BULK_OPTION_IDS_FROM = typer.Option(
+    None,
+    "--ids-from",
+    help="Read additional bookmark IDs (one per line) from a file, or - for stdin.",
+    metavar="PATH",
+    show_default=False,
+)
+
+
+def _iter_bookmark_ids(
+    bookmark_ids: list[int] | None, ids_from: typer.FileText | None
+) -> Iterator[int]:
+    """Iterate over bookmark IDs from the CLI arguments and an optional file.
+
+    Args:
+        bookmark_ids: Bookmark IDs passed as CLI arguments.
+        ids_from: An optional file containing one bookmark ID per line.
+
+    Yields:
+        Bookmark IDs.
+
+    Raises:
+        LinkDingCliError: Raised when a line in the file isn't a valid ID.
+    """
+    yield from bookmark_ids or []
+
+    if ids_from is None:
+        return
+
+    for line in ids_from:
+        if not (line := line.strip()):
+            continue
+        try:
+            yield int(line)
+        except ValueError as err:
+            raise LinkDingCliError(f"Invalid bookmark ID: {line}") from err
+
+
+def _run_bulk_operation(
+    ctx: typer.Context,
+    api_func: Callable[[int], Awaitable[dict[str, Any] | None]],
+    bookmark_ids: list[int] | None,
+    ids_from: typer.FileText | None,
+    concurrency: int | None,
+    status: str | None,
+) -> None:
+    """Run an API operation against one or more bookmarks.
+
+    A single bookmark ID retains the original, human-readable output. Multiple IDs
+    are processed concurrently over one session, with a line of JSON output per ID
+    as each operation completes.
+
+    Args:
+        ctx: A Typer Context object.
+        api_func: The aiolinkding coroutine function to call with each bookmark ID.
+        bookmark_ids: Bookmark IDs passed as CLI arguments.
+        ids_from: An optional file containing one bookmark ID per line.
+        concurrency: The maximum number of requests to have in flight at once.
+        status: The status to report for a successful operation (e.g., "archived"),
+            or None to output the API response payload.
+
+    Raises:
+        LinkDingCliError: Raised when no IDs are provided or any operation fails.
+    """
+    if ids_from is None and bookmark_ids and len(bookmark_ids) == 1:
+        [bookmark_id] = bookmark_ids
+        data = ctx.obj.run(api_func(bookmark_id))
+        if status:
+            typer.echo(f"Bookmark {bookmark_id} {status}.")
+        else:
+            echo_data(ctx, data)
+        return
+
+    async def async_run() -> tuple[int, int]:
+        """Run the operation against every ID.
+
+        Returns:
+            The total number of operations and the number that failed.
+        """
+        total = failed = 0
+        async for bookmark_id, data, err in async_bounded_map(
+            api_func, _iter_bookmark_ids(bookmark_ids, ids_from), concurrency
+        ):
+            total += 1
+            if err:
+                failed += 1
+                writer.write({"id": bookmark_id, "error": str(err)})
+            elif status:
+                writer.write({"id": bookmark_id, "status": status})
+            else:
+                writer.write(data)
+            writer.flush()
+        return total, failed
+
+    fields = ("id", "status", "error") if status else None
+    with open_record_writer(ctx, fields) as writer:
+        total, failed = ctx.obj.run(async_run())
+
+    if not total:
+        raise LinkDingCliError("No bookmark IDs provided")
+    if failed:
+        raise LinkDingCliError(f"{failed} of {total} bookmark operations failed")
+
+
+def _run_local_operation(
+    ctx: typer.Context,
+    func: Callable[[int], dict[str, Any]],
+    bookmark_ids: list[int] | None,
+    ids_from: typer.FileText | None,
+) -> None:
+    """Run a local mirror operation against one or more bookmarks.
+
+    The output matches _run_bulk_operation()'s, but the operation runs synchronously
+    (reading the mirror needs neither the API client nor an event loop).
+
+    Args:
+        ctx: A Typer Context object.
+        func: The function to call with each bookmark ID.
+        bookmark_ids: Bookmark IDs passed as CLI arguments.
+        ids_from: An optional file containing one bookmark ID per line.
+
+    Raises:
+        LinkDingCliError: Raised when no IDs are provided or any operation fails.
+    """
+    if ids_from is None and bookmark_ids and len(bookmark_ids) == 1:
+        [bookmark_id] = bookmark_ids
+        echo_data(ctx, func(bookmark_id))
+        return
+
+    total = failed = 0
+    with open_record_writer(ctx, None) as writer:
+        for bookmark_id in _iter_bookmark_ids(bookmark_ids, ids_from):
+            total += 1
+            try:
+                data = func(bookmark_id)
+            except LinkDingCliError as err:
+                failed += 1
+                writer.write({"id": bookmark_id, "error": str(err)})
+            else:
+                writer.write(data)
+
+    if not total:
+        raise LinkDingCliError("No bookmark IDs provided")
+    if failed:
+        raise LinkDingCliError(f"{failed} of {total} bookmark operations failed")
+
+
+def _echo_local_bookmarks(
+    ctx: typer.Context,
+    *,
+    all_pages: bool,
+    archived: bool,
+    fields: tuple[str, ...] | None,
+    limit: int | None,
+    offset: int | None,
+    query: str | None,
+) -> None:
+    """Echo bookmarks from the local mirror, shaped like the API's output.
+
+    Args:
+        ctx: A Typer Context object.
+        all_pages: Output every matching bookmark, one JSON object per line.
+        archived: Return archived bookmarks.
+        fields: The fields of each bookmark to output (or None for every field).
+        limit: The number of bookmarks to return.
+        offset: The index from which to return results.
+        query: Return bookmarks containing a query string.
+    """
+    mirror = ctx.obj.get_local_mirror()
+
+    if all_pages:
+        echo_records(
+            ctx,
+            mirror.iter_bookmarks(
+                archived=archived, fields=fields, query=query, offset=offset
+            ),
+            fields,
+        )
+        return
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    offset = offset or 0
+    data = generate_page_payload(
+        ctx.obj.config.url,
+        "/api/bookmarks/archived/" if archived else "/api/bookmarks/",
+        list(
+            mirror.iter_bookmarks(
+                archived=archived,
+                fields=fields,
+                query=query,
+                limit=limit,
+                offset=offset,
+            )
+        ),
+        mirror.count_bookmarks(archived=archived, query=query),
+        limit=limit,
+        offset=offset,
+        params=generate_api_payload((("q", query),)),
+    )
+    echo_data(ctx, data)
+
 
 @log_exception()
 def archive(
     ctx: typer.Context,
-    bookmark_id: int = typer.Argument(..., help="The ID of a bookmark to archive."),
+    bookmark_ids: list[int] = typer.Argument(
+        None, help="The IDs of bookmarks to archive.", show_default=False
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+    ids_from: typer.FileText = BULK_OPTION_IDS_FROM,
 ) -> None:
-    """Archive a bookmark by its linkding ID.
+    """Archive one or more bookmarks by their linkding IDs.
 
     Args:
         ctx: A Typer Context object.
-        bookmark_id: The ID of the bookmark to archive.
+        bookmark_ids: The IDs of the bookmarks to archive.
+        concurrency: The maximum number of requests to have in flight at once.
+        ids_from: An optional file containing one bookmark ID per line.
     """
-    asyncio.run(ctx.obj.client.bookmarks.async_archive(bookmark_id))
-    typer.echo(f"Bookmark {bookmark_id} archived.")
+    _run_bulk_operation(
+        ctx,
+        ctx.obj.client.bookmarks.async_archive,
+        bookmark_ids,
+        ids_from,
+        concurrency,
+        "archived",
+    )
 
 
 @log_exception()
@@ -118,46 +383,366 @@ def create(
         )
     )
 
-    data = asyncio.run(ctx.obj.client.bookmarks.async_create(url, **payload))
-    typer.echo(json.dumps(data))
+    data = ctx.obj.run(ctx.obj.client.bookmarks.async_create(url, **payload))
+    echo_data(ctx, data)
 
 
 @log_exception()
 def delete(
     ctx: typer.Context,
-    bookmark_id: int = typer.Argument(..., help="The ID of a bookmark to delete."),
+    bookmark_ids: list[int] = typer.Argument(
+        None, help="The IDs of bookmarks to delete.", show_default=False
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+    ids_from: typer.FileText = BULK_OPTION_IDS_FROM,
+) -> None:
+    """Delete one or more bookmarks by their linkding IDs.
+
+    Args:
+        ctx: A Typer Context object.
+        bookmark_ids: The IDs of the bookmarks to delete.
+        concurrency: The maximum number of requests to have in flight at once.
+        ids_from: An optional file containing one bookmark ID per line.
+    """
+    _run_bulk_operation(
+        ctx,
+        ctx.obj.client.bookmarks.async_delete,
+        bookmark_ids,
+        ids_from,
+        concurrency,
+        "deleted",
+    )
+
+
+@log_exception()
+def dedupe(
+    ctx: typer.Context,
+    action: str = typer.Option(
+        None,
+        "--action",
+        help="Archive or delete the duplicates (keeping one bookmark per URL).",
+        metavar="[archive|delete]",
+    ),
+    archived: bool = typer.Option(
+        False,
+        "--archived",
+        "-a",
+        help="Dedupe archived bookmarks.",
+    ),
+    compare_scheme: bool = typer.Option(
+        False,
+        "--compare-scheme",
+        help="Treat http:// and https:// URLs as different.",
+    ),
+    compare_trailing_slash: bool = typer.Option(
+        False,
+        "--compare-trailing-slash",
+        help="Treat URLs that differ by a trailing slash as different.",
+    ),
+    compare_www: bool = typer.Option(
+        False,
+        "--compare-www",
+        help="Treat URLs that differ by a www. prefix as different.",
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+    ignore_fragment: bool = typer.Option(
+        False,
+        "--ignore-fragment",
+        help="Treat URLs that differ only by #fragment as the same.",
+    ),
+    ignore_params: str = typer.Option(
+        ",".join(DEFAULT_IGNORED_PARAMS),
+        "--ignore-params",
+        help="The query parameters to ignore (glob patterns).",
+        metavar="PARAM1,PARAM2,...",
+    ),
+    keep: str = typer.Option(
+        DEDUPE_KEEP_OLDEST,
+        "--keep",
+        help="Which bookmark of each group of duplicates to keep.",
+        metavar="[oldest|newest]",
+    ),
+    local: bool = typer.Option(
+        False,
+        "--local",
+        help="Find duplicates in the local mirror (see `linkding sync`).",
+    ),
+    parallel: int = typer.Option(
+        None,
+        "--parallel",
+        help=(
+            "The number of pages to fetch concurrently (adapted to the server by "
+            "default)."
+        ),
+        metavar="N",
+        min=1,
+    ),
+) -> None:
+    """Find bookmarks with the same (normalized) URL.
+
+    Args:
+        ctx: A Typer Context object.
+        action: Archive or delete the duplicates.
+        archived: Dedupe archived bookmarks.
+        compare_scheme: Treat http:// and https:// URLs as different.
+        compare_trailing_slash: Treat URLs that differ by a trailing slash as
+            different.
+        compare_www: Treat URLs that differ by a www. prefix as different.
+        concurrency: The maximum number of requests to have in flight at once.
+        ignore_fragment: Treat URLs that differ only by #fragment as the same.
+        ignore_params: The query parameters to ignore.
+        keep: Which bookmark of each group of duplicates to keep.
+        local: Find duplicates in the local mirror.
+        parallel: The number of pages to fetch concurrently.
+
+    Raises:
+        LinkDingCliError: Raised upon an unknown option value or a failed action.
+    """
+    if action and action not in DEDUPE_ACTIONS:
+        raise LinkDingCliError(f"Unknown dedupe action: {action}")
+    if keep not in (DEDUPE_KEEP_NEWEST, DEDUPE_KEEP_OLDEST):
+        raise LinkDingCliError(f"Unknown bookmark to keep: {keep}")
+
+    normalize = build_url_normalizer(
+        compare_scheme=compare_scheme,
+        compare_trailing_slash=compare_trailing_slash,
+        compare_www=compare_www,
+        ignore_fragment=ignore_fragment,
+        ignored_params=[param for param in ignore_params.split(",") if param],
+    )
+    # URLs are normalized and hashed as pages arrive, so only one page (plus a small
+    # key per unique URL) is ever held in memory. We track the first bookmark with
+    # each key, plus every group of duplicates (which is expected to be far smaller):
+    first_ids: dict[int, int] = {}
+    groups: dict[int, list[int]] = {}
+    group_urls: dict[int, str] = {}
+
+    def index(bookmark_id: int, url: str) -> None:
+        """Add a bookmark to the index.
+
+        Args:
+            bookmark_id: The ID of the bookmark.
+            url: The URL of the bookmark.
+        """
+        normalized_url = normalize(url)
+        key = hash_url(normalized_url)
+        if (first_id := first_ids.setdefault(key, bookmark_id)) == bookmark_id:
+            return
+        if key not in groups:
+            groups[key] = [first_id, bookmark_id]
+            group_urls[key] = normalized_url
+        elif bookmark_id not in groups[key]:
+            groups[key].append(bookmark_id)
+
+    async def async_index() -> None:
+        """Index every bookmark from the API."""
+        if archived:
+            api_func = ctx.obj.client.bookmarks.async_get_archived
+        else:
+            api_func = ctx.obj.client.bookmarks.async_get_all
+        async for page in async_iter_pages(
+            api_func, parallel=parallel, limit=DEDUPE_PAGE_SIZE
+        ):
+            for bookmark in page["results"]:
+                index(bookmark["id"], bookmark[CONF_URL])
+
+    # Index the bookmarks and act on the duplicates over one connection pool (closed
+    # before the command returns, so that it's part of the command's profile):
+    with ExitStack() as stack:
+        if action and not local:
+            stack.enter_context(ctx.obj.persistent_loop())
+
+        if local:
+            mirror = ctx.obj.get_local_mirror()
+            for bookmark_id, url in mirror.iter_bookmark_urls(archived=archived):
+                index(bookmark_id, url)
+        else:
+            ctx.obj.run(async_index())
+
+        keep_ids = {
+            key: min(ids) if keep == DEDUPE_KEEP_OLDEST else max(ids)
+            for key, ids in groups.items()
+        }
+
+        if not action:
+            with open_record_writer(ctx, ("url", "keep", "duplicates")) as writer:
+                for key, ids in groups.items():
+                    writer.write(
+                        {
+                            "url": group_urls[key],
+                            "keep": keep_ids[key],
+                            "duplicates": sorted(set(ids) - {keep_ids[key]}),
+                        }
+                    )
+            return
+
+        duplicates = {
+            bookmark_id: keep_ids[key]
+            for key, ids in groups.items()
+            for bookmark_id in sorted(ids)
+            if bookmark_id != keep_ids[key]
+        }
+        if action == "archive":
+            api_func = ctx.obj.client.bookmarks.async_archive
+        else:
+            api_func = ctx.obj.client.bookmarks.async_delete
+        status = f"{action}d"
+
+        async def async_run() -> tuple[int, int]:
+            """Run the action against every duplicate.
+
+            Returns:
+                The total number of operations and the number that failed.
+            """
+            total = failed = 0
+            async for bookmark_id, _, err in async_bounded_map(
+                api_func, duplicates, concurrency
+            ):
+                total += 1
+                if err:
+                    failed += 1
+                    writer.write({"id": bookmark_id, "error": str(err)})
+                else:
+                    writer.write(
+                        {
+                            "id": bookmark_id,
+                            "keep": duplicates[bookmark_id],
+                            "status": status,
+                        }
+                    )
+                writer.flush()
+            return total, failed
+
+        with open_record_writer(ctx, ("id", "keep", "status", "error")) as writer:
+            total, failed = ctx.obj.run(async_run())
+
+        if failed:
+            raise LinkDingCliError(f"{failed} of {total} bookmark operations failed")
+
+
+@log_exception()
+def export_bookmarks(
+    ctx: typer.Context,
+    export_path: str = typer.Argument(
+        "-",
+        click_type=click.Path(allow_dash=True),
+        help="The file to export to (or - for stdout).",
+        metavar="PATH",
+    ),
+    compress: bool = typer.Option(
+        False,
+        "--gzip",
+        help="Compress the export with gzip (implied by a .gz extension).",
+    ),
+    file_format: str = typer.Option(
+        None,
+        "--format",
+        "-f",
+        help=(
+            "The format of the file (detected from its extension by default, or "
+            "ndjson for stdout)."
+        ),
+        metavar="[html|json|ndjson]",
+    ),
+    parallel: int = typer.Option(
+        None,
+        "--parallel",
+        help=(
+            "The number of pages to fetch concurrently (adapted to the server by "
+            "default)."
+        ),
+        metavar="N",
+        min=1,
+    ),
 ) -> None:
-    """Delete a bookmark by its linkding ID.
+    """Export every bookmark (including archived ones) to a file.
 
     Args:
         ctx: A Typer Context object.
-        bookmark_id: The ID of the bookmark to delete.
+        export_path: The file to export to.
+        compress: Compress the export with gzip.
+        file_format: The format of the file.
+        parallel: The number of pages to fetch concurrently.
+
+    Raises:
+        LinkDingCliError: Raised upon an unknown format.
     """
-    asyncio.run(ctx.obj.client.bookmarks.async_delete(bookmark_id))
-    typer.echo(f"Bookmark {bookmark_id} deleted.")
+    if not file_format:
+        file_format = (
+            FORMAT_NDJSON if export_path == "-" else detect_export_format(export_path)
+        )
+    if file_format not in EXPORT_FORMATS:
+        raise LinkDingCliError(f"Unknown export format: {file_format}")
+    compress = compress or export_path.lower().endswith(GZIP_EXTENSION)
+
+    async def async_export() -> int:
+        """Write every bookmark as its page arrives.
+
+        Returns:
+            The number of exported bookmarks.
+        """
+        total = 0
+        for api_func in (
+            ctx.obj.client.bookmarks.async_get_all,
+            ctx.obj.client.bookmarks.async_get_archived,
+        ):
+            async for page in async_iter_pages(
+                api_func, parallel=parallel, limit=EXPORT_PAGE_SIZE
+            ):
+                for bookmark in page["results"]:
+                    writer.write(bookmark)
+                total += len(page["results"])
+        return total
+
+    with open_export_writer(export_path, file_format, compress=compress) as writer:
+        total = ctx.obj.run(async_export())
+
+    if export_path != "-":
+        echo_data(ctx, {"path": export_path, "bookmarks": total})
 
 
 @log_exception()
 def get_all(
     ctx: typer.Context,
+    all_pages: bool = typer.Option(
+        False,
+        "--all",
+        help="Page through every bookmark, outputting one JSON object per line.",
+    ),
     archived: bool = typer.Option(
         False,
         "--archived",
         "-a",
         help="Return archived bookmarks.",
     ),
+    fields: str = OPTION_FIELDS,
     limit: int = typer.Option(
         None,
         "--limit",
         "-l",
         help="The number of bookmarks to return.",
     ),
+    local: bool = typer.Option(
+        False,
+        "--local",
+        help="Answer from the local mirror (see `linkding sync`).",
+    ),
     offset: int = typer.Option(
         None,
         "--offset",
         "-o",
         help="The index from which to return results.",
     ),
+    parallel: int = typer.Option(
+        None,
+        "--parallel",
+        help=(
+            "The number of pages to fetch concurrently (implies --all; adapted to "
+            "the server by default)."
+        ),
+        metavar="N",
+        min=1,
+    ),
     query: str = typer.Option(
         None,
         "--query",
@@ -170,11 +755,29 @@ def get_all(
 
     Args:
         ctx: A Typer Context object.
+        all_pages: Page through every bookmark, outputting one JSON object per line.
         archived: Return archived bokomarks.
+        fields: A comma-separated list of fields of each bookmark to output.
         limit: The number of bookmarks to return.
+        local: Answer from the local mirror.
         offset: The index from which to return results.
+        parallel: The number of pages to fetch concurrently (implies --all).
         query: Return bookmarks containing a query string.
     """
+    projection = parse_fields(fields)
+
+    if local:
+        _echo_local_bookmarks(
+            ctx,
+            all_pages=all_pages or (parallel or 1) > 1,
+            archived=archived,
+            fields=projection,
+            limit=limit,
+            offset=offset,
+            query=query,
+        )
+        return
+
     api_kwargs = generate_api_payload(
         (
             (CONF_LIMIT, limit),
@@ -187,23 +790,222 @@ def get_all(
         api_func = ctx.obj.client.bookmarks.async_get_archived
     else:
         api_func = ctx.obj.client.bookmarks.async_get_all
-    data = asyncio.run(api_func(**api_kwargs))
-    typer.echo(json.dumps(data))
+
+    if all_pages or (parallel or 1) > 1:
+        with open_record_writer(ctx, projection, project=True) as writer:
+            ctx.obj.run(
+                async_write_all_results(
+                    writer, api_func, parallel=parallel, **api_kwargs
+                )
+            )
+        return
+
+    data = ctx.obj.run(api_func(**api_kwargs))
+    echo_data(ctx, data, projection)
 
 
 @log_exception()
 def get_by_id(
     ctx: typer.Context,
-    bookmark_id: int = typer.Argument(..., help="The ID of a bookmark to retrieve."),
+    bookmark_ids: list[int] = typer.Argument(
+        None, help="The IDs of bookmarks to retrieve.", show_default=False
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+    fields: str = OPTION_FIELDS,
+    ids_from: typer.FileText = BULK_OPTION_IDS_FROM,
+    local: bool = typer.Option(
+        False,
+        "--local",
+        help="Answer from the local mirror (see `linkding sync`).",
+    ),
 ) -> None:
-    """Get a bookmark by its linkding ID.
+    """Get one or more bookmarks by their linkding IDs.
 
     Args:
         ctx: A Typer Context object.
-        bookmark_id: The ID of the bookmark to retrieve.
+        bookmark_ids: The IDs of the bookmarks to retrieve.
+        concurrency: The maximum number of requests to have in flight at once.
+        fields: A comma-separated list of fields of each bookmark to output.
+        ids_from: An optional file containing one bookmark ID per line.
+        local: Answer from the local mirror.
     """
-    data = asyncio.run(ctx.obj.client.bookmarks.async_get_single(bookmark_id))
-    typer.echo(json.dumps(data))
+    projection = parse_fields(fields)
+
+    async def async_get(bookmark_id: int) -> dict[str, Any]:
+        """Get a bookmark from the API.
+
+        Args:
+            bookmark_id: The ID of the bookmark to retrieve.
+
+        Returns:
+            The bookmark.
+        """
+        data = await ctx.obj.client.bookmarks.async_get_single(bookmark_id)
+        if projection is None:
+            return cast(dict[str, Any], data)
+        return cast(dict[str, Any], project_record(data, projection))
+
+    def get_local(bookmark_id: int) -> dict[str, Any]:
+        """Get a bookmark from the local mirror.
+
+        Args:
+            bookmark_id: The ID of the bookmark to retrieve.
+
+        Returns:
+            The bookmark.
+
+        Raises:
+            LinkDingCliError: Raised when the bookmark isn't in the mirror.
+        """
+        bookmark = mirror.get_bookmark(bookmark_id, fields=projection)
+        if bookmark is None:
+            raise LinkDingCliError(f"Bookmark {bookmark_id} isn't in the local mirror")
+        return cast(dict[str, Any], bookmark)
+
+    if local:
+        mirror = ctx.obj.get_local_mirror()
+        _run_local_operation(ctx, get_local, bookmark_ids, ids_from)
+        return
+
+    _run_bulk_operation(ctx, async_get, bookmark_ids, ids_from, concurrency, None)
+
+
+@log_exception()
+def import_bookmarks(
+    ctx: typer.Context,
+    import_file: typer.FileText = typer.Argument(
+        ...,
+        help="The file to import (or - for stdin).",
+        metavar="PATH",
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+    file_format: str = typer.Option(
+        None,
+        "--format",
+        "-f",
+        help="The format of the file (detected from its extension by default).",
+        metavar="[ndjson|csv|html]",
+    ),
+    skip_existing: bool = typer.Option(
+        True,
+        "--skip-existing/--no-skip-existing",
+        help="Skip URLs that are already bookmarked (or appear earlier in the file).",
+    ),
+) -> None:
+    """Import bookmarks from an NDJSON, CSV, or Netscape HTML file.
+
+    Args:
+        ctx: A Typer Context object.
+        import_file: The file to import.
+        concurrency: The maximum number of requests to have in flight at once.
+        file_format: The format of the file.
+        skip_existing: Skip URLs that are already bookmarked.
+
+    Raises:
+        LinkDingCliError: Raised upon an unknown format, an invalid record, or when any
+            creation fails.
+    """
+    if not file_format:
+        file_format = detect_format(import_file.name)
+    if file_format not in RECORD_ITERATORS:
+        raise LinkDingCliError(f"Unknown import format: {file_format}")
+    invalid = 0
+
+    async def async_get_existing_urls() -> set[str]:
+        """Get the URL of every existing bookmark (including archived ones).
+
+        Returns:
+            A set of URLs.
+        """
+        urls: set[str] = set()
+        for api_func in (
+            ctx.obj.client.bookmarks.async_get_all,
+            ctx.obj.client.bookmarks.async_get_archived,
+        ):
+            async for page in async_iter_pages(api_func, parallel=concurrency):
+                urls.update(bookmark[CONF_URL] for bookmark in page["results"])
+        return urls
+
+    def iter_new_bookmarks(seen_urls: set[str]) -> Iterator[dict[str, Any]]:
+        """Iterate over the bookmarks in the import file that should be created.
+
+        Args:
+            seen_urls: The URLs that have already been bookmarked.
+
+        Yields:
+            Normalized bookmark records.
+        """
+        nonlocal invalid
+        for line_number, record, err in iter_bookmarks(import_file, file_format):
+            if err:
+                # Report (and skip) records that aren't valid bookmarks:
+                invalid += 1
+                writer.write({"line": line_number, "error": str(err)})
+                writer.flush()
+                continue
+            record = cast(dict[str, Any], record)
+            if skip_existing:
+                if record[CONF_URL] in seen_urls:
+                    writer.write({"url": record[CONF_URL], "status": "skipped"})
+                    continue
+                seen_urls.add(record[CONF_URL])
+            yield record
+
+    async def async_create(record: dict[str, Any]) -> dict[str, Any]:
+        """Create a bookmark from an import record.
+
+        Args:
+            record: A normalized bookmark record.
+
+        Returns:
+            An API response payload.
+        """
+        payload = generate_api_payload(
+            (
+                (CONF_DESCRIPTION, record[CONF_DESCRIPTION]),
+                (CONF_IS_ARCHIVED, record[CONF_IS_ARCHIVED]),
+                (CONF_NOTES, record[CONF_NOTES]),
+                (CONF_SHARED, record[CONF_SHARED]),
+                (CONF_TAG_NAMES, record[CONF_TAG_NAMES]),
+                (CONF_TITLE, record[CONF_TITLE]),
+                (CONF_UNREAD, record[CONF_UNREAD]),
+            )
+        )
+        return cast(
+            dict[str, Any],
+            await ctx.obj.client.bookmarks.async_create(record[CONF_URL], **payload),
+        )
+
+    async def async_run() -> tuple[int, int]:
+        """Create every new bookmark.
+
+        Returns:
+            The total number of creations attempted and the number that failed.
+        """
+        seen_urls = await async_get_existing_urls() if skip_existing else set()
+        total = failed = 0
+        async for record, data, err in async_bounded_map(
+            async_create, iter_new_bookmarks(seen_urls), concurrency
+        ):
+            total += 1
+            if err:
+                failed += 1
+                writer.write({"url": record[CONF_URL], "error": str(err)})
+            else:
+                bookmark_id = cast(dict[str, Any], data)["id"]
+                writer.write(
+                    {"url": record[CONF_URL], "id": bookmark_id, "status": "created"}
+                )
+            writer.flush()
+        return total, failed
+
+    with open_record_writer(ctx, ("line", "url", "id", "status", "error")) as writer:
+        total, failed = ctx.obj.run(async_run())
+
+    if failed := failed + invalid:
+        raise LinkDingCliError(
+            f"{failed} of {total + invalid} bookmarks failed to import"
+        )
 
 
 @log_exception()
@@ -212,19 +1014,75 @@ def main(_: typer.Context) -> None:
     pass
 
 
+@log_exception()
+def search(
+    ctx: typer.Context,
+    query: str = typer.Argument(..., help="The search query."),
+    archived: bool = typer.Option(
+        False,
+        "--archived",
+        "-a",
+        help="Search archived bookmarks.",
+    ),
+    fields: str = OPTION_FIELDS,
+    limit: int = typer.Option(
+        DEFAULT_PAGE_SIZE,
+        "--limit",
+        "-l",
+        help="The number of bookmarks to return.",
+    ),
+    offset: int = typer.Option(
+        None,
+        "--offset",
+        "-o",
+        help="The index from which to return results.",
+    ),
+) -> None:
+    """Search the local mirror, outputting the best matches first.
+
+    Args:
+        ctx: A Typer Context object.
+        query: The search query.
+        archived: Search archived bookmarks.
+        fields: A comma-separated list of fields of each bookmark to output.
+        limit: The number of bookmarks to return.
+        offset: The index from which to return results.
+    """
+    projection = parse_fields(fields)
+    echo_records(
+        ctx,
+        ctx.obj.get_local_mirror().search_bookmarks(
+            query, archived=archived, fields=projection, limit=limit, offset=offset
+        ),
+        projection,
+    )
+
+
 @log_exception()
 def unarchive(
     ctx: typer.Context,
-    bookmark_id: int = typer.Argument(..., help="The ID of a bookmark to archive."),
+    bookmark_ids: list[int] = typer.Argument(
+        None, help="The IDs of bookmarks to unarchive.", show_default=False
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+    ids_from: typer.FileText = BULK_OPTION_IDS_FROM,
 ) -> None:
-    """Unarchive a bookmark by its linkding ID.
+    """Unarchive one or more bookmarks by their linkding IDs.
 
     Args:
         ctx: A Typer Context object.
-        bookmark_id: The ID of the bookmark to archive.
+        bookmark_ids: The IDs of the bookmarks to unarchive.
+        concurrency: The maximum number of requests to have in flight at once.
+        ids_from: An optional file containing one bookmark ID per line.
     """
-    asyncio.run(ctx.obj.client.bookmarks.async_unarchive(bookmark_id))
-    typer.echo(f"Bookmark {bookmark_id} unarchived.")
+    _run_bulk_operation(
+        ctx,
+        ctx.obj.client.bookmarks.async_unarchive,
+        bookmark_ids,
+        ids_from,
+        concurrency,
+        "unarchived",
+    )
 
 
 @log_exception()
@@ -306,15 +1164,19 @@ def update(
         )
     )
 
-    data = asyncio.run(ctx.obj.client.bookmarks.async_update(bookmark_id, **payload))
-    typer.echo(json.dumps(data))
+    data = ctx.obj.run(ctx.obj.client.bookmarks.async_update(bookmark_id, **payload))
+    echo_data(ctx, data)
 
 
 BOOKMARK_APP = typer.Typer(callback=main)
 BOOKMARK_APP.command(name="all")(get_all)
 BOOKMARK_APP.command(name="archive")(archive)
 BOOKMARK_APP.command(name="create")(create)
+BOOKMARK_APP.command(name="dedupe")(dedupe)
 BOOKMARK_APP.command(name="delete")(delete)
+BOOKMARK_APP.command(name="export")(export_bookmarks)
 BOOKMARK_APP.command(name="get")(get_by_id)
+BOOKMARK_APP.command(name="import")(import_bookmarks)
+BOOKMARK_APP.command(name="search")(search)
 BOOKMARK_APP.command(name="unarchive")(unarchive)
 BOOKMARK_APP.command(name="update")(update)
@@ -0,0 +1,420 @@
+"""Define the daemon command."""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from time import monotonic
+from typing import Any, BinaryIO, cast
+
+import click
+import typer
+
+from linkding_cli.errors import LinkDingCliError
+from linkding_cli.helpers.daemon import (
+    get_environment_digest,
+    get_socket_path,
+    is_private,
+)
+from linkding_cli.helpers.dispatch import (
+    UNDISPATCHABLE_COMMANDS,
+    OutputCapture,
+    dispatch,
+    get_root_command,
+)
+from linkding_cli.helpers.logging import log_exception
+
+# A command's output is sent to its client whenever this many characters of it are
+# waiting, or (if it flushes its output) once they've waited this many seconds:
+RESPONSE_CHUNK_SIZE = 65536
+RESPONSE_FLUSH_INTERVAL = 0.1
+
+# Binary output (e.g., a compressed export) is sent base64-encoded, in its own messages:
+RESPONSE_BINARY_STDOUT = "stdout_bytes"
+
+
+def _get_peer_uid(sock: socket.socket) -> int | None:
+    """Get the ID of the user on the other end of a Unix domain socket.
+
+    Args:
+        sock: The socket.
+
+    Returns:
+        The user ID (or None if the platform can't tell).
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", credentials)
+    return int(uid)
+
+
+def _has_relative_path(ctx: typer.Context, root: click.Group, argv: list[str]) -> bool:
+    """Return whether a command refers to a path relative to the working directory.
+
+    The daemon's working directory isn't its client's, so such a command would read
+    or write the wrong file.
+
+    Args:
+        ctx: A Typer Context object.
+        root: The Click group that holds every CLI command.
+        argv: The command's arguments.
+
+    Returns:
+        Whether the command refers to a relative path.
+    """
+    command: click.Command | None = root
+    args = argv
+    while isinstance(command, click.Group):
+        if not args:
+            return False
+        name, *args = args
+        command = command.get_command(ctx, name)
+    if command is None:
+        return False
+
+    # Only parse the arguments (without converting them, which would open files):
+    parser = command.make_parser(
+        click.Context(command, parent=ctx, resilient_parsing=True)
+    )
+    try:
+        values, _, _ = parser.parse_args(list(args))
+    except click.UsageError:
+        # The command itself reports the error:
+        return False
+
+    for param in command.params:
+        if not isinstance(param.type, (click.File, click.Path)):
+            continue
+        value = values.get(param.name) if param.name else None
+        paths = value if isinstance(value, (list, tuple)) else [value]
+        if any(isinstance(path, str) and not os.path.isabs(path) for path in paths):
+            return True
+    return False
+
+
+class _Response:
+    """Define the response to a forwarded command, streamed as the command runs.
+
+    The response is a series of newline-delimited JSON messages: chunks of the
+    command's output, then its exit code.
+    """
+
+    def __init__(self, wfile: BinaryIO) -> None:
+        """Initialize.
+
+        Args:
+            wfile: The stream to write the response to.
+        """
+        self._buffered = 0
+        self._chunks: list[tuple[str, str | bytes]] = []
+        self._last_sent = monotonic()
+        self._lock = threading.Lock()
+        self._wfile = wfile
+
+    def _send(self, message: dict[str, Any]) -> None:
+        """Send a message.
+
+        Args:
+            message: The message.
+        """
+        self._wfile.write(json.dumps(message).encode() + b"\n")
+
+    def _send_buffered(self) -> None:
+        """Send the output waiting to be sent (with the lock held)."""
+        # Consecutive chunks written to the same stream are sent as one message (in
+        # order, so that text and binary output don't get interleaved differently):
+        for name, chunks in groupby(self._chunks, key=itemgetter(0)):
+            if name == RESPONSE_BINARY_STDOUT:
+                data = b"".join(cast(bytes, chunk) for _, chunk in chunks)
+                self._send({name: base64.b64encode(data).decode()})
+            else:
+                self._send({name: "".join(cast(str, chunk) for _, chunk in chunks)})
+        self._chunks.clear()
+        self._buffered = 0
+        self._last_sent = monotonic()
+
+    def finish(self, exit_code: int) -> None:
+        """Send the rest of the command's output, then its exit code.
+
+        Args:
+            exit_code: The command's exit code.
+        """
+        with self._lock:
+            self._send_buffered()
+            self._send({"exit_code": exit_code})
+
+    def flush(self) -> None:
+        """Send the output waiting to be sent, if it's been waiting long enough."""
+        with self._lock:
+            if self._buffered and (
+                monotonic() - self._last_sent >= RESPONSE_FLUSH_INTERVAL
+            ):
+                self._send_buffered()
+
+    def write(self, name: str, data: str | bytes) -> None:
+        """Write a chunk of the command's output.
+
+        Args:
+            name: The stream the output was written to ("stderr", "stdout", or
+                "stdout_bytes").
+            data: The output.
+        """
+        with self._lock:
+            self._chunks.append((name, data))
+            self._buffered += len(data)
+            if self._buffered >= RESPONSE_CHUNK_SIZE:
+                self._send_buffered()
+
+
+class _ResponseBinaryStream(io.RawIOBase):
+    """Define a binary stream that writes to a response's standard output."""
+
+    def __init__(self, response: _Response) -> None:
+        """Initialize.
+
+        Args:
+            response: The response to write to.
+        """
+        super().__init__()
+        self._response = response
+
+    def flush(self) -> None:
+        """Flush the stream."""
+        self._response.flush()
+
+    def writable(self) -> bool:
+        """Return whether the stream can be written to.
+
+        Returns:
+            Whether the stream can be written to.
+        """
+        return True
+
+    def write(self, data: Any) -> int:
+        """Write bytes to the stream.
+
+        Args:
+            data: The bytes to write.
+
+        Returns:
+            The number of bytes written.
+        """
+        data = bytes(data)
+        self._response.write(RESPONSE_BINARY_STDOUT, data)
+        return len(data)
+
+
+class _ResponseStream(io.TextIOBase):
+    """Define a text stream that writes to a response."""
+
+    def __init__(self, response: _Response, name: str) -> None:
+        """Initialize.
+
+        Args:
+            response: The response to write to.
+            name: The stream the response's output is written to.
+        """
+        super().__init__()
+        self._name = name
+        self._response = response
+        if name == "stdout":
+            # Commands write binary output (e.g., compressed exports) to stdout's
+            # buffer:
+            self.buffer = _ResponseBinaryStream(response)
+
+    def flush(self) -> None:
+        """Flush the stream."""
+        self._response.flush()
+
+    def write(self, text: str) -> int:
+        """Write text to the stream.
+
+        Args:
+            text: The text to write.
+
+        Returns:
+            The number of characters written.
+        """
+        self._response.write(self._name, text)
+        return len(text)
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """Define a server that runs forwarded commands in-process, one thread each."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, ctx: typer.Context) -> None:
+        """Initialize.
+
+        Args:
+            path: The path to the Unix domain socket to listen on.
+            ctx: A Typer Context object.
+        """
+        self.path = path
+        super().__init__(path, _DaemonRequestHandler)
+        self.ctx = ctx
+        self.environment = get_environment_digest()
+        self.idle = False
+        self.output_capture = OutputCapture()
+        self.root: click.Group = get_root_command()
+
+    def handle_timeout(self) -> None:
+        """Note that no request arrived within the server's timeout."""
+        self.idle = True
+
+    def run_command(self, payload: dict[str, Any], wfile: BinaryIO) -> None:
+        """Run a forwarded command, streaming its output to the client.
+
+        Args:
+            payload: The client's request.
+            wfile: The stream to write the response to.
+        """
+        argv = payload.get("argv")
+        if (
+            not isinstance(argv, list)
+            or not argv
+            or argv[0] in UNDISPATCHABLE_COMMANDS
+            or payload.get("environment") != self.environment
+            or _has_relative_path(self.ctx, self.root, [str(arg) for arg in argv])
+        ):
+            wfile.write(json.dumps({"fallback": True}).encode() + b"\n")
+            return
+
+        response = _Response(wfile)
+        with self.output_capture.capture(
+            stderr=_ResponseStream(response, "stderr"),
+            stdout=_ResponseStream(response, "stdout"),
+        ) as captured:
+            exit_code = dispatch(self.ctx, self.root, [str(arg) for arg in argv])
+
+        for error in captured.errors:
+            response.write("stderr", f"{error}\n")
+        response.finish(exit_code)
+
+    def server_bind(self) -> None:
+        """Bind the socket, making it private before any client can connect."""
+        super().server_bind()
+        os.chmod(self.path, 0o600)
+
+    def verify_request(  # pylint: disable=unused-argument
+        self, request: Any, client_address: Any
+    ) -> bool:
+        """Only accept connections from the current user.
+
+        Args:
+            request: The client's socket.
+            client_address: The client's address.
+
+        Returns:
+            Whether to handle the request.
+        """
+        return _get_peer_uid(request) in (None, os.getuid())
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Define a handler for a single forwarded command."""
+
+    server: DaemonServer
+
+    def handle(self) -> None:
+        """Handle the request."""
+        try:
+            payload = json.loads(self.rfile.readline())
+        except ValueError:
+            payload = {}
+        try:
+            self.server.run_command(
+                payload if isinstance(payload, dict) else {},
+                self.wfile,  # type: ignore[arg-type]
+            )
+        except BrokenPipeError:
+            # The client went away (e.g., its output was piped to `head`):
+            pass
+
+
+def _prepare_socket_path(path: str) -> None:
+    """Prepare a path for the daemon's socket, making sure no daemon is using it.
+
+    Args:
+        path: The path to the socket.
+
+    Raises:
+        LinkDingCliError: Raised when the socket isn't private or another daemon is
+            listening on it.
+    """
+    # Only the current user may connect (the daemon runs commands with their token),
+    # so the socket's directory must be theirs alone (even if it already existed):
+    directory = Path(path).parent
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not is_private(str(directory), is_type=stat.S_ISDIR):
+        raise LinkDingCliError(
+            f"{directory} must be a directory that only you can access (mode 0700)"
+        )
+    try:
+        socket_stat = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(socket_stat.st_mode) or socket_stat.st_uid != os.getuid():
+        raise LinkDingCliError(f"{path} isn't a socket of yours")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            # A daemon stopped without cleaning up after itself:
+            os.unlink(path)
+            return
+    raise LinkDingCliError(f"A daemon is already listening on {path}")
+
+
+@log_exception()
+def daemon(
+    ctx: typer.Context,
+    idle_timeout: float = typer.Option(
+        None,
+        "--idle-timeout",
+        help="Stop after this many seconds without a command.",
+        metavar="SECONDS",
+        min=0,
+        show_default=False,
+    ),
+) -> None:
+    """Keep a warm client running for other linkding commands to use.
+
+    Args:
+        ctx: A Typer Context object.
+        idle_timeout: Stop after this many seconds without a command.
+    """
+    path = get_socket_path()
+    _prepare_socket_path(path)
+
+    ctx.obj.memory_cache = True
+    with ctx.obj.persistent_loop(), DaemonServer(path, ctx) as server:
+        typer.echo(f"Listening on {path}")
+
+        try:
+            with server.output_capture.activate():
+                if not idle_timeout:
+                    server.serve_forever()
+                else:
+                    server.timeout = idle_timeout
+                    while not server.idle:
+                        server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
@@ -0,0 +1,97 @@
+"""Define the shell command."""
+
+from __future__ import annotations
+
+import shlex
+import sys
+import time
+
+import click
+import typer
+
+from linkding_cli.helpers.dispatch import (
+    UNDISPATCHABLE_COMMANDS,
+    dispatch,
+    get_root_command,
+)
+from linkding_cli.helpers.logging import log_exception
+
+SHELL_EXIT_COMMANDS = {"exit", "quit"}
+SHELL_PROMPT = "linkding> "
+
+
+def print_help(ctx: typer.Context, root: click.Group) -> None:
+    """Print the commands that can be run from the shell.
+
+    Args:
+        ctx: A Typer Context object.
+        root: The Click group that holds every CLI command.
+    """
+    typer.echo("Commands:")
+    for command_name in root.list_commands(ctx):
+        if command_name not in UNDISPATCHABLE_COMMANDS and (
+            command := root.get_command(ctx, command_name)
+        ):
+            typer.echo(f"  {command_name:<10} {command.get_short_help_str()}")
+    typer.echo('Run "<command> --help" for help with a command, or "exit" to quit.')
+
+
+@log_exception()
+def shell(
+    ctx: typer.Context,
+    timing: bool = typer.Option(
+        True,
+        "--timing/--no-timing",
+        help="Report how long each command takes.",
+    ),
+) -> None:
+    """Run commands interactively over a single, persistent connection.
+
+    Args:
+        ctx: A Typer Context object.
+        timing: Report how long each command takes.
+    """
+    interactive = sys.stdin.isatty()
+    if interactive:
+        try:
+            # Enable line editing and history where available:
+            import readline  # noqa: F401 # pylint: disable=import-outside-toplevel,unused-import
+        except ImportError:
+            pass
+        typer.echo('Type a command (e.g., "bookmarks all"), "help", or "exit".')
+
+    root = get_root_command()
+
+    with ctx.obj.persistent_loop():
+        while True:
+            try:
+                line = input(SHELL_PROMPT if interactive else "")
+            except EOFError:
+                break
+            except KeyboardInterrupt:
+                typer.echo()
+                continue
+
+            try:
+                args = shlex.split(line)
+            except ValueError as err:
+                typer.secho(str(err), err=True, fg=typer.colors.BRIGHT_RED)
+                continue
+            if not args:
+                continue
+            if args[0] in SHELL_EXIT_COMMANDS:
+                break
+
+            if args[0] in ("-h", "--help", "help"):
+                print_help(ctx, root)
+                continue
+
+            start = time.perf_counter()
+            exit_code = dispatch(ctx, root, args)
+            if timing:
+                elapsed = (time.perf_counter() - start) * 1000
+                typer.secho(
+                    f"[{elapsed:.1f} ms, exit code {exit_code}]",
+                    err=True,
+                    fg=typer.colors.BRIGHT_BLACK,
+                )
@@ -0,0 +1,170 @@
+"""Define the sync command."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+import typer
+
+from linkding_cli.const import CONF_LIMIT
+from linkding_cli.helpers.logging import log_exception
+from linkding_cli.helpers.output import echo_data
+from linkding_cli.helpers.pagination import async_iter_pages
+
+if TYPE_CHECKING:
+    from linkding_cli.helpers.mirror import Mirror
+
+SYNC_PAGE_SIZE = 1000
+
+
+async def _async_sync_bookmarks(
+    ctx: typer.Context,
+    mirror: Mirror,
+    *,
+    archived: bool,
+    modified_since: str | None,
+    parallel: int | None,
+) -> tuple[int, int, str | None]:
+    """Sync bookmarks from one of the bookmark endpoints into the mirror.
+
+    When `modified_since` is provided, only bookmarks modified since then are pulled.
+    Deletions are then detected by comparing the server's total count with the
+    mirror's; only if they differ is a sweep over every bookmark ID performed.
+
+    Args:
+        ctx: A Typer Context object.
+        mirror: The local mirror.
+        archived: Sync archived (rather than unarchived) bookmarks.
+        modified_since: An optional ISO 8601 timestamp of the last seen modification.
+        parallel: The number of pages to fetch concurrently.
+
+    Returns:
+        The number of upserted bookmarks, the number of deleted bookmarks, and the
+        latest modification timestamp seen.
+    """
+    endpoint = "/api/bookmarks/archived/" if archived else "/api/bookmarks/"
+
+    async def async_get_page(**params: Any) -> dict[str, Any]:
+        """Get a page of bookmarks.
+
+        Args:
+            params: The query parameters to send.
+
+        Returns:
+            An API response payload.
+        """
+        return await ctx.obj.client.async_request(  # type: ignore[no-any-return]
+            "get", endpoint, params=params
+        )
+
+    params: dict[str, Any] = {CONF_LIMIT: SYNC_PAGE_SIZE}
+    if modified_since:
+        params["modified_since"] = modified_since
+
+    high_water_mark = modified_since
+    seen_ids: set[int] = set()
+    upserted = 0
+
+    async for page in async_iter_pages(async_get_page, parallel=parallel, **params):
+        bookmarks = [
+            {**bookmark, "is_archived": archived} for bookmark in page["results"]
+        ]
+        upserted += mirror.upsert_bookmarks(bookmarks)
+        for bookmark in bookmarks:
+            seen_ids.add(bookmark["id"])
+            if (date_modified := bookmark.get("date_modified")) and (
+                high_water_mark is None or date_modified > high_water_mark
+            ):
+                high_water_mark = date_modified
+
+    if modified_since:
+        server_count = (await async_get_page(limit=1))["count"]
+        if server_count == mirror.count_bookmarks(archived=archived):
+            return upserted, 0, high_water_mark
+
+        seen_ids.clear()
+        async for page in async_iter_pages(
+            async_get_page, parallel=parallel, limit=SYNC_PAGE_SIZE
+        ):
+            seen_ids.update(bookmark["id"] for bookmark in page["results"])
+
+    deleted = mirror.delete_bookmarks_not_in(seen_ids, archived=archived)
+    return upserted, deleted, high_water_mark
+
+
+@log_exception()
+def sync(
+    ctx: typer.Context,
+    full: bool = typer.Option(
+        False,
+        "--full",
+        help="Ignore the previous sync and pull everything.",
+    ),
+    parallel: int = typer.Option(
+        None,
+        "--parallel",
+        help=(
+            "The number of pages to fetch concurrently (adapted to the server by "
+            "default)."
+        ),
+        metavar="N",
+        min=1,
+    ),
+) -> None:
+    """Sync bookmarks and tags into a local mirror.
+
+    Args:
+        ctx: A Typer Context object.
+        full: Ignore the previous sync and pull everything.
+        parallel: The number of pages to fetch concurrently.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from linkding_cli.helpers.mirror import (
+        META_BOOKMARKS_MODIFIED_SINCE,
+        META_LAST_SYNC,
+    )
+
+    mirror = ctx.obj.mirror
+    modified_since = None if full else mirror.get_meta(META_BOOKMARKS_MODIFIED_SINCE)
+
+    async def async_sync() -> dict[str, Any]:
+        """Sync everything.
+
+        Returns:
+            A summary of the sync.
+        """
+        summary: dict[str, Any] = {"full": modified_since is None}
+        high_water_marks = []
+
+        for archived in (False, True):
+            upserted, deleted, high_water_mark = await _async_sync_bookmarks(
+                ctx,
+                mirror,
+                archived=archived,
+                modified_since=modified_since,
+                parallel=parallel,
+            )
+            summary["archived" if archived else "bookmarks"] = {
+                "upserted": upserted,
+                "deleted": deleted,
+                "total": mirror.count_bookmarks(archived=archived),
+            }
+            if high_water_mark:
+                high_water_marks.append(high_water_mark)
+
+        tags = []
+        async for page in async_iter_pages(
+            ctx.obj.client.tags.async_get_all, parallel=parallel, limit=SYNC_PAGE_SIZE
+        ):
+            tags.extend(page["results"])
+        summary["tags"] = {"total": mirror.replace_tags(tags)}
+
+        if high_water_marks:
+            mirror.set_meta(META_BOOKMARKS_MODIFIED_SINCE, max(high_water_marks))
+        mirror.set_meta(META_LAST_SYNC, datetime.now(timezone.utc).isoformat())
+
+        return summary
+
+    summary = ctx.obj.run(async_sync())
+    echo_data(ctx, summary)
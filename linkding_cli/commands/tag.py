@@ -2,54 +2,423 @@
 
 from __future__ import annotations
 
-import asyncio
-import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, cast
 
 import typer
 
+from linkding_cli.commands.bookmark import BULK_OPTION_CONCURRENCY
 from linkding_cli.const import CONF_LIMIT, CONF_OFFSET
+from linkding_cli.errors import LinkDingCliError
+from linkding_cli.helpers.concurrency import async_bounded_map
 from linkding_cli.helpers.logging import log_exception
+from linkding_cli.helpers.output import (
+    OPTION_FIELDS,
+    echo_data,
+    echo_records,
+    open_record_writer,
+    parse_fields,
+)
+from linkding_cli.helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    async_iter_pages,
+    async_write_all_results,
+    generate_page_payload,
+)
 from linkding_cli.util import generate_api_payload
 
+CONF_QUERY = "query"
+
+TAG_INDEX_PAGE_SIZE = 1000
+
+
+async def _async_get_all_tags(ctx: typer.Context) -> list[dict[str, Any]]:
+    """Get every tag from the API.
+
+    Args:
+        ctx: A Typer Context object.
+
+    Returns:
+        The tags.
+    """
+    tags = []
+    async for page in async_iter_pages(
+        ctx.obj.client.tags.async_get_all,
+        parallel=None,
+        limit=TAG_INDEX_PAGE_SIZE,
+    ):
+        tags.extend(page["results"])
+    return tags
+
+
+async def _async_refresh_tag_index(ctx: typer.Context) -> None:
+    """Bring the persisted tag name index (the local mirror's tags) up to date.
+
+    The first time, every tag is pulled. After that, only the tags past the ones that
+    are already indexed are pulled (new tags are listed last), starting with the last
+    indexed tag; if that tag has moved, the tags aren't listed in ascending ID order,
+    or the server's total count then differs from the index's (e.g., because tags
+    were deleted), the index is rebuilt.
+
+    Args:
+        ctx: A Typer Context object.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from linkding_cli.helpers.mirror import META_TAGS_INDEXED
+
+    mirror = ctx.obj.mirror
+
+    if mirror.get_meta(META_TAGS_INDEXED) is not None:
+        offset = max(mirror.count_tags() - 1, 0)
+        last_ids = [
+            tag["id"] for tag in mirror.iter_tags(fields=("id",), offset=offset)
+        ]
+        last_seen_id = last_ids[-1] if last_ids else 0
+        overlap_ids = None
+        server_count = None
+        async for page in async_iter_pages(
+            ctx.obj.client.tags.async_get_all, limit=TAG_INDEX_PAGE_SIZE, offset=offset
+        ):
+            page_ids = [tag["id"] for tag in page["results"]]
+            if overlap_ids is None:
+                overlap_ids = page_ids[: len(last_ids)]
+                page_ids = page_ids[len(last_ids) :]
+            # The API doesn't promise to list tags in ascending ID order (which is
+            # what makes them safe to pull by offset), so check that it did:
+            if any(
+                tag_id <= previous_id
+                for previous_id, tag_id in zip([last_seen_id, *page_ids], page_ids)
+            ):
+                server_count = None
+                break
+            last_seen_id = page_ids[-1] if page_ids else last_seen_id
+            server_count = page["count"]
+            mirror.upsert_tags(page["results"])
+        if overlap_ids == last_ids and server_count == mirror.count_tags():
+            return
+
+    mirror.replace_tags(await _async_get_all_tags(ctx))
+
+
+async def _async_get_tag_by_name(
+    ctx: typer.Context, tag_name: str
+) -> dict[str, Any] | None:
+    """Get a tag by its name (case-insensitively) via the persisted tag name index.
+
+    The index is only refreshed if it doesn't have the tag yet.
+
+    Args:
+        ctx: A Typer Context object.
+        tag_name: The name of the tag.
+
+    Returns:
+        The tag (or None if there isn't one with that name).
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from linkding_cli.helpers.mirror import META_TAGS_INDEXED
+
+    mirror = ctx.obj.mirror
+    if mirror.get_meta(META_TAGS_INDEXED) is not None and (
+        tag := mirror.get_tag_by_name(tag_name)
+    ):
+        return tag  # type: ignore[no-any-return]
+
+    await _async_refresh_tag_index(ctx)
+    return mirror.get_tag_by_name(tag_name)  # type: ignore[no-any-return]
+
+
+def _split_tags(tag_names: str | None) -> list[str]:
+    """Split a comma-separated list of tags.
+
+    Args:
+        tag_names: A comma-separated list of tags.
+
+    Returns:
+        The tags.
+    """
+    return [tag for tag in (tag.strip() for tag in (tag_names or "").split(",")) if tag]
+
+
+def _retag(tag_names: list[str], add: list[str], remove: list[str]) -> list[str]:
+    """Compute a bookmark's new tags.
+
+    Like linkding itself, tags are matched case-insensitively.
+
+    Args:
+        tag_names: The bookmark's current tags.
+        add: The tags to add.
+        remove: The tags to remove.
+
+    Returns:
+        The bookmark's new tags.
+    """
+    removed = {tag.casefold() for tag in remove}
+    new_tag_names = [tag for tag in tag_names if tag.casefold() not in removed]
+    existing = {tag.casefold() for tag in new_tag_names}
+    for tag in add:
+        if tag.casefold() not in existing:
+            new_tag_names.append(tag)
+            existing.add(tag.casefold())
+    return new_tag_names
+
+
+def _run_retag(
+    ctx: typer.Context,
+    api_funcs: list[Callable[..., Awaitable[dict[str, Any]]]],
+    query: str | None,
+    add: list[str],
+    remove: list[str],
+    concurrency: int | None,
+) -> None:
+    """Add and remove tags across every bookmark that matches a query.
+
+    Matching bookmarks are streamed a page at a time; bookmarks whose tags wouldn't
+    change are skipped, and the rest are updated concurrently as they arrive, with a
+    line of JSON output per update.
+
+    Updating a bookmark can make it stop matching the query, which shifts every later
+    page of results; so, the query is repeated until it turns up nothing left to
+    change (a bookmark is never updated twice).
+
+    Args:
+        ctx: A Typer Context object.
+        api_funcs: The aiolinkding coroutine functions that list bookmarks to retag.
+        query: The search query that bookmarks must match (if any).
+        add: The tags to add.
+        remove: The tags to remove.
+        concurrency: The maximum number of requests to have in flight at once.
+
+    Raises:
+        LinkDingCliError: Raised when any update fails.
+    """
+    api_kwargs = generate_api_payload(((CONF_QUERY, query),))
+    attempted: set[int] = set()
+
+    async def async_iter_changes() -> AsyncIterator[tuple[dict[str, Any], list[str]]]:
+        """Iterate over the matching bookmarks whose tags would change.
+
+        Yields:
+            A bookmark and its new tags.
+        """
+        for api_func in api_funcs:
+            async for page in async_iter_pages(api_func, **api_kwargs):
+                for bookmark in page["results"]:
+                    if bookmark["id"] in attempted:
+                        continue
+                    tag_names = _retag(bookmark["tag_names"], add, remove)
+                    if sorted(tag_names) == sorted(bookmark["tag_names"]):
+                        continue
+                    attempted.add(bookmark["id"])
+                    yield bookmark, tag_names
+
+    async def async_update(change: tuple[dict[str, Any], list[str]]) -> None:
+        """Update a bookmark's tags.
+
+        Args:
+            change: A bookmark and its new tags.
+        """
+        bookmark, tag_names = change
+        # aiolinkding always sends `unread` and `shared`, so their current values
+        # are passed along to avoid resetting them:
+        await ctx.obj.client.bookmarks.async_update(
+            bookmark["id"],
+            tag_names=tag_names,
+            shared=bookmark.get("shared", False),
+            unread=bookmark.get("unread", False),
+        )
+
+    async def async_run() -> tuple[int, int]:
+        """Update every matching bookmark.
+
+        Returns:
+            The total number of updates and the number that failed.
+        """
+        total = failed = 0
+        while True:
+            updates = 0
+            async for (bookmark, tag_names), _, err in async_bounded_map(
+                async_update, async_iter_changes(), concurrency
+            ):
+                updates += 1
+                if err:
+                    failed += 1
+                    writer.write({"id": bookmark["id"], "error": str(err)})
+                else:
+                    writer.write(
+                        {
+                            "id": bookmark["id"],
+                            "tag_names": tag_names,
+                            "status": "updated",
+                        }
+                    )
+                writer.flush()
+            total += updates
+            if not updates or query is None:
+                return total, failed
+
+    with open_record_writer(ctx, ("id", "tag_names", "status", "error")) as writer:
+        total, failed = ctx.obj.run(async_run())
+
+    if failed:
+        raise LinkDingCliError(f"{failed} of {total} bookmark updates failed")
+
 
 @log_exception()
 def create(
     ctx: typer.Context,
-    tag_name: str = typer.Argument(..., help="The tag to create."),
+    tag_names: list[str] = typer.Argument(..., help="The tags to create."),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
 ) -> None:
-    """Create a tag.
+    """Create one or more tags.
+
+    A single tag retains the original output. Multiple tags are checked against the
+    existing ones first (via the persisted tag name index, if there's a local
+    mirror): existing tags are skipped, and the rest are created concurrently, with a
+    line of JSON output per tag.
 
     Args:
         ctx: A Typer Context object.
-        tag_name: The tag to create.
+        tag_names: The tags to create.
+        concurrency: The maximum number of requests to have in flight at once.
+
+    Raises:
+        LinkDingCliError: Raised when any creation fails.
     """
-    data = asyncio.run(ctx.obj.client.tags.async_create(tag_name))
-    typer.echo(json.dumps(data))
+    # Created tags are added to the local mirror, but a mirror isn't created for them:
+    mirror = ctx.obj.mirror if ctx.obj.mirror_path.exists() else None
+
+    if len(tag_names) == 1:
+        data = ctx.obj.run(ctx.obj.client.tags.async_create(tag_names[0]))
+        if mirror:
+            mirror.upsert_tags([data])
+        echo_data(ctx, data)
+        return
+
+    async def async_run() -> tuple[int, int]:
+        """Create every tag that doesn't exist yet.
+
+        Returns:
+            The total number of creations attempted and the number that failed.
+        """
+        tags_by_name: dict[str, dict[str, Any]] = {}
+        if mirror:
+            await _async_refresh_tag_index(ctx)
+        else:
+            tags_by_name = {
+                tag["name"].casefold(): tag for tag in await _async_get_all_tags(ctx)
+            }
+
+        seen: set[str] = set()
+        new_tag_names = []
+        for tag_name in tag_names:
+            if tag_name.casefold() in seen:
+                continue
+            seen.add(tag_name.casefold())
+            if mirror:
+                tag = mirror.get_tag_by_name(tag_name)
+            else:
+                tag = tags_by_name.get(tag_name.casefold())
+            if tag is None:
+                new_tag_names.append(tag_name)
+            else:
+                writer.write({"id": tag["id"], "name": tag["name"], "status": "exists"})
+        writer.flush()
+
+        total = failed = 0
+        async for tag_name, data, err in async_bounded_map(
+            ctx.obj.client.tags.async_create, new_tag_names, concurrency
+        ):
+            total += 1
+            if err:
+                failed += 1
+                writer.write({"name": tag_name, "error": str(err)})
+            else:
+                tag = cast(dict[str, Any], data)
+                if mirror:
+                    mirror.upsert_tags([tag])
+                writer.write(
+                    {"id": tag["id"], "name": tag["name"], "status": "created"}
+                )
+            writer.flush()
+        return total, failed
+
+    with open_record_writer(ctx, ("id", "name", "status", "error")) as writer:
+        total, failed = ctx.obj.run(async_run())
+
+    if failed:
+        raise LinkDingCliError(f"{failed} of {total} tags failed to create")
 
 
 @log_exception()
 def get_all(
     ctx: typer.Context,
+    all_pages: bool = typer.Option(
+        False,
+        "--all",
+        help="Page through every tag, outputting one JSON object per line.",
+    ),
+    fields: str = OPTION_FIELDS,
     limit: int = typer.Option(
         None,
         "--limit",
         "-l",
         help="The number of tags to return.",
     ),
+    local: bool = typer.Option(
+        False,
+        "--local",
+        help="Answer from the local mirror (see `linkding sync`).",
+    ),
     offset: int = typer.Option(
         None,
         "--offset",
         "-o",
         help="The index from which to return results.",
     ),
+    parallel: int = typer.Option(
+        None,
+        "--parallel",
+        help=(
+            "The number of pages to fetch concurrently (implies --all; adapted to "
+            "the server by default)."
+        ),
+        metavar="N",
+        min=1,
+    ),
 ) -> None:
     """Get all tags.
 
     Args:
         ctx: A Typer Context object.
+        all_pages: Page through every tag, outputting one JSON object per line.
+        fields: A comma-separated list of fields of each tag to output.
         limit: The number of tags to return.
+        local: Answer from the local mirror.
         offset: The index from which to return results.
+        parallel: The number of pages to fetch concurrently (implies --all).
     """
+    projection = parse_fields(fields)
+
+    if local:
+        mirror = ctx.obj.get_local_mirror(tags_only=True)
+        if all_pages or (parallel or 1) > 1:
+            echo_records(
+                ctx, mirror.iter_tags(fields=projection, offset=offset), projection
+            )
+            return
+        limit = limit or DEFAULT_PAGE_SIZE
+        offset = offset or 0
+        data = generate_page_payload(
+            ctx.obj.config.url,
+            "/api/tags/",
+            list(mirror.iter_tags(fields=projection, limit=limit, offset=offset)),
+            mirror.count_tags(),
+            limit=limit,
+            offset=offset,
+        )
+        echo_data(ctx, data)
+        return
+
     api_kwargs = generate_api_payload(
         (
             (CONF_LIMIT, limit),
@@ -57,23 +426,79 @@ def get_all(
         )
     )
 
-    data = asyncio.run(ctx.obj.client.tags.async_get_all(**api_kwargs))
-    typer.echo(json.dumps(data))
+    if all_pages or (parallel or 1) > 1:
+        with open_record_writer(ctx, projection, project=True) as writer:
+            ctx.obj.run(
+                async_write_all_results(
+                    writer,
+                    ctx.obj.client.tags.async_get_all,
+                    parallel=parallel,
+                    **api_kwargs,
+                )
+            )
+        return
+
+    data = ctx.obj.run(ctx.obj.client.tags.async_get_all(**api_kwargs))
+    echo_data(ctx, data, projection)
 
 
 @log_exception()
 def get_by_id(
     ctx: typer.Context,
-    tag_id: int = typer.Argument(..., help="The ID of a tag to retrieve."),
+    tag_id: int = typer.Argument(
+        None, help="The ID of a tag to retrieve.", show_default=False
+    ),
+    fields: str = OPTION_FIELDS,
+    local: bool = typer.Option(
+        False,
+        "--local",
+        help="Answer from the local mirror (see `linkding sync`).",
+    ),
+    tag_name: str = typer.Option(
+        None,
+        "--name",
+        "-n",
+        help="Retrieve the tag with this name (case-insensitively) instead.",
+        metavar="NAME",
+    ),
 ) -> None:
-    """Get a tag by its linkding ID.
+    """Get a tag by its linkding ID (or name).
 
     Args:
         ctx: A Typer Context object.
         tag_id: The ID of a tag to retrieve.
+        fields: A comma-separated list of fields of the tag to output.
+        local: Answer from the local mirror.
+        tag_name: The name of a tag to retrieve.
+
+    Raises:
+        LinkDingCliError: Raised when the tag can't be found.
     """
-    data = asyncio.run(ctx.obj.client.tags.async_get_single(tag_id))
-    typer.echo(json.dumps(data))
+    projection = parse_fields(fields)
+
+    if bool(tag_id) == bool(tag_name):
+        raise LinkDingCliError("Provide either a tag ID or a --name")
+
+    if local:
+        mirror = ctx.obj.get_local_mirror(tags_only=True)
+        if tag_name:
+            data = mirror.get_tag_by_name(tag_name, fields=projection)
+        else:
+            data = mirror.get_tag(tag_id, fields=projection)
+        if data is None:
+            raise LinkDingCliError(
+                f"Tag {tag_name or tag_id} isn't in the local mirror"
+            )
+        echo_data(ctx, data)
+        return
+
+    if tag_name:
+        if (tag := ctx.obj.run(_async_get_tag_by_name(ctx, tag_name))) is None:
+            raise LinkDingCliError(f"There is no tag named {tag_name}")
+        tag_id = tag["id"]
+
+    data = ctx.obj.run(ctx.obj.client.tags.async_get_single(tag_id))
+    echo_data(ctx, data, projection)
 
 
 @log_exception()
@@ -82,7 +507,101 @@ def main(_: typer.Context) -> None:
     pass
 
 
+@log_exception()
+def merge(
+    ctx: typer.Context,
+    old_tag_name: str = typer.Argument(..., help="The tag to merge.", metavar="OLD"),
+    new_tag_name: str = typer.Argument(
+        ..., help="The tag to merge it into.", metavar="NEW"
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+) -> None:
+    """Replace a tag with another one on every bookmark (archived or not).
+
+    Args:
+        ctx: A Typer Context object.
+        old_tag_name: The tag to merge.
+        new_tag_name: The tag to merge it into.
+        concurrency: The maximum number of requests to have in flight at once.
+
+    Raises:
+        LinkDingCliError: Raised when merging a tag into itself.
+    """
+    if old_tag_name == new_tag_name:
+        raise LinkDingCliError("Can't merge a tag into itself")
+
+    _run_retag(
+        ctx,
+        [
+            ctx.obj.client.bookmarks.async_get_all,
+            ctx.obj.client.bookmarks.async_get_archived,
+        ],
+        f"#{old_tag_name}",
+        [new_tag_name],
+        [old_tag_name],
+        concurrency,
+    )
+
+
+@log_exception()
+def retag(
+    ctx: typer.Context,
+    add: str = typer.Option(
+        None,
+        "--add",
+        help="The tags to add to each bookmark.",
+        metavar="TAG1,TAG2,...",
+    ),
+    archived: bool = typer.Option(
+        False,
+        "--archived",
+        "-a",
+        help="Retag archived bookmarks.",
+    ),
+    concurrency: int = BULK_OPTION_CONCURRENCY,
+    query: str = typer.Option(
+        None,
+        "--query",
+        "-q",
+        help="Only retag bookmarks containing a query string.",
+        metavar="QUERY",
+    ),
+    remove: str = typer.Option(
+        None,
+        "--remove",
+        help="The tags to remove from each bookmark.",
+        metavar="TAG1,TAG2,...",
+    ),
+) -> None:
+    """Add and remove tags across every bookmark that matches a query.
+
+    Args:
+        ctx: A Typer Context object.
+        add: The tags to add to each bookmark.
+        archived: Retag archived bookmarks.
+        concurrency: The maximum number of requests to have in flight at once.
+        query: Only retag bookmarks containing a query string.
+        remove: The tags to remove from each bookmark.
+
+    Raises:
+        LinkDingCliError: Raised when there are no tags to add or remove.
+    """
+    tags_to_add = _split_tags(add)
+    tags_to_remove = _split_tags(remove)
+    if not tags_to_add and not tags_to_remove:
+        raise LinkDingCliError("No tags to add or remove")
+
+    if archived:
+        api_func = ctx.obj.client.bookmarks.async_get_archived
+    else:
+        api_func = ctx.obj.client.bookmarks.async_get_all
+
+    _run_retag(ctx, [api_func], query, tags_to_add, tags_to_remove, concurrency)
+
+
 TAG_APP = typer.Typer(callback=main)
 TAG_APP.command(name="all")(get_all)
 TAG_APP.command(name="create")(create)
 TAG_APP.command(name="get")(get_by_id)
+TAG_APP.command(name="merge")(merge)
+TAG_APP.command(name="retag")(retag)
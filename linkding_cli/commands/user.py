@@ -2,23 +2,22 @@
 
 from __future__ import annotations
 
-import asyncio
-import json
-
 import typer
 
 from linkding_cli.helpers.logging import log_exception
+from linkding_cli.helpers.output import OPTION_FIELDS, echo_data, parse_fields
 
 
 @log_exception()
-def get_profile_info(ctx: typer.Context) -> None:
+def get_profile_info(ctx: typer.Context, fields: str = OPTION_FIELDS) -> None:
     """Get all tags.
 
     Args:
         ctx: A Typer Context object.
+        fields: A comma-separated list of fields of the profile to output.
     """
-    data = asyncio.run(ctx.obj.client.user.async_get_profile())
-    typer.echo(json.dumps(data))
+    data = ctx.obj.run(ctx.obj.client.user.async_get_profile())
+    echo_data(ctx, data, parse_fields(fields))
 
 
 @log_exception()
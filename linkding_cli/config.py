@@ -2,16 +2,129 @@
 
 from __future__ import annotations
 
-from typing import cast
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, cast
 
 import typer
-from ruamel.yaml import YAML
 
-from linkding_cli.const import CONF_TOKEN, CONF_URL, CONF_VERBOSE, LOGGER
+from linkding_cli.const import (
+    APP_NAME,
+    CONF_CACHE,
+    CONF_CACHE_MAX_SIZE,
+    CONF_CACHE_TTLS,
+    CONF_DATA_DIR,
+    CONF_METRICS_FILE,
+    CONF_OUTPUT,
+    CONF_PROFILE,
+    CONF_PROFILE_FILE,
+    CONF_PROFILE_MEMORY,
+    CONF_RATE,
+    CONF_RATE_BURST,
+    CONF_RATE_SHARED,
+    CONF_RETRIES,
+    CONF_TOKEN,
+    CONF_TRACE,
+    CONF_TRACE_FILE,
+    CONF_TRANSPORT,
+    CONF_URL,
+    CONF_VERBOSE,
+    DEFAULT_RETRIES,
+    LOGGER,
+)
 from linkding_cli.errors import ConfigError
+from linkding_cli.helpers.output import OUTPUT_FORMATS
+from linkding_cli.helpers.transport import TransportOptions
 
 CONF_CONFIG = "config"
 
+CONFIG_CACHE_DIR_NAME = "config-cache"
+
+
+def _parse_config_file(path: Path) -> Any:
+    """Parse a config file.
+
+    TOML files (by extension) are parsed as TOML; anything else is parsed as JSON,
+    falling back to YAML (a superset of JSON that's much slower to parse).
+
+    Args:
+        path: The path to the config file.
+
+    Returns:
+        The parsed config.
+
+    Raises:
+        ConfigError: Raised when a TOML file can't be parsed.
+    """
+    contents = path.read_text(encoding="utf-8")
+
+    if path.suffix == ".toml":
+        try:
+            import tomllib  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise ConfigError("TOML config files require Python 3.11 or later") from err
+        try:
+            return tomllib.loads(contents)
+        except tomllib.TOMLDecodeError as err:
+            raise ConfigError(f"Unable to parse config file: {path}") from err
+
+    try:
+        return json.loads(contents)
+    except ValueError:
+        pass
+
+    # ruamel.yaml is slow to import, so only do so when there's YAML to parse:
+    from ruamel.yaml import YAML  # pylint: disable=import-outside-toplevel
+
+    return YAML(typ="safe").load(contents)
+
+
+def _load_config_file(path: Path) -> Any:
+    """Load a config file, reusing its parsed contents if it hasn't changed.
+
+    Parsed configs are cached (as JSON, which is fast to load) in the app directory,
+    keyed by the file's path, modification time, and size.
+
+    Args:
+        path: The path to the config file.
+
+    Returns:
+        The parsed config.
+    """
+    stat = path.stat()
+    key = {"path": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    cache_path = (
+        Path(typer.get_app_dir(APP_NAME))
+        / CONFIG_CACHE_DIR_NAME
+        / f"{hashlib.sha256(str(path).encode()).hexdigest()[:12]}.json"
+    )
+
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached["key"] == key:
+            return cached["config"]
+    except (KeyError, OSError, TypeError, ValueError):
+        pass
+
+    config = _parse_config_file(path)
+
+    try:
+        cached_config = json.dumps({"key": key, "config": config})
+        # Configs (which usually hold a token) are only readable by the current user:
+        cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.touch(mode=0o600)
+        tmp_path.write_text(cached_config, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # The app directory isn't writable or the config has values JSON can't hold
+        # (e.g., YAML dates), so it'll be parsed again next time:
+        pass
+
+    return config
+
 
 class Config:
     """Define the config manager object."""
@@ -33,9 +146,7 @@ class Config:
 
         # If the user provides a config file, attempt to load it:
         if config_path := ctx.params[CONF_CONFIG]:
-            parser = YAML(typ="safe")
-            with open(config_path, encoding="utf-8") as config_file:
-                self._config = parser.load(config_file)
+            self._config = _load_config_file(Path(config_path))
 
         if not isinstance(self._config, dict):
             raise ConfigError(f"Unable to parse config file: {config_path}")
@@ -53,6 +164,21 @@ class Config:
             if not self._config[param]:
                 raise ConfigError(f"Missing required option: --{param}")
 
+        # Check the output format up front, rather than after a command has run:
+        if self.output not in (None, *OUTPUT_FORMATS):
+            raise ConfigError(f"Invalid output format: {self.output}")
+
+        self._rate: float | None = None
+        if (rate := self._config.get(CONF_RATE)) is not None:
+            try:
+                self._rate = float(rate)
+            except (TypeError, ValueError) as err:
+                raise ConfigError(f"Invalid {CONF_RATE}: {rate}") from err
+            if not self._rate > 0:
+                raise ConfigError(f"Invalid {CONF_RATE}: {rate}")
+
+        self._transport = TransportOptions.from_config(self._config.get(CONF_TRANSPORT))
+
         LOGGER.debug("Loaded Config: %s", self)
 
     def __str__(self) -> str:
@@ -63,6 +189,140 @@ class Config:
         """
         return f"<Config token={self.token} url={self.url} verbose={self.verbose}>"
 
+    @property
+    def cache(self) -> bool:
+        """Return whether API responses should be cached.
+
+        Returns:
+            Whether API responses should be cached.
+        """
+        return bool(self._config.get(CONF_CACHE))
+
+    @property
+    def cache_max_size(self) -> int | None:
+        """Return the maximum size (in bytes) of the response cache.
+
+        Returns:
+            The maximum size of the response cache (or None to use the default).
+        """
+        if max_size := self._config.get(CONF_CACHE_MAX_SIZE):
+            return int(max_size)
+        return None
+
+    @property
+    def cache_ttls(self) -> dict[str, int]:
+        """Return the per-endpoint TTLs (in seconds) that override the defaults.
+
+        Returns:
+            A mapping of endpoint prefixes to TTLs.
+
+        Raises:
+            ConfigError: Raised upon an invalid mapping.
+        """
+        ttls: Any = self._config.get(CONF_CACHE_TTLS) or {}
+        if not isinstance(ttls, dict):
+            raise ConfigError(f"Invalid {CONF_CACHE_TTLS}: {ttls}")
+        return {str(endpoint): int(ttl) for endpoint, ttl in ttls.items()}
+
+    @property
+    def data_dir(self) -> Path:
+        """Return the directory in which local data is stored.
+
+        Returns:
+            The local data directory.
+        """
+        if data_dir := self._config.get(CONF_DATA_DIR):
+            return Path(data_dir)
+        return Path(typer.get_app_dir(APP_NAME))
+
+    @property
+    def metrics_file(self) -> Path | None:
+        """Return the file to write metrics about the command's run to.
+
+        Returns:
+            The metrics file (or None to not write metrics).
+        """
+        if metrics_file := self._config.get(CONF_METRICS_FILE):
+            return Path(metrics_file)
+        return None
+
+    @property
+    def output(self) -> str | None:
+        """Return the format to output data in.
+
+        Returns:
+            The output format (or None to use the default).
+        """
+        return cast("str | None", self._config.get(CONF_OUTPUT))
+
+    @property
+    def profile(self) -> bool:
+        """Return whether the command's CPU time should be profiled.
+
+        Returns:
+            Whether the command's CPU time should be profiled.
+        """
+        return bool(self._config.get(CONF_PROFILE) or self.profile_file)
+
+    @property
+    def profile_file(self) -> Path | None:
+        """Return the file to save the command's CPU profile to.
+
+        Returns:
+            The profile file (or None to print the profile's hot spots).
+        """
+        if profile_file := self._config.get(CONF_PROFILE_FILE):
+            return Path(profile_file)
+        return None
+
+    @property
+    def profile_memory(self) -> bool:
+        """Return whether the command's memory allocations should be tracked.
+
+        Returns:
+            Whether the command's memory allocations should be tracked.
+        """
+        return bool(self._config.get(CONF_PROFILE_MEMORY))
+
+    @property
+    def rate(self) -> float | None:
+        """Return the maximum number of API requests to make per second.
+
+        Returns:
+            The maximum request rate (or None for no limit).
+        """
+        return self._rate
+
+    @property
+    def rate_burst(self) -> int:
+        """Return the number of API requests that can be made at once after a lull.
+
+        Returns:
+            The burst size (by default, one second's worth of requests).
+        """
+        if burst := self._config.get(CONF_RATE_BURST):
+            return int(burst)
+        return max(round(self.rate or 1), 1)
+
+    @property
+    def rate_shared(self) -> bool:
+        """Return whether the rate limit is shared with other processes on this host.
+
+        Returns:
+            Whether the rate limit is shared.
+        """
+        return bool(self._config.get(CONF_RATE_SHARED, True))
+
+    @property
+    def retries(self) -> int:
+        """Return the maximum number of times to retry a failed request.
+
+        Returns:
+            The maximum number of retries.
+        """
+        retries = self._config.get(CONF_RETRIES)
+        return DEFAULT_RETRIES if retries is None else int(retries)
+
     @property
     def token(self) -> str:
         """Return the linkding API token.
@@ -72,6 +332,35 @@ class Config:
         """
         return cast(str, self._config[CONF_TOKEN])
 
+    @property
+    def trace(self) -> bool:
+        """Return whether API requests should be traced.
+
+        Returns:
+            Whether API requests should be traced.
+        """
+        return bool(self._config.get(CONF_TRACE) or self.trace_file)
+
+    @property
+    def trace_file(self) -> Path | None:
+        """Return the file to write the spans of traced API requests to.
+
+        Returns:
+            The spans file (or None to only print a summary).
+        """
+        if trace_file := self._config.get(CONF_TRACE_FILE):
+            return Path(trace_file)
+        return None
+
+    @property
+    def transport(self) -> TransportOptions:
+        """Return the options for the HTTP transport.
+
+        Returns:
+            A TransportOptions object.
+        """
+        return self._transport
+
     @property
     def url(self) -> str:
         """Return the linkding URL.
@@ -4,12 +4,38 @@ import logging
 
 LOGGER = logging.getLogger(__package__)
 
+APP_NAME = "linkding-cli"
+
+DEFAULT_RETRIES = 3
+
+CONF_CACHE = "cache"
+CONF_CACHE_MAX_SIZE = "cache_max_size"
+CONF_CACHE_TTLS = "cache_ttls"
+CONF_DATA_DIR = "data_dir"
 CONF_LIMIT = "limit"
+CONF_METRICS_FILE = "metrics_file"
 CONF_OFFSET = "offset"
+CONF_OUTPUT = "output"
+CONF_PROFILE = "profile"
+CONF_PROFILE_FILE = "profile_file"
+CONF_PROFILE_MEMORY = "profile_memory"
+CONF_RATE = "rate"
+CONF_RATE_BURST = "rate_burst"
+CONF_RATE_SHARED = "rate_shared"
+CONF_RETRIES = "retries"
 CONF_TOKEN = "token"  # noqa: S105, # nosec
+CONF_TRACE = "trace"
+CONF_TRACE_FILE = "trace_file"
+CONF_TRANSPORT = "transport"
 CONF_URL = "url"
 CONF_VERBOSE = "verbose"
 
+ENV_CACHE = "LINKDING_CACHE"
 ENV_CONFIG = "LINKDING_CONFIG"
+ENV_DATA_DIR = "LINKDING_DATA_DIR"
+ENV_METRICS_FILE = "LINKDING_METRICS_FILE"
+ENV_OUTPUT = "LINKDING_OUTPUT"
+ENV_RATE = "LINKDING_RATE"
+ENV_RETRIES = "LINKDING_RETRIES"
 ENV_TOKEN = "LINKDING_TOKEN"  # noqa: S105, # nosec
 ENV_URL = "LINKDING_URL"
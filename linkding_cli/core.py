@@ -2,15 +2,35 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+from collections.abc import Coroutine, Iterator
+from contextlib import AsyncExitStack, ExitStack, contextmanager
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import typer
-from aiolinkding import Client
 
 from linkding_cli.config import Config
 from linkding_cli.const import CONF_VERBOSE
+from linkding_cli.errors import LinkDingCliError
 from linkding_cli.helpers.logging import TyperLoggerHandler
 
+if TYPE_CHECKING:
+    import asyncio
+    from pathlib import Path
+
+    from linkding_cli.client import LinkDingClient
+    from linkding_cli.helpers.cache import ResponseCache
+    from linkding_cli.helpers.metrics import MetricsCollector
+    from linkding_cli.helpers.mirror import Mirror
+    from linkding_cli.helpers.profiling import Profiler
+    from linkding_cli.helpers.ratelimit import RateLimiter
+    from linkding_cli.helpers.tracing import Tracer
+
+_T = TypeVar("_T")
+
 
 class LinkDing:  # pylint: disable=too-few-public-methods
     """Define a master linkding manager object."""
@@ -34,4 +54,240 @@ class LinkDing:  # pylint: disable=too-few-public-methods
         )
 
         self.config = Config(ctx)
-        self.client = Client(self.config.url, self.config.token)
+        # Long-running commands (e.g., the daemon) set this to cache API responses in
+        # memory when the on-disk cache isn't enabled:
+        self.memory_cache = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.metrics: MetricsCollector | None = None
+        if metrics_file := self.config.metrics_file:
+            # pylint: disable-next=import-outside-toplevel
+            from linkding_cli.helpers.metrics import MetricsCollector
+
+            self.metrics = MetricsCollector(metrics_file)
+
+        self.profiler: Profiler | None = None
+        if self.config.profile or self.config.profile_memory:
+            # pylint: disable-next=import-outside-toplevel
+            from linkding_cli.helpers.profiling import Profiler
+
+            self.profiler = Profiler(
+                cpu=self.config.profile,
+                memory=self.config.profile_memory,
+                path=self.config.profile_file,
+            )
+
+        self.tracer: Tracer | None = None
+        if self.config.trace:
+            # pylint: disable-next=import-outside-toplevel
+            from linkding_cli.helpers.tracing import Tracer
+
+            self.tracer = Tracer(self.config.trace_file)
+            ctx.call_on_close(self._close_tracer)
+
+    def _build_cache(self) -> ResponseCache:
+        """Build the response cache for this linkding instance and token.
+
+        Returns:
+            A ResponseCache object.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from linkding_cli.helpers.cache import ResponseCache
+
+        if not self.config.cache:
+            return ResponseCache(
+                None,
+                max_size=self.config.cache_max_size,
+                ttls=self.config.cache_ttls,
+            )
+
+        digest = hashlib.sha256(
+            f"{self.config.url}|{self.config.token}".encode()
+        ).hexdigest()[:12]
+        return ResponseCache(
+            self.config.data_dir / f"cache-{digest}.sqlite3",
+            max_size=self.config.cache_max_size,
+            ttls=self.config.cache_ttls,
+        )
+
+    def _build_rate_limiter(self) -> RateLimiter | None:
+        """Build the rate limiter for requests to this linkding instance.
+
+        Returns:
+            A RateLimiter object (or None if requests aren't rate-limited).
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from linkding_cli.helpers.ratelimit import RateLimiter
+
+        if not (rate := self.config.rate):
+            return None
+
+        state_path = None
+        if self.config.rate_shared:
+            url_digest = hashlib.sha256(self.config.url.encode()).hexdigest()[:12]
+            state_path = self.config.data_dir / f"ratelimit-{url_digest}"
+        return RateLimiter(rate, self.config.rate_burst, state_path=state_path)
+
+    def _close_tracer(self) -> None:
+        """Close the tracer and print a summary of the traced requests.
+
+        The summary goes to stderr, so that it doesn't mix with the command's output.
+        """
+        if self.tracer:
+            self.tracer.close()
+            typer.echo(self.tracer.summarize(), err=True)
+
+    @cached_property
+    def client(self) -> LinkDingClient:
+        """Return the API client.
+
+        The client (and with it, aiohttp) is only imported and built the first time a
+        command needs it, so that --help and local-only commands start quickly.
+
+        Returns:
+            A LinkDingClient object.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from linkding_cli.client import LinkDingClient
+
+        return LinkDingClient(
+            self.config.url,
+            self.config.token,
+            cache=(
+                self._build_cache() if self.config.cache or self.memory_cache else None
+            ),
+            rate_limiter=self._build_rate_limiter(),
+            retries=self.config.retries,
+            span_recorders=[
+                span_recorder
+                for span_recorder in (self.metrics, self.tracer)
+                if span_recorder
+            ],
+            transport=self.config.transport,
+        )
+
+    def get_local_mirror(self, *, tags_only: bool = False) -> Mirror:
+        """Get the local mirror, for commands that answer from it (with --local).
+
+        Unlike the mirror property, this doesn't create a mirror that doesn't exist
+        (which would answer every command with nothing).
+
+        Args:
+            tags_only: Whether only the mirror's tags are needed (which the tag name
+                index keeps, even if the mirror has never been synced).
+
+        Returns:
+            A Mirror object.
+
+        Raises:
+            LinkDingCliError: Raised when the mirror has never been synced.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from linkding_cli.helpers.mirror import META_LAST_SYNC, META_TAGS_INDEXED
+
+        meta_key = META_TAGS_INDEXED if tags_only else META_LAST_SYNC
+        if not self.mirror_path.exists() or self.mirror.get_meta(meta_key) is None:
+            raise LinkDingCliError(
+                "There's no local mirror yet; run `linkding sync` first"
+            )
+        return self.mirror
+
+    @cached_property
+    def mirror(self) -> Mirror:
+        """Return the local mirror of this linkding instance.
+
+        Returns:
+            A Mirror object.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from linkding_cli.helpers.mirror import Mirror
+
+        return Mirror(self.mirror_path)
+
+    @property
+    def mirror_path(self) -> Path:
+        """Return the path to the local mirror (which may not exist yet).
+
+        Returns:
+            The path to the mirror's SQLite database.
+        """
+        url_digest = hashlib.sha256(self.config.url.encode()).hexdigest()[:12]
+        return self.config.data_dir / f"mirror-{url_digest}.sqlite3"
+
+    @contextmanager
+    def persistent_loop(self) -> Iterator[None]:
+        """Keep one event loop and HTTP session alive for every run() in the context.
+
+        The loop runs in a background thread, so run() can be called from any thread
+        (including several at once) and every call shares the same connection pool.
+        Nested contexts reuse the outermost loop.
+
+        Yields:
+            Nothing; coroutines passed to run() within the context use the loop.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        if self._loop is not None:
+            yield
+            return
+
+        loop = asyncio.new_event_loop()
+
+        def run_loop() -> None:
+            """Run the loop (profiling it, if the command is being profiled)."""
+            with ExitStack() as stack:
+                if self.profiler:
+                    stack.enter_context(self.profiler.profile_thread())
+                loop.run_forever()
+
+        thread = threading.Thread(target=run_loop, daemon=True)
+        thread.start()
+
+        stack = AsyncExitStack()
+        asyncio.run_coroutine_threadsafe(
+            stack.enter_async_context(self.client.async_session()), loop
+        ).result()
+        self._loop = loop
+
+        try:
+            yield
+        finally:
+            self._loop = None
+            asyncio.run_coroutine_threadsafe(stack.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """Run a coroutine to completion.
+
+        Every API request the coroutine makes shares a single HTTP session. Within
+        persistent_loop(), the coroutine runs on the persistent loop instead of a
+        new one.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            The coroutine's return value.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        async def async_run() -> _T:
+            """Run the coroutine within a shared session.
+
+            Returns:
+                The coroutine's return value.
+            """
+            async with self.client.async_session():
+                return await coro
+
+        if self._loop is None:
+            return asyncio.run(async_run())
+
+        future = asyncio.run_coroutine_threadsafe(async_run(), self._loop)
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            future.cancel()
+            raise
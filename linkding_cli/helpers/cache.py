@@ -0,0 +1,229 @@
+"""Define an on-disk cache of API responses."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import urlencode
+
+# The number of seconds a response from each endpoint stays fresh (the longest
+# matching endpoint prefix wins); responses from other endpoints aren't cached:
+DEFAULT_CACHE_TTLS = {
+    "/api/tags/": 300,
+    "/api/user/profile/": 3600,
+}
+DEFAULT_CACHE_MAX_SIZE = 16 * 1024 * 1024
+
+# The endpoints whose cached responses a write to an endpoint may make outdated
+# (e.g., creating or updating a bookmark can create new tags):
+INVALIDATED_ENDPOINTS = {
+    "/api/bookmarks/": ("/api/bookmarks/", "/api/tags/"),
+    "/api/tags/": ("/api/tags/",),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+class CacheEntry(NamedTuple):
+    """Define a cached API response."""
+
+    data: dict[str, Any]
+    etag: str | None
+    last_modified: str | None
+    fresh: bool
+
+
+def _generate_key(endpoint: str, params: dict[str, Any] | None) -> str:
+    """Generate the cache key of a request.
+
+    Args:
+        endpoint: A relative API endpoint.
+        params: The request's query parameters.
+
+    Returns:
+        A cache key.
+    """
+    if not params:
+        return endpoint
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+class ResponseCache:
+    """Define an SQLite-backed, size-capped LRU cache of API responses."""
+
+    def __init__(
+        self,
+        path: Path | None,
+        *,
+        max_size: int | None = None,
+        ttls: dict[str, int] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            path: The path to the SQLite database file (or None to keep the cache in
+                memory, for long-running processes).
+            max_size: The maximum total size (in bytes) of the cached responses
+                (defaults to DEFAULT_CACHE_MAX_SIZE).
+            ttls: Per-endpoint TTLs that override DEFAULT_CACHE_TTLS.
+        """
+        self._max_size = max_size or DEFAULT_CACHE_MAX_SIZE
+        self._ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+
+        if path is None:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def get(self, endpoint: str, params: dict[str, Any] | None) -> CacheEntry | None:
+        """Get the cached response to a request.
+
+        Args:
+            endpoint: A relative API endpoint.
+            params: The request's query parameters.
+
+        Returns:
+            The cached response (or None if there isn't one).
+        """
+        key = _generate_key(endpoint, params)
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT data, etag, last_modified, expires FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+
+        data, etag, last_modified, expires = row
+        return CacheEntry(json.loads(data), etag, last_modified, expires > now)
+
+    def invalidate(self, endpoint: str) -> int:
+        """Drop the cached responses that a write to an endpoint may make outdated.
+
+        Args:
+            endpoint: The relative API endpoint that was written to.
+
+        Returns:
+            The number of dropped responses.
+        """
+        prefixes = next(
+            (
+                invalidated
+                for prefix, invalidated in INVALIDATED_ENDPOINTS.items()
+                if endpoint.startswith(prefix)
+            ),
+            (endpoint,),
+        )
+        with self._conn:
+            return sum(
+                self._conn.execute(
+                    "DELETE FROM responses WHERE substr(endpoint, 1, ?) = ?",
+                    (len(prefix), prefix),
+                ).rowcount
+                for prefix in prefixes
+            )
+
+    def refresh(self, endpoint: str, params: dict[str, Any] | None) -> None:
+        """Mark a cached response as fresh again (e.g., after revalidating it).
+
+        Args:
+            endpoint: A relative API endpoint.
+            params: The request's query parameters.
+        """
+        with self._conn:
+            self._conn.execute(
+                "UPDATE responses SET expires = ? WHERE key = ?",
+                (time.time() + self.ttl(endpoint), _generate_key(endpoint, params)),
+            )
+
+    def set(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        data: dict[str, Any],
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Cache the response to a request, evicting the least recently used ones if
+        the cache grows beyond its maximum size.
+
+        Args:
+            endpoint: A relative API endpoint.
+            params: The request's query parameters.
+            data: The API response payload.
+            etag: The response's ETag header.
+            last_modified: The response's Last-Modified header.
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, data, etag, "
+                "last_modified, expires, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _generate_key(endpoint, params),
+                    endpoint,
+                    json.dumps(data),
+                    etag,
+                    last_modified,
+                    now + self.ttl(endpoint),
+                    now,
+                ),
+            )
+
+            [size] = self._conn.execute(
+                "SELECT COALESCE(SUM(length(data)), 0) FROM responses"
+            ).fetchone()
+            if size <= self._max_size:
+                return
+
+            evicted_keys = []
+            for key, entry_size in self._conn.execute(
+                "SELECT key, length(data) FROM responses ORDER BY accessed"
+            ).fetchall():
+                if size <= self._max_size:
+                    break
+                evicted_keys.append((key,))
+                size -= entry_size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted_keys)
+
+    def ttl(self, endpoint: str) -> int:
+        """Return the number of seconds a response from an endpoint stays fresh.
+
+        Args:
+            endpoint: A relative API endpoint.
+
+        Returns:
+            A TTL (zero if responses from the endpoint shouldn't be cached).
+        """
+        prefixes = [prefix for prefix in self._ttls if endpoint.startswith(prefix)]
+        if not prefixes:
+            return 0
+        return self._ttls[max(prefixes, key=len)]
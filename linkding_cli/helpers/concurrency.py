@@ -0,0 +1,250 @@
+"""Define concurrency helpers."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+)
+from time import monotonic
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+
+DEFAULT_CONCURRENCY = 8
+
+# The most requests the adaptive concurrency limit grows to; unless the user sets a
+# --concurrency (or --parallel) of their own, enough workers are started to reach it:
+MAX_CONCURRENCY = 32
+
+# How much to shrink the concurrency limit by upon a congestion signal:
+CONGESTION_DECREASE_FACTOR = 0.5
+# How much slower than usual a response has to be to count as a congestion signal
+# (and how many responses make "usual"):
+LATENCY_TOLERANCE = 2.0
+LATENCY_MIN_SAMPLES = 20
+# The weights of each new latency in the short- and long-term moving averages:
+LATENCY_SHORT_WEIGHT = 0.3
+LATENCY_LONG_WEIGHT = 0.02
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+_WORKER_DONE = object()
+
+
+def resolve_concurrency(concurrency: int | None) -> int:
+    """Resolve a --concurrency (or --parallel) option into a number of workers.
+
+    Args:
+        concurrency: The option's value (or None if the user didn't set it).
+
+    Returns:
+        The number of workers to start.
+    """
+    return MAX_CONCURRENCY if concurrency is None else concurrency
+
+
+async def async_bounded_map(
+    func: Callable[[_T], Awaitable[_R]],
+    items: Iterable[_T] | AsyncIterable[_T],
+    concurrency: int | None,
+) -> AsyncIterator[tuple[_T, _R | None, Exception | None]]:
+    """Apply a coroutine function to many items with bounded concurrency.
+
+    Items are pulled from the iterable lazily, so it can be a stream (e.g., lines of
+    stdin or pages of API results) of any size. Results are yielded in completion
+    order.
+
+    Args:
+        func: The coroutine function to apply to each item.
+        items: The items to process (synchronously or asynchronously iterable).
+        concurrency: The maximum number of coroutines in flight at once (or None to
+            leave it to the client's adaptive concurrency limit).
+
+    Yields:
+        An (item, result, exception) tuple for each item; exactly one of result and
+        exception is meaningful.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    concurrency = resolve_concurrency(concurrency)
+    queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=concurrency)
+
+    if isinstance(items, AsyncIterable):
+        async_iterator = aiter(items)
+        # An async generator can't be advanced by more than one worker at a time:
+        lock = asyncio.Lock()
+
+        async def async_next() -> Any:
+            """Get the next item.
+
+            Returns:
+                The next item (or _WORKER_DONE if there are none left).
+            """
+            async with lock:
+                return await anext(async_iterator, _WORKER_DONE)
+
+    else:
+        iterator = iter(items)
+
+        async def async_next() -> Any:
+            """Get the next item.
+
+            Returns:
+                The next item (or _WORKER_DONE if there are none left).
+            """
+            return next(iterator, _WORKER_DONE)
+
+    async def async_worker() -> None:
+        """Process items until the iterator is exhausted."""
+        try:
+            while (item := await async_next()) is not _WORKER_DONE:
+                try:
+                    result = await func(item)
+                except Exception as err:  # pylint: disable=broad-except
+                    await queue.put((item, None, err))
+                else:
+                    await queue.put((item, result, None))
+        finally:
+            await queue.put(_WORKER_DONE)
+
+    workers = [asyncio.create_task(async_worker()) for _ in range(concurrency)]
+
+    try:
+        remaining_workers = len(workers)
+        while remaining_workers:
+            if (entry := await queue.get()) is _WORKER_DONE:
+                remaining_workers -= 1
+                continue
+            yield entry
+        # Surface any error raised while reading items:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+
+class AdaptiveConcurrencyLimiter:
+    """Define a limit on in-flight requests that adapts to the server's capacity.
+
+    The limit grows while every slot is in use and responses are healthy: by one per
+    response until the first congestion signal (like TCP's slow start), then by one
+    per limit's worth of responses. A congestion signal (an overloaded response, or a
+    response much slower than the recent average) multiplies the limit by
+    CONGESTION_DECREASE_FACTOR, at most once per average response time, so that a
+    burst of failures from requests that were already in flight counts once.
+
+    Waiters are plain futures (rather than an asyncio.Semaphore) so that the limiter
+    isn't tied to the first event loop it's used on.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_CONCURRENCY,
+        minimum: int = 1,
+        maximum: int = MAX_CONCURRENCY,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            initial: The initial limit.
+            minimum: The smallest the limit can shrink to.
+            maximum: The largest the limit can grow to.
+        """
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._latency_long: float | None = None
+        self._latency_samples = 0
+        self._latency_short: float | None = None
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._maximum = maximum
+        self._minimum = minimum
+        self._slow_start = True
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Return the current limit.
+
+        Returns:
+            The maximum number of requests to have in flight at once.
+        """
+        return int(self._limit)
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to waiters (in the order they started waiting)."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def async_acquire(self) -> None:
+        """Wait for a free slot."""
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait was cancelled:
+                self.release()
+            raise
+
+    def record_congestion(self) -> None:
+        """Shrink the limit in response to a congestion signal."""
+        now = monotonic()
+        if now - self._last_decrease < (self._latency_long or 0.0):
+            return
+        self._last_decrease = now
+        self._slow_start = False
+        self._limit = max(self._limit * CONGESTION_DECREASE_FACTOR, self._minimum)
+        # Responses that were already slow shouldn't count as a second signal:
+        self._latency_short = self._latency_long
+
+    def record_latency(self, latency: float) -> None:
+        """Record the latency of a healthy response, adjusting the limit.
+
+        Args:
+            latency: The time the response took (in seconds).
+        """
+        if self._latency_short is None or self._latency_long is None:
+            self._latency_short = self._latency_long = latency
+        else:
+            self._latency_short += LATENCY_SHORT_WEIGHT * (
+                latency - self._latency_short
+            )
+            self._latency_long += LATENCY_LONG_WEIGHT * (latency - self._latency_long)
+        self._latency_samples += 1
+
+        if (
+            self._latency_samples >= LATENCY_MIN_SAMPLES
+            and self._latency_short > LATENCY_TOLERANCE * self._latency_long
+        ):
+            self.record_congestion()
+            return
+
+        # Only grow a limit that's actually being reached:
+        if self._in_flight >= self.limit:
+            self._limit = min(
+                self._limit + (1 if self._slow_start else 1 / self._limit),
+                self._maximum,
+            )
+            self._wake_waiters()
+
+    def release(self) -> None:
+        """Free a slot."""
+        self._in_flight -= 1
+        self._wake_waiters()
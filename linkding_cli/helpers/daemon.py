@@ -0,0 +1,184 @@
+"""Define the thin client that forwards commands to a running daemon.
+
+This module is imported before anything else on every run of the CLI, so it only uses
+modules that are quick to import (not Typer, logging, or even linkding_cli.const).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import sys
+from collections.abc import Callable
+from typing import Any, TextIO
+
+ENV_DAEMON_SOCKET = "LINKDING_DAEMON_SOCKET"
+
+# The prefix of the environment variables that make up a daemon's configuration:
+ENV_PREFIX = "LINKDING_"
+
+DAEMON_CONNECT_TIMEOUT = 1.0
+DAEMON_SOCKET_NAME = "daemon.sock"
+
+
+def get_environment_digest() -> str:
+    """Get a digest of the linkding-related environment variables of this process.
+
+    A daemon only runs commands for clients that share its environment, so that (for
+    example) a client pointed at another linkding instance runs its commands itself.
+    Clients send a digest rather than the variables themselves, so that their API
+    token never leaves the process.
+
+    Returns:
+        A hex digest of the environment variables.
+    """
+    # hashlib takes a few milliseconds to import, so only clients that find a daemon
+    # to talk to (and the daemon itself) import it:
+    import hashlib  # pylint: disable=import-outside-toplevel
+
+    environment = {
+        key: value
+        for key, value in os.environ.items()
+        if key.startswith(ENV_PREFIX) and key != ENV_DAEMON_SOCKET
+    }
+    return hashlib.sha256(json.dumps(environment, sort_keys=True).encode()).hexdigest()
+
+
+def get_socket_path() -> str:
+    """Get the path to the daemon's Unix domain socket.
+
+    Returns:
+        The path to the socket.
+    """
+    if path := os.environ.get(ENV_DAEMON_SOCKET):
+        return path
+    if runtime_dir := os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(runtime_dir, "linkding-cli", DAEMON_SOCKET_NAME)
+    return os.path.join(
+        os.environ.get("TMPDIR", "/tmp"),  # noqa: S108
+        f"linkding-cli-{os.getuid()}",
+        DAEMON_SOCKET_NAME,
+    )
+
+
+def is_private(path: str, *, is_type: Callable[[int], bool]) -> bool:
+    """Return whether a file is of a type and only the current user can access it.
+
+    Symbolic links aren't followed, so a link to a private file isn't private.
+
+    Args:
+        path: The path to the file.
+        is_type: A function from the stat module (e.g., stat.S_ISDIR) that checks the
+            file's type.
+
+    Returns:
+        Whether the file is private.
+    """
+    try:
+        file_stat = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        is_type(file_stat.st_mode)
+        and file_stat.st_uid == os.getuid()
+        and not file_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+    )
+
+
+def _is_forwardable(argv: list[str]) -> bool:
+    """Return whether a command can run in a daemon.
+
+    The daemon has its own configuration and standard input, so commands that set
+    global options or read stdin are run in-process. (The daemon makes its own
+    decision about commands that refer to relative paths, since only it can tell
+    which arguments are paths.)
+
+    Args:
+        argv: The command's arguments.
+
+    Returns:
+        Whether the command can run in a daemon.
+    """
+    return bool(argv) and not argv[0].startswith("-") and "-" not in argv
+
+
+def request(argv: list[str], stdout: TextIO, stderr: TextIO) -> int | None:
+    """Ask the daemon to run a command, writing its output as it arrives.
+
+    The daemon responds with newline-delimited JSON messages: chunks of the command's
+    output (`{"stdout": ...}`, `{"stderr": ...}`, or base64-encoded binary output as
+    `{"stdout_bytes": ...}`), then its exit code
+    (`{"exit_code": ...}`), unless it asks the client to run the command itself
+    (`{"fallback": true}`, before any output).
+
+    Args:
+        argv: The command's arguments (e.g., `["bookmarks", "get", "12"]`).
+        stdout: The stream to write the command's standard output to.
+        stderr: The stream to write the command's standard error to.
+
+    Returns:
+        The command's exit code, or None if it should be run in-process instead.
+    """
+    if not hasattr(socket, "AF_UNIX") or not _is_forwardable(argv):
+        return None
+
+    # Another user could otherwise pose as the daemon (to collect the commands sent to
+    # it or forge their output):
+    path = get_socket_path()
+    if not is_private(os.path.dirname(path), is_type=stat.S_ISDIR) or not is_private(
+        path, is_type=stat.S_ISSOCK
+    ):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(DAEMON_CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except OSError:
+            # The daemon isn't running (e.g., it was killed and left its socket):
+            return None
+        sock.settimeout(None)
+
+        payload = {"argv": argv, "environment": get_environment_digest()}
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+
+        with sock.makefile("rb") as response:
+            for line in response:
+                try:
+                    message: dict[str, Any] = json.loads(line)
+                except ValueError:
+                    break
+                if message.get("fallback"):
+                    return None
+                if "exit_code" in message:
+                    return int(message["exit_code"])
+                if "stdout_bytes" in message:
+                    # base64 is only imported by commands with binary output:
+                    import base64  # pylint: disable=import-outside-toplevel
+
+                    stdout.flush()
+                    stdout.buffer.write(base64.b64decode(message["stdout_bytes"]))
+                    stdout.buffer.flush()
+                    continue
+                stdout.write(message.get("stdout", ""))
+                stderr.write(message.get("stderr", ""))
+
+    # The daemon stopped before the command finished; it may or may not have done
+    # what it was asked to, so don't run it again:
+    stderr.write("The daemon stopped unexpectedly\n")
+    return 1
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a command in the daemon, outputting its results as if it ran in-process.
+
+    Args:
+        argv: The command's arguments (e.g., `["bookmarks", "get", "12"]`).
+
+    Returns:
+        The command's exit code, or None if it should be run in-process instead.
+    """
+    return request(argv, sys.stdout, sys.stderr)
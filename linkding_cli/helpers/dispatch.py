@@ -0,0 +1,260 @@
+"""Define helpers to run CLI commands in-process."""
+
+from __future__ import annotations
+
+import io
+import logging
+import sys
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, TextIO, cast
+
+import click
+import typer
+
+# Commands that take over standard input (or run until stopped), so they can't be run
+# from within another:
+UNDISPATCHABLE_COMMANDS = {"batch", "daemon", "shell"}
+
+
+def get_root_command() -> click.Group:
+    """Get the Click group that holds every CLI command.
+
+    Returns:
+        A Click Group object.
+    """
+    # pylint: disable-next=import-outside-toplevel,cyclic-import
+    from linkding_cli.cli import APP
+
+    return cast(click.Group, typer.main.get_command(APP))
+
+
+def dispatch(ctx: typer.Context, root: click.Group, args: list[str]) -> int:
+    """Run a CLI command in-process, reusing the current LinkDing object.
+
+    The root command's options (and with them, the config and client) aren't parsed
+    again; `args` starts with a subcommand (e.g., `["bookmarks", "get", "12"]`).
+
+    Args:
+        ctx: A Typer Context object.
+        root: The Click group that holds every CLI command.
+        args: The command's arguments.
+
+    Returns:
+        The command's exit code.
+    """
+    name, *command_args = args
+    if (
+        name in UNDISPATCHABLE_COMMANDS
+        or (command := root.get_command(ctx, name)) is None
+    ):
+        typer.secho(f"No such command: {name}", err=True, fg=typer.colors.BRIGHT_RED)
+        return 2
+
+    try:
+        with ExitStack() as stack:
+            # Commands may run on threads of their own (e.g., in batch or the daemon):
+            if profiler := getattr(ctx.obj, "profiler", None):
+                stack.enter_context(profiler.profile_thread())
+            exit_code = command.main(
+                command_args,
+                obj=ctx.obj,
+                prog_name=f"linkding {name}",
+                standalone_mode=False,
+            )
+    except click.exceptions.Abort:
+        typer.secho("Aborted.", err=True, fg=typer.colors.BRIGHT_RED)
+        return 1
+    except click.ClickException as err:
+        err.show()
+        return err.exit_code
+    return exit_code if isinstance(exit_code, int) else 0
+
+
+@dataclass
+class CapturedOutput:
+    """Define the output of a command run within OutputCapture.capture()."""
+
+    errors: list[str] = field(default_factory=list)
+    stderr: io.TextIOBase = field(default_factory=io.StringIO)
+    stdout: io.TextIOBase = field(default_factory=io.StringIO)
+    last_record: logging.LogRecord | None = None
+
+
+# The output being captured in the current context; a context variable (rather than a
+# thread-local) so that coroutines a command runs on the persistent event loop write
+# to the command's output, too:
+_CAPTURED_OUTPUT: ContextVar[CapturedOutput | None] = ContextVar(
+    "captured_output", default=None
+)
+
+
+class _CapturingStream(io.TextIOBase):
+    """Define a text stream that writes to the current context's captured output."""
+
+    def __init__(self, stream: TextIO, name: str) -> None:
+        """Initialize.
+
+        Args:
+            stream: The stream to write to when output isn't being captured.
+            name: The name of the CapturedOutput buffer to write to.
+        """
+        super().__init__()
+        self._name = name
+        self._stream = stream
+
+    @property
+    def buffer(self) -> BinaryIO:
+        """Return the binary stream underlying the stream.
+
+        Returns:
+            A binary stream.
+
+        Raises:
+            AttributeError: Raised when the current context's output is captured as
+                text (so binary output has nowhere to go).
+        """
+        target = self._target()
+        if (buffer := getattr(target, "buffer", None)) is None:
+            raise AttributeError(f"{type(target).__name__} has no binary buffer")
+        return cast(BinaryIO, buffer)
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        """Return the stream's encoding.
+
+        Returns:
+            An encoding.
+        """
+        return getattr(self._stream, "encoding", None) or "utf-8"
+
+    @property
+    def errors(self) -> str:  # type: ignore[override]
+        """Return the stream's encoding error handling.
+
+        Returns:
+            An error handling scheme.
+        """
+        return getattr(self._stream, "errors", None) or "strict"
+
+    def _target(self) -> TextIO:
+        """Get the stream the current context should write to.
+
+        Returns:
+            A text stream.
+        """
+        if captured := _CAPTURED_OUTPUT.get():
+            return cast(TextIO, getattr(captured, self._name))
+        return self._stream
+
+    def flush(self) -> None:
+        """Flush the stream."""
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        """Return whether the stream is interactive.
+
+        Returns:
+            Whether the stream is interactive.
+        """
+        return self._target().isatty()
+
+    def write(self, text: Any) -> int:
+        """Write text to the stream.
+
+        Args:
+            text: The text to write.
+
+        Returns:
+            The number of characters written.
+
+        Raises:
+            TypeError: Raised when writing anything other than text.
+        """
+        # Click detects binary streams by whether they accept bytes:
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        return self._target().write(text)
+
+
+class _CapturedLogFilter(logging.Filter):
+    """Define a log filter that diverts records logged while capturing output."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Divert a log record if it was logged while capturing output.
+
+        Args:
+            record: The log record.
+
+        Returns:
+            Whether the record should be emitted.
+        """
+        if (captured := _CAPTURED_OUTPUT.get()) is None:
+            return True
+        # The filter is shared by every handler, so only keep each record once:
+        if record.levelno >= logging.ERROR and captured.last_record is not record:
+            captured.errors.append(record.getMessage())
+        captured.last_record = record
+        return False
+
+
+class OutputCapture:
+    """Define a way to capture the output of commands run concurrently in threads.
+
+    While active, stdout and stderr are replaced with streams that write to the
+    current command's buffers (if its output is being captured) and log records from
+    capturing commands are diverted: errors are kept, everything else is dropped.
+    """
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        """Activate capturing for the duration of the context.
+
+        Yields:
+            Nothing.
+        """
+        log_filter = _CapturedLogFilter()
+        handlers = logging.getLogger().handlers
+        stderr, stdout = sys.stderr, sys.stdout
+
+        sys.stderr = _CapturingStream(stderr, "stderr")
+        sys.stdout = _CapturingStream(stdout, "stdout")
+        for handler in handlers:
+            handler.addFilter(log_filter)
+
+        try:
+            yield
+        finally:
+            for handler in handlers:
+                handler.removeFilter(log_filter)
+            sys.stderr, sys.stdout = stderr, stdout
+
+    @contextmanager
+    def capture(
+        self,
+        *,
+        stderr: io.TextIOBase | None = None,
+        stdout: io.TextIOBase | None = None,
+    ) -> Iterator[CapturedOutput]:
+        """Capture the output of the current thread for the duration of the context.
+
+        Args:
+            stderr: An optional stream to write standard error to (rather than a
+                buffer).
+            stdout: An optional stream to write standard output to (rather than a
+                buffer).
+
+        Yields:
+            The captured output.
+        """
+        token = _CAPTURED_OUTPUT.set(
+            CapturedOutput(
+                stderr=stderr or io.StringIO(), stdout=stdout or io.StringIO()
+            )
+        )
+        try:
+            yield cast(CapturedOutput, _CAPTURED_OUTPUT.get())
+        finally:
+            _CAPTURED_OUTPUT.reset(token)
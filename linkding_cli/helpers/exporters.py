@@ -0,0 +1,213 @@
+"""Define streaming writers for bookmark export files."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, TextIO
+
+from linkding_cli.errors import LinkDingCliError
+from linkding_cli.helpers.importers import (
+    FORMAT_HTML,
+    FORMAT_NDJSON,
+    HTML_ARCHIVED_TAG,
+    HTML_NOTES_END,
+    HTML_NOTES_START,
+)
+from linkding_cli.helpers.output import (
+    JsonArrayRecordWriter,
+    JsonLinesRecordWriter,
+    RecordWriter,
+    get_compact_json_encoder,
+)
+
+FORMAT_JSON = "json"
+
+EXPORT_FORMATS = (FORMAT_HTML, FORMAT_JSON, FORMAT_NDJSON)
+
+FILE_EXTENSION_FORMATS = {
+    ".htm": FORMAT_HTML,
+    ".html": FORMAT_HTML,
+    ".json": FORMAT_JSON,
+    ".jsonl": FORMAT_NDJSON,
+    ".ndjson": FORMAT_NDJSON,
+}
+
+GZIP_EXTENSION = ".gz"
+
+NETSCAPE_HEADER = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+"""
+NETSCAPE_FOOTER = "</DL><p>\n"
+
+
+def _parse_timestamp(value: str | None) -> int | None:
+    """Parse an ISO 8601 timestamp from the API into a Unix timestamp.
+
+    Args:
+        value: The ISO 8601 timestamp.
+
+    Returns:
+        The Unix timestamp (or None if it can't be parsed).
+    """
+    if not value:
+        return None
+    try:
+        # Python 3.10 can't parse a trailing Z:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+class NetscapeHtmlRecordWriter(RecordWriter):
+    """Define a writer that outputs bookmarks as a Netscape bookmark HTML file.
+
+    This is the format browsers (and linkding itself) import and export; archived
+    bookmarks and notes are written the way linkding writes them.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize.
+
+        Args:
+            stream: The stream to write to.
+        """
+        super().__init__(stream)
+        self._buffer.write(NETSCAPE_HEADER)
+
+    def close(self) -> None:
+        """Finish the output."""
+        self._buffer.write(NETSCAPE_FOOTER)
+        super().close()
+
+    def _write(self, record: Any) -> None:
+        """Write a bookmark as a definition list entry.
+
+        Args:
+            record: The bookmark to write.
+        """
+        attributes = [f'HREF="{escape(record["url"])}"']
+        if (added := _parse_timestamp(record.get("date_added"))) is not None:
+            attributes.append(f'ADD_DATE="{added}"')
+        attributes.append(f'PRIVATE="{0 if record.get("shared") else 1}"')
+        attributes.append(f'TOREAD="{1 if record.get("unread") else 0}"')
+        tag_names = list(record.get("tag_names") or [])
+        if record.get("is_archived"):
+            tag_names.append(HTML_ARCHIVED_TAG)
+        if tag_names:
+            attributes.append(f'TAGS="{escape(",".join(tag_names))}"')
+
+        title = record.get("title") or record.get("website_title") or record["url"]
+        self._buffer.write(f'<DT><A {" ".join(attributes)}>{escape(title)}</A>\n')
+
+        description = escape(
+            record.get("description") or record.get("website_description") or ""
+        )
+        if notes := record.get("notes"):
+            description += f"{HTML_NOTES_START}{escape(notes)}{HTML_NOTES_END}"
+        if description:
+            self._buffer.write(f"<DD>{description}\n")
+
+
+def _get_export_writer(file_format: str, stream: TextIO) -> RecordWriter:
+    """Get a writer for bookmarks in an export format.
+
+    Args:
+        file_format: The export format.
+        stream: The stream to write to.
+
+    Returns:
+        A RecordWriter object.
+    """
+    if file_format == FORMAT_HTML:
+        return NetscapeHtmlRecordWriter(stream)
+    if file_format == FORMAT_JSON:
+        return JsonArrayRecordWriter(stream)
+    return JsonLinesRecordWriter(stream, encode=get_compact_json_encoder())
+
+
+def detect_export_format(path: str) -> str:
+    """Detect an export file's format from its extension (ignoring any .gz).
+
+    Args:
+        path: The path to the export file.
+
+    Returns:
+        The detected format.
+
+    Raises:
+        LinkDingCliError: Raised when the format can't be detected.
+    """
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if suffixes and suffixes[-1] == GZIP_EXTENSION:
+        suffixes.pop()
+    if suffixes and (file_format := FILE_EXTENSION_FORMATS.get(suffixes[-1])):
+        return file_format
+    raise LinkDingCliError(f"Unable to detect the format of {path}; use --format")
+
+
+@contextmanager
+def open_export_writer(
+    path: str, file_format: str, *, compress: bool = False
+) -> Iterator[RecordWriter]:
+    """Open a writer for an export file (or stdout, if the path is -).
+
+    Records are written through a buffered (and optionally gzipped) stream as they
+    arrive. A file is written to a temporary path that replaces the target only once
+    the export has finished, so an interrupted export never clobbers a good one.
+
+    Args:
+        path: The path to the export file (or - for stdout).
+        file_format: The export format.
+        compress: Whether to compress the output with gzip.
+
+    Yields:
+        A RecordWriter object.
+    """
+    tmp_path = None if path == "-" else Path(f"{path}.{os.getpid()}.tmp")
+
+    try:
+        with ExitStack() as stack:
+            stream: TextIO
+            if tmp_path is None:
+                stream = sys.stdout
+                if compress:
+                    # Output captured as text (e.g., by the batch command) can't hold
+                    # a compressed export:
+                    if (buffer := getattr(sys.stdout, "buffer", None)) is None:
+                        raise LinkDingCliError(
+                            "Unable to write a compressed export to this output; "
+                            "export to a file instead"
+                        )
+                    stream.flush()
+                    stream = stack.enter_context(
+                        io.TextIOWrapper(
+                            gzip.GzipFile(fileobj=buffer, mode="wb"), encoding="utf-8"
+                        )
+                    )
+            elif compress:
+                stream = stack.enter_context(
+                    gzip.open(tmp_path, "wt", encoding="utf-8")
+                )
+            else:
+                stream = stack.enter_context(open(tmp_path, "w", encoding="utf-8"))
+
+            writer = _get_export_writer(file_format, stream)
+            yield writer
+            writer.close()
+
+        if tmp_path is not None:
+            os.replace(tmp_path, path)
+    finally:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
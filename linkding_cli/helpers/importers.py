@@ -0,0 +1,297 @@
+"""Define streaming parsers for bookmark import files."""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterator
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import IO, Any
+
+from linkding_cli.errors import LinkDingCliError
+
+FORMAT_CSV = "csv"
+FORMAT_HTML = "html"
+FORMAT_NDJSON = "ndjson"
+
+FILE_EXTENSION_FORMATS = {
+    ".csv": FORMAT_CSV,
+    ".htm": FORMAT_HTML,
+    ".html": FORMAT_HTML,
+    ".jsonl": FORMAT_NDJSON,
+    ".ndjson": FORMAT_NDJSON,
+}
+
+# Like linkding's own exports, Netscape bookmark files mark archived bookmarks with a
+# tag and append notes to the description (neither has an attribute of its own):
+HTML_ARCHIVED_TAG = "linkding:archived"
+HTML_NOTES_END = "[/linkding-notes]"
+HTML_NOTES_START = "[linkding-notes]"
+
+HTML_READ_CHUNK_SIZE = 64 * 1024
+
+TEXT_FIELDS = ("description", "notes", "title")
+
+TRUTHY_STRINGS = {"1", "true", "yes", "y", "on"}
+
+
+def _parse_bool(value: Any) -> bool:
+    """Parse a boolean from a variety of serialized representations.
+
+    Args:
+        value: The value to parse.
+
+    Returns:
+        The parsed boolean.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in TRUTHY_STRINGS
+    return bool(value)
+
+
+def _parse_tags(value: Any) -> list[str]:
+    """Parse a list of tags from either a list or a comma-separated string.
+
+    Args:
+        value: The value to parse.
+
+    Returns:
+        The parsed tags.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [tag.strip() for tag in value if tag and tag.strip()]
+
+
+def _normalize_record(record: Any) -> dict[str, Any]:
+    """Normalize a raw record into the field names/types the linkding API expects.
+
+    Args:
+        record: A raw record from an import file.
+
+    Returns:
+        A normalized record.
+
+    Raises:
+        LinkDingCliError: Raised when the record isn't a valid bookmark.
+    """
+    if not isinstance(record, dict):
+        raise LinkDingCliError("Bookmark isn't a JSON object")
+    if not (url := record.get("url")):
+        raise LinkDingCliError("Bookmark is missing a URL")
+    if not isinstance(url, str):
+        raise LinkDingCliError("Bookmark URL isn't a string")
+    for field in TEXT_FIELDS:
+        if not isinstance(record.get(field) or "", str):
+            raise LinkDingCliError(f"Bookmark {field} isn't a string")
+    tags = record.get("tag_names", record.get("tags"))
+    if tags and not isinstance(tags, (list, str)):
+        raise LinkDingCliError("Bookmark tags aren't a list or a string")
+
+    return {
+        "url": url,
+        "title": record.get("title") or None,
+        "description": record.get("description") or None,
+        "notes": record.get("notes") or None,
+        "tag_names": _parse_tags(tags) or None,
+        "is_archived": _parse_bool(record.get("is_archived", False)),
+        "unread": _parse_bool(record.get("unread", False)),
+        "shared": _parse_bool(record.get("shared", False)),
+    }
+
+
+def _iter_csv_records(file: IO[str]) -> Iterator[tuple[int, Any]]:
+    """Iterate over the records in a CSV file (with a header row).
+
+    Args:
+        file: The file to parse.
+
+    Yields:
+        A (line number, raw record) tuple for each record.
+    """
+    reader = csv.DictReader(file)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _iter_ndjson_records(file: IO[str]) -> Iterator[tuple[int, Any]]:
+    """Iterate over the records in a newline-delimited JSON file.
+
+    A line that can't be parsed yields a LinkDingCliError in place of its record, so
+    that the rest of the file can still be imported.
+
+    Args:
+        file: The file to parse.
+
+    Yields:
+        A (line number, raw record) tuple for each record.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, LinkDingCliError("Invalid JSON")
+
+
+class NetscapeBookmarkParser(HTMLParser):
+    """Define an incremental parser for Netscape bookmark HTML files.
+
+    Completed records (and the lines they start on) accumulate in `records`; callers
+    should drain it after each call to `feed()` so that memory stays bounded by a
+    single chunk.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        super().__init__(convert_charrefs=True)
+        self.records: list[tuple[int, dict[str, Any]]] = []
+        self._current: dict[str, Any] | None = None
+        self._current_line = 0
+        self._in_anchor = False
+        self._in_description = False
+
+    def _finish_current(self) -> None:
+        """Finish the record currently being parsed (if any)."""
+        if self._current is None:
+            return
+        description, _, notes = self._current["description"].partition(HTML_NOTES_START)
+        self._current["description"] = description.strip()
+        self._current["notes"] = notes.rpartition(HTML_NOTES_END)[0].strip()
+        self._current["title"] = self._current["title"].strip()
+        self.records.append((self._current_line, self._current))
+        self._current = None
+        self._in_description = False
+
+    def close(self) -> None:
+        """Finish parsing."""
+        super().close()
+        self._finish_current()
+
+    def handle_data(self, data: str) -> None:
+        """Handle text content.
+
+        Args:
+            data: The text content.
+        """
+        if self._current is None:
+            return
+        if self._in_anchor:
+            self._current["title"] += data
+        elif self._in_description:
+            self._current["description"] += data
+
+    def handle_endtag(self, tag: str) -> None:
+        """Handle a closing tag.
+
+        Args:
+            tag: The tag name.
+        """
+        if tag == "a":
+            self._in_anchor = False
+        elif tag == "dl":
+            self._finish_current()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Handle an opening tag.
+
+        Args:
+            tag: The tag name.
+            attrs: The tag's attributes.
+        """
+        if tag in ("dt", "dl"):
+            self._finish_current()
+        elif tag == "a":
+            self._finish_current()
+            attributes = {key.lower(): value or "" for key, value in attrs}
+            if not attributes.get("href"):
+                return
+            tag_names = _parse_tags(attributes.get("tags"))
+            self._current_line = self.getpos()[0]
+            self._current = {
+                "url": attributes["href"],
+                "title": "",
+                "description": "",
+                "tag_names": [tag for tag in tag_names if tag != HTML_ARCHIVED_TAG],
+                "is_archived": HTML_ARCHIVED_TAG in tag_names,
+                "unread": attributes.get("toread"),
+                # Netscape files mark bookmarks as private, not shared:
+                "shared": attributes.get("private") == "0",
+            }
+            self._in_anchor = True
+        elif tag == "dd" and self._current is not None:
+            self._in_description = True
+
+
+def _iter_html_records(file: IO[str]) -> Iterator[tuple[int, Any]]:
+    """Iterate over the records in a Netscape bookmark HTML file.
+
+    Args:
+        file: The file to parse.
+
+    Yields:
+        A (line number, raw record) tuple for each record.
+    """
+    parser = NetscapeBookmarkParser()
+    while chunk := file.read(HTML_READ_CHUNK_SIZE):
+        parser.feed(chunk)
+        yield from parser.records
+        parser.records.clear()
+    parser.close()
+    yield from parser.records
+
+
+RECORD_ITERATORS = {
+    FORMAT_CSV: _iter_csv_records,
+    FORMAT_HTML: _iter_html_records,
+    FORMAT_NDJSON: _iter_ndjson_records,
+}
+
+
+def detect_format(path: str) -> str:
+    """Detect an import file's format from its extension.
+
+    Args:
+        path: The path to the import file.
+
+    Returns:
+        The detected format.
+
+    Raises:
+        LinkDingCliError: Raised when the format can't be detected.
+    """
+    if file_format := FILE_EXTENSION_FORMATS.get(Path(path).suffix.lower()):
+        return file_format
+    raise LinkDingCliError(f"Unable to detect the format of {path}; use --format")
+
+
+def iter_bookmarks(
+    file: IO[str], file_format: str
+) -> Iterator[tuple[int, dict[str, Any] | None, LinkDingCliError | None]]:
+    """Iterate over the bookmarks in an import file without loading all of it.
+
+    A record that isn't a valid bookmark doesn't stop the iteration; its error is
+    yielded instead, so that callers can report it and move on.
+
+    Args:
+        file: The file to parse.
+        file_format: The format of the file.
+
+    Yields:
+        A (line number, record, exception) tuple for each record; exactly one of
+        record (normalized) and exception is None.
+    """
+    for line_number, raw_record in RECORD_ITERATORS[file_format](file):
+        if isinstance(raw_record, LinkDingCliError):
+            yield line_number, None, raw_record
+            continue
+        try:
+            record = _normalize_record(raw_record)
+        except LinkDingCliError as err:
+            yield line_number, None, err
+        else:
+            yield line_number, record, None
@@ -5,9 +5,11 @@ from __future__ import annotations
 import logging
 import traceback
 from collections.abc import Callable
+from contextlib import ExitStack
 from functools import wraps
 from typing import Any, TypeVar, cast
 
+import click
 import typer
 
 from linkding_cli.const import LOGGER
@@ -77,8 +79,21 @@ def log_exception(
             Raises:
                 Exit: Raised when the command fails in any way.
             """
+            # Profile and measure only the command itself (not the CLI's startup or
+            # the callbacks of the groups it belongs to):
+            ctx = click.get_current_context(silent=True)
+            obj = None
+            if ctx and not isinstance(ctx.command, click.Group):
+                obj = ctx.obj
+
             try:
-                return cast(dict[str, Any], func(*args, **kwargs))
+                with ExitStack() as stack:
+                    if profiler := getattr(obj, "profiler", None):
+                        stack.enter_context(profiler.profile())
+                    if metrics := getattr(obj, "metrics", None):
+                        command = ctx.command_path.split(" ", 1)[-1] if ctx else ""
+                        stack.enter_context(metrics.collect(command))
+                    return cast(dict[str, Any], func(*args, **kwargs))
             except Exception as err:  # pylint: disable=broad-except
                 LOGGER.error(err)
                 LOGGER.debug("".join(traceback.format_tb(err.__traceback__)))
@@ -0,0 +1,328 @@
+"""Define helpers for exporting metrics about a command's run."""
+
+from __future__ import annotations
+
+import bisect
+import os
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from time import monotonic
+
+import click
+import typer
+
+from linkding_cli.const import LOGGER
+from linkding_cli.helpers.tracing import Span, SpanRecorder
+
+# Prometheus' default histogram buckets (in seconds):
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = "linkding_cli"
+
+# Endpoints are labeled without IDs (e.g., /api/bookmarks/{id}/), so that a bulk job
+# doesn't create a time series per bookmark:
+ENDPOINT_ID_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+
+def _format_labels(**labels: str) -> str:
+    """Format the labels of a sample.
+
+    Args:
+        labels: The labels.
+
+    Returns:
+        A string like '{command="sync",status="200"}'.
+    """
+    escaped_labels = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped_labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format the value of a sample.
+
+    Args:
+        value: The value.
+
+    Returns:
+        The value as a string (integers without a decimal point).
+    """
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def get_invoked_command(ctx: click.Context, args: list[str]) -> str:
+    """Get the command that a run of the CLI invoked (without running it).
+
+    Args:
+        ctx: The root Click Context object.
+        args: The arguments the root command group was invoked with.
+
+    Returns:
+        The command (e.g., "bookmarks all"), as far as it resolves.
+    """
+    names = []
+    command: click.Command | None = ctx.command
+    args = list(args)
+    while isinstance(command, click.Group) and args:
+        name = args.pop(0)
+        if (command := command.get_command(ctx, name)) is None:
+            break
+        names.append(name)
+    return " ".join(names)
+
+
+class MetricsCollector(SpanRecorder):
+    """Define a collector of metrics about a command's run.
+
+    The metrics are written in the Prometheus text format, for node_exporter's
+    textfile collector (each run replaces the previous run's metrics).
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize.
+
+        Args:
+            path: The file to write the metrics to.
+        """
+        self._active = False
+        self._bytes = 0
+        self._collected = False
+        self._created = monotonic()
+        self._latency_buckets: dict[str, list[int]] = {}
+        self._latency_sums: dict[str, float] = {}
+        self._path = path
+        self._records = 0
+        self._requests: Counter[tuple[str, str, str]] = Counter()
+        self._retries = 0
+
+    def _render(
+        self, command: str, success: bool, duration: float, timestamp: float
+    ) -> str:
+        """Render the metrics.
+
+        Args:
+            command: The command that ran (e.g., "bookmarks all").
+            success: Whether the command succeeded.
+            duration: How long (in seconds) the command took.
+            timestamp: When the command finished (as a Unix timestamp).
+
+        Returns:
+            The metrics, in the Prometheus text format.
+        """
+        lines: list[str] = []
+
+        def add_metric(
+            name: str, metric_type: str, description: str, samples: list[str]
+        ) -> None:
+            """Add a metric.
+
+            Args:
+                name: The metric's name (without the prefix).
+                metric_type: The metric's type.
+                description: The metric's description.
+                samples: The metric's samples (each a line, with the prefix).
+            """
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {metric_type}")
+            lines.extend(samples)
+
+        def sample(name: str, value: float, **labels: str) -> str:
+            """Generate a sample.
+
+            Args:
+                name: The sample's name (without the prefix).
+                value: The sample's value.
+                labels: The sample's labels (besides the command).
+
+            Returns:
+                The sample, as a line.
+            """
+            return (
+                f"{METRIC_PREFIX}_{name}"
+                f"{_format_labels(command=command, **labels)} {_format_value(value)}"
+            )
+
+        add_metric(
+            "last_run_timestamp_seconds",
+            "gauge",
+            "When the last run finished.",
+            [sample("last_run_timestamp_seconds", timestamp)],
+        )
+        add_metric(
+            "last_run_success",
+            "gauge",
+            "Whether the last run succeeded.",
+            [sample("last_run_success", int(success))],
+        )
+        add_metric(
+            "last_run_duration_seconds",
+            "gauge",
+            "How long the last run took.",
+            [sample("last_run_duration_seconds", duration)],
+        )
+        add_metric(
+            "last_run_requests",
+            "gauge",
+            "The API requests the last run made.",
+            [
+                sample(
+                    "last_run_requests",
+                    count,
+                    endpoint=endpoint,
+                    method=method,
+                    status=status,
+                )
+                for (endpoint, method, status), count in sorted(self._requests.items())
+            ],
+        )
+
+        latency_samples = []
+        for endpoint, buckets in sorted(self._latency_buckets.items()):
+            cumulative_count = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), buckets):
+                cumulative_count += count
+                latency_samples.append(
+                    sample(
+                        "last_run_request_duration_seconds_bucket",
+                        cumulative_count,
+                        endpoint=endpoint,
+                        le=str(bound),
+                    )
+                )
+            latency_samples.append(
+                sample(
+                    "last_run_request_duration_seconds_sum",
+                    round(self._latency_sums[endpoint], 6),
+                    endpoint=endpoint,
+                )
+            )
+            latency_samples.append(
+                sample(
+                    "last_run_request_duration_seconds_count",
+                    cumulative_count,
+                    endpoint=endpoint,
+                )
+            )
+        add_metric(
+            "last_run_request_duration_seconds",
+            "histogram",
+            "How long the last run's API requests took.",
+            latency_samples,
+        )
+
+        for name, value, description in (
+            (
+                "last_run_response_bytes",
+                self._bytes,
+                "The bytes the last run received.",
+            ),
+            (
+                "last_run_records",
+                self._records,
+                "The records (e.g., bookmarks) the last run received from the API.",
+            ),
+            (
+                "last_run_retries",
+                self._retries,
+                "The retries of failed API requests the last run made.",
+            ),
+        ):
+            add_metric(name, "gauge", description, [sample(name, value)])
+
+        return "\n".join(lines) + "\n"
+
+    def close(self, command: str) -> None:
+        """Write the metrics of a failed run, unless its command already wrote them.
+
+        Runs that get to their command write their metrics when it finishes (see
+        collect()); this covers runs that fail before then (e.g., because the
+        command's arguments were invalid).
+
+        Args:
+            command: The command that was invoked (e.g., "bookmarks all").
+        """
+        if not self._collected:
+            self.write(command, False, monotonic() - self._created)
+
+    @contextmanager
+    def collect(self, command: str) -> Iterator[None]:
+        """Measure the run of a command and write the metrics when it finishes.
+
+        The metrics are written whether or not the command succeeds. Nested contexts
+        (e.g., commands run by `batch`) are part of the outermost run.
+
+        Args:
+            command: The command (e.g., "bookmarks all").
+
+        Yields:
+            Nothing.
+
+        Raises:
+            Exit: Re-raised when the command exits early.
+        """
+        if self._active:
+            yield
+            return
+
+        self._active = True
+        self._collected = True
+        start = monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        except typer.Exit as err:
+            success = err.exit_code == 0
+            raise
+        finally:
+            self._active = False
+            self.write(command, success, monotonic() - start)
+
+    def record(self, span: Span) -> None:
+        """Record a finished span.
+
+        Args:
+            span: The span.
+        """
+        endpoint = ENDPOINT_ID_PATTERN.sub("/{id}", span.path)
+        self._requests[(endpoint, span.method, str(span.status or "error"))] += 1
+
+        duration = span.durations()["total"] or 0.0
+        buckets = self._latency_buckets.setdefault(
+            endpoint, [0] * (len(LATENCY_BUCKETS) + 1)
+        )
+        buckets[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self._latency_sums[endpoint] = self._latency_sums.get(endpoint, 0.0) + duration
+
+        self._bytes += span.size
+        self._records += span.records
+        if span.attempt:
+            self._retries += 1
+
+    def write(self, command: str, success: bool, duration: float) -> None:
+        """Write the metrics (atomically, so they're never read half-written).
+
+        Failing to write them only logs a warning, so that it doesn't change the
+        command's outcome.
+
+        Args:
+            command: The command that ran (e.g., "bookmarks all").
+            success: Whether the command succeeded.
+            duration: How long (in seconds) the command took.
+        """
+        metrics = self._render(command, success, duration, time.time())
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(metrics, encoding="utf-8")
+            os.replace(tmp_path, self._path)
+        except OSError as err:
+            LOGGER.warning("Unable to write metrics to %s: %s", self._path, err)
+            with suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,656 @@
+"""Define a local SQLite mirror of a linkding instance."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from linkding_cli.util import project_record
+
+META_BOOKMARKS_MODIFIED_SINCE = "bookmarks_modified_since"
+META_LAST_SYNC = "last_sync"
+META_TAGS_INDEXED = "tags_indexed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookmarks (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    tag_names TEXT NOT NULL DEFAULT '',
+    is_archived INTEGER NOT NULL DEFAULT 0,
+    date_added TEXT,
+    date_modified TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bookmarks_is_archived ON bookmarks (is_archived, id);
+CREATE INDEX IF NOT EXISTS bookmarks_date_modified ON bookmarks (date_modified);
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_name ON tags (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Full-text search is implemented via an external-content FTS5 table that triggers
+# keep in step with the bookmarks table, so every sync updates the index. Whether a
+# bookmark is archived is indexed too (as an "archived"/"unarchived" token), so the
+# index alone can answer a search without joining back to every matching bookmark:
+SCHEMA_FTS = """
+ALTER TABLE bookmarks ADD COLUMN archive_state TEXT GENERATED ALWAYS AS (
+    CASE WHEN is_archived THEN 'archived' ELSE 'unarchived' END
+) VIRTUAL;
+CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_fts USING fts5(
+    url, title, description, notes, tag_names, archive_state,
+    content='bookmarks', content_rowid='id',
+    prefix='2 3',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS bookmarks_fts_insert AFTER INSERT ON bookmarks BEGIN
+    INSERT INTO bookmarks_fts (
+        rowid, url, title, description, notes, tag_names, archive_state
+    )
+    VALUES (
+        new.id, new.url, new.title, new.description, new.notes, new.tag_names,
+        new.archive_state
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS bookmarks_fts_delete AFTER DELETE ON bookmarks BEGIN
+    INSERT INTO bookmarks_fts (
+        bookmarks_fts, rowid, url, title, description, notes, tag_names,
+        archive_state
+    )
+    VALUES (
+        'delete', old.id, old.url, old.title, old.description, old.notes,
+        old.tag_names, old.archive_state
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS bookmarks_fts_update AFTER UPDATE ON bookmarks BEGIN
+    INSERT INTO bookmarks_fts (
+        bookmarks_fts, rowid, url, title, description, notes, tag_names,
+        archive_state
+    )
+    VALUES (
+        'delete', old.id, old.url, old.title, old.description, old.notes,
+        old.tag_names, old.archive_state
+    );
+    INSERT INTO bookmarks_fts (
+        rowid, url, title, description, notes, tag_names, archive_state
+    )
+    VALUES (
+        new.id, new.url, new.title, new.description, new.notes, new.tag_names,
+        new.archive_state
+    );
+END;
+INSERT INTO bookmarks_fts (bookmarks_fts) VALUES ('rebuild');
+"""
+SCHEMA_VERSION = 1
+
+BOOKMARK_SEARCH_COLUMNS = ("url", "title", "description", "notes", "tag_names")
+
+# The bm25() weights of each FTS column (in the order they're declared above):
+FTS_COLUMN_WEIGHTS = (2.0, 10.0, 4.0, 2.0, 6.0, 0.0)
+
+SEARCH_TOKEN_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Records can be projected onto a subset of fields in SQL (so that only those fields
+# are ever decoded) via the -> operator, which (unlike json_extract()) preserves JSON
+# booleans; older versions of SQLite project each record after decoding it instead:
+SQL_PROJECTION = sqlite3.sqlite_version_info >= (3, 38, 0)
+
+
+def _build_bookmark_filter(archived: bool, query: str | None) -> tuple[str, list[Any]]:
+    """Build a SQL WHERE clause that filters bookmarks like linkding's search does.
+
+    Every whitespace-separated term must appear (case-insensitively) in the URL,
+    title, description, notes, or tags; a term starting with `#` must match a tag.
+
+    Args:
+        archived: Whether to filter archived (rather than unarchived) bookmarks.
+        query: An optional search query.
+
+    Returns:
+        A WHERE clause and its parameters.
+    """
+    clauses = ["is_archived = ?"]
+    params: list[Any] = [int(archived)]
+
+    for term in (query or "").split():
+        if term.startswith("#") and len(term) > 1:
+            # Tags are stored as a space-delimited string with leading/trailing
+            # spaces, so an exact tag can be matched as a substring:
+            clauses.append("(' ' || tag_names || ' ') LIKE ? ESCAPE '\\'")
+            params.append(f"% {_escape_like(term[1:])} %")
+            continue
+        clauses.append(
+            "("
+            + " OR ".join(
+                f"{col} LIKE ? ESCAPE '\\'" for col in BOOKMARK_SEARCH_COLUMNS
+            )
+            + ")"
+        )
+        params.extend([f"%{_escape_like(term)}%"] * len(BOOKMARK_SEARCH_COLUMNS))
+
+    return " AND ".join(clauses), params
+
+
+def _build_data_column(
+    fields: Sequence[str] | None, alias: str = ""
+) -> tuple[str, list[Any]]:
+    """Build a SQL expression that selects each row's JSON data.
+
+    Args:
+        fields: The fields to project the data onto (or None for every field).
+        alias: The alias of the table to select from (if any).
+
+    Returns:
+        A SQL expression and its parameters.
+    """
+    column = f"{alias}.data" if alias else "data"
+    if not fields or not SQL_PROJECTION:
+        return column, []
+
+    pairs = ", ".join(f"?, {column} -> ?" for _ in fields)
+    params: list[Any] = []
+    for field in fields:
+        params.extend([field, f'$."{field}"'])
+    return f"json_object({pairs})", params
+
+
+def _escape_like(value: str) -> str:
+    """Escape a string's LIKE wildcards (for a pattern with ESCAPE '\\').
+
+    Args:
+        value: The string to escape.
+
+    Returns:
+        The string, with `%`, `_`, and `\\` matching themselves.
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _load_data(data: str, fields: Sequence[str] | None) -> dict[str, Any]:
+    """Decode a row's JSON data (projecting it, if SQLite couldn't).
+
+    Args:
+        data: The row's JSON data.
+        fields: The fields to project the data onto (or None for every field).
+
+    Returns:
+        The decoded data.
+    """
+    record = json.loads(data)
+    if fields and not SQL_PROJECTION:
+        return project_record(record, fields)  # type: ignore[no-any-return]
+    return record  # type: ignore[no-any-return]
+
+
+def _quote_fts_phrase(phrase: str) -> str:
+    """Quote a string as an FTS5 phrase.
+
+    Args:
+        phrase: The string to quote.
+
+    Returns:
+        An FTS5 phrase.
+    """
+    escaped = phrase.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def _build_search_filter(
+    archived: bool, query: str
+) -> tuple[str | None, str | None, list[Any]]:
+    """Build a full-text search from a linkding-style search query.
+
+    Supported syntax:
+        - `word`: bookmarks containing a word that starts with `word`
+        - `"some phrase"`: bookmarks containing an exact phrase
+        - `#tag`: bookmarks with a tag
+        - `!unread`/`!untagged`: unread/untagged bookmarks
+
+    Args:
+        archived: Whether to search archived (rather than unarchived) bookmarks.
+        query: The search query.
+
+    Returns:
+        An FTS5 MATCH expression (or None if there are no text terms), a SQL WHERE
+        clause for the filters the index can't answer exactly (or None if there are
+        none), and the WHERE clause's parameters.
+    """
+    filter_terms: list[str] = []
+    match_terms: list[str] = []
+    clauses: list[str] = []
+    params: list[Any] = []
+
+    for phrase, word in SEARCH_TOKEN_PATTERN.findall(query):
+        if not phrase and not word:
+            continue
+        if phrase:
+            match_terms.append(_quote_fts_phrase(phrase))
+        elif word.startswith("#") and len(word) > 1:
+            # The index narrows the search to bookmarks with a tag containing the
+            # same words; the exact tag is then checked against the bookmark:
+            if re.search(r"\w", word[1:]):
+                filter_terms.append(f"tag_names : {_quote_fts_phrase(word[1:])}")
+            clauses.append("(' ' || b.tag_names || ' ') LIKE ? ESCAPE '\\'")
+            params.append(f"% {_escape_like(word[1:])} %")
+        elif word == "!untagged":
+            clauses.append("b.tag_names = ''")
+        elif word == "!unread":
+            clauses.append("json_extract(b.data, '$.unread') = 1")
+        else:
+            match_terms.append(f"{_quote_fts_phrase(word)}*")
+
+    if not match_terms:
+        return None, " AND ".join(clauses) or None, params
+
+    # Archived bookmarks are usually the minority, so excluding them is cheaper than
+    # intersecting with every unarchived one:
+    match = f"({' '.join([*match_terms, *filter_terms])})"
+    if archived:
+        match += " AND archive_state : archived"
+    else:
+        match += " NOT archive_state : archived"
+    return match, " AND ".join(clauses) or None, params
+
+
+class Mirror:
+    """Define a local SQLite (WAL mode) mirror of bookmarks and tags."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize.
+
+        Args:
+            path: The path to the SQLite database file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The connection may be used from a persistent event loop's thread (see
+        # LinkDing.persistent_loop), so it isn't tied to the thread that opened it:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        [schema_version] = self._conn.execute("PRAGMA user_version").fetchone()
+        if schema_version < SCHEMA_VERSION:
+            with self._conn:
+                self._conn.executescript(SCHEMA_FTS)
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def count_bookmarks(self, *, archived: bool, query: str | None = None) -> int:
+        """Count the mirrored bookmarks that match a query.
+
+        Args:
+            archived: Count archived (rather than unarchived) bookmarks.
+            query: An optional search query.
+
+        Returns:
+            The number of bookmarks.
+        """
+        where, params = _build_bookmark_filter(archived, query)
+        [count] = self._conn.execute(
+            f"SELECT COUNT(*) FROM bookmarks WHERE {where}", params  # nosec
+        ).fetchone()
+        return int(count)
+
+    def count_tags(self) -> int:
+        """Count the mirrored tags.
+
+        Returns:
+            The number of tags.
+        """
+        [count] = self._conn.execute("SELECT COUNT(*) FROM tags").fetchone()
+        return int(count)
+
+    def delete_bookmarks_not_in(self, bookmark_ids: set[int], *, archived: bool) -> int:
+        """Delete mirrored bookmarks that no longer exist on the server.
+
+        Args:
+            bookmark_ids: The IDs of every bookmark that exists on the server.
+            archived: Reconcile archived (rather than unarchived) bookmarks.
+
+        Returns:
+            The number of deleted bookmarks.
+        """
+        stale_ids = [
+            (bookmark_id,)
+            for (bookmark_id,) in self._conn.execute(
+                "SELECT id FROM bookmarks WHERE is_archived = ?", (int(archived),)
+            )
+            if bookmark_id not in bookmark_ids
+        ]
+        with self._conn:
+            self._conn.executemany("DELETE FROM bookmarks WHERE id = ?", stale_ids)
+        return len(stale_ids)
+
+    def get_bookmark(
+        self, bookmark_id: int, *, fields: Sequence[str] | None = None
+    ) -> dict[str, Any] | None:
+        """Get a mirrored bookmark.
+
+        Args:
+            bookmark_id: The ID of the bookmark.
+            fields: The fields to return (or None for every field).
+
+        Returns:
+            The bookmark (or None if it isn't in the mirror).
+        """
+        column, params = _build_data_column(fields)
+        row = self._conn.execute(
+            f"SELECT {column} FROM bookmarks WHERE id = ?",  # nosec
+            [*params, bookmark_id],
+        ).fetchone()
+        if row is None:
+            return None
+        return _load_data(row[0], fields)
+
+    def get_meta(self, key: str) -> str | None:
+        """Get a metadata value.
+
+        Args:
+            key: The metadata key.
+
+        Returns:
+            The value (or None if it isn't set).
+        """
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def get_tag(
+        self, tag_id: int, *, fields: Sequence[str] | None = None
+    ) -> dict[str, Any] | None:
+        """Get a mirrored tag.
+
+        Args:
+            tag_id: The ID of the tag.
+            fields: The fields to return (or None for every field).
+
+        Returns:
+            The tag (or None if it isn't in the mirror).
+        """
+        column, params = _build_data_column(fields)
+        row = self._conn.execute(
+            f"SELECT {column} FROM tags WHERE id = ?", [*params, tag_id]  # nosec
+        ).fetchone()
+        if row is None:
+            return None
+        return _load_data(row[0], fields)
+
+    def get_tag_by_name(
+        self, name: str, *, fields: Sequence[str] | None = None
+    ) -> dict[str, Any] | None:
+        """Get a mirrored tag by its name (case-insensitively, like linkding).
+
+        Args:
+            name: The name of the tag.
+            fields: The fields to return (or None for every field).
+
+        Returns:
+            The tag (or None if it isn't in the mirror).
+        """
+        column, params = _build_data_column(fields)
+        row = self._conn.execute(
+            f"SELECT {column} FROM tags WHERE name = ? COLLATE NOCASE "  # nosec
+            "ORDER BY id LIMIT 1",
+            [*params, name],
+        ).fetchone()
+        if row is None:
+            return None
+        return _load_data(row[0], fields)
+
+    def iter_bookmark_urls(self, *, archived: bool) -> Iterator[tuple[int, str]]:
+        """Iterate over the ID and URL of every mirrored bookmark (oldest first).
+
+        Only the indexed columns are read, so no bookmark's JSON data is decoded.
+
+        Args:
+            archived: Return archived (rather than unarchived) bookmarks.
+
+        Yields:
+            A bookmark ID and URL.
+        """
+        yield from self._conn.execute(
+            "SELECT id, url FROM bookmarks WHERE is_archived = ? ORDER BY id",
+            (int(archived),),
+        )
+
+    def iter_bookmarks(
+        self,
+        *,
+        archived: bool,
+        fields: Sequence[str] | None = None,
+        query: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over the mirrored bookmarks that match a query (newest first).
+
+        Args:
+            archived: Return archived (rather than unarchived) bookmarks.
+            fields: The fields to return (or None for every field).
+            query: An optional search query.
+            limit: The maximum number of bookmarks to return.
+            offset: The index from which to return results.
+
+        Yields:
+            Bookmarks.
+        """
+        column, column_params = _build_data_column(fields)
+        where, params = _build_bookmark_filter(archived, query)
+        cursor = self._conn.execute(
+            f"SELECT {column} FROM bookmarks WHERE {where} "  # nosec
+            "ORDER BY date_added DESC, id DESC LIMIT ? OFFSET ?",
+            [*column_params, *params, -1 if limit is None else limit, offset or 0],
+        )
+        for (data,) in cursor:
+            yield _load_data(data, fields)
+
+    def iter_tags(
+        self,
+        *,
+        fields: Sequence[str] | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over the mirrored tags.
+
+        Args:
+            fields: The fields to return (or None for every field).
+            limit: The maximum number of tags to return.
+            offset: The index from which to return results.
+
+        Yields:
+            Tags.
+        """
+        column, params = _build_data_column(fields)
+        cursor = self._conn.execute(
+            f"SELECT {column} FROM tags ORDER BY id LIMIT ? OFFSET ?",  # nosec
+            [*params, -1 if limit is None else limit, offset or 0],
+        )
+        for (data,) in cursor:
+            yield _load_data(data, fields)
+
+    def replace_tags(self, tags: Iterable[dict[str, Any]]) -> int:
+        """Replace every mirrored tag.
+
+        Since every tag is then mirrored, the tag name index is marked as complete.
+
+        Args:
+            tags: The tags that exist on the server.
+
+        Returns:
+            The number of mirrored tags.
+        """
+        with self._conn:
+            self._conn.execute("DELETE FROM tags")
+            self._conn.executemany(
+                "INSERT INTO tags (id, name, data) VALUES (?, ?, ?)",
+                ((tag["id"], tag["name"], json.dumps(tag)) for tag in tags),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (META_TAGS_INDEXED, "1"),
+            )
+        return self.count_tags()
+
+    def search_bookmarks(
+        self,
+        query: str,
+        *,
+        archived: bool,
+        fields: Sequence[str] | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Search the mirrored bookmarks, ranking the best matches first.
+
+        Text matches are ranked with BM25; queries with no text terms return the
+        newest matches first.
+
+        Args:
+            query: A linkding-style search query.
+            archived: Search archived (rather than unarchived) bookmarks.
+            fields: The fields to return (or None for every field).
+            limit: The maximum number of bookmarks to return.
+            offset: The index from which to return results.
+
+        Yields:
+            Bookmarks.
+        """
+        column, column_params = _build_data_column(fields, "b")
+        match, where, params = _build_search_filter(archived, query)
+        limit_params = [-1 if limit is None else limit, offset or 0]
+
+        if match is None:
+            clauses = ["b.is_archived = ?", *([where] if where else [])]
+            sql = (
+                f"SELECT {column} FROM bookmarks b "  # nosec
+                f"WHERE {' AND '.join(clauses)} "
+                "ORDER BY b.date_added DESC, b.id DESC LIMIT ? OFFSET ?"
+            )
+            cursor = self._conn.execute(
+                sql, [*column_params, int(archived), *params, *limit_params]
+            )
+            for (data,) in cursor:
+                yield _load_data(data, fields)
+            return
+
+        # Every match is ranked (SQLite keeps only the requested page while sorting,
+        # so broad queries cost little more memory than narrow ones):
+        weights = ", ".join(str(weight) for weight in FTS_COLUMN_WEIGHTS)
+        hits = (
+            f"SELECT rowid AS id, bm25(bookmarks_fts, {weights}) AS score "  # nosec
+            "FROM bookmarks_fts WHERE bookmarks_fts MATCH ?"
+        )
+        fts_params: list[Any] = [match]
+
+        if where is None:
+            # Everything can be answered by the index, so only the bookmarks on the
+            # requested page need to be looked up:
+            sql = (
+                f"SELECT {column} FROM ({hits} "  # nosec
+                "ORDER BY score, id DESC LIMIT ? OFFSET ?) AS hits "
+                "CROSS JOIN bookmarks b ON b.id = hits.id "
+                "ORDER BY hits.score, hits.id DESC"
+            )
+            cursor = self._conn.execute(
+                sql, [*column_params, *fts_params, *limit_params]
+            )
+        else:
+            # CROSS JOIN forces SQLite to drive the join from the full-text index:
+            sql = (
+                f"SELECT {column} FROM ({hits}) AS hits "  # nosec
+                f"CROSS JOIN bookmarks b ON b.id = hits.id WHERE {where} "
+                "ORDER BY hits.score, hits.id DESC LIMIT ? OFFSET ?"
+            )
+            cursor = self._conn.execute(
+                sql, [*column_params, *fts_params, *params, *limit_params]
+            )
+
+        for (data,) in cursor:
+            yield _load_data(data, fields)
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Set a metadata value.
+
+        Args:
+            key: The metadata key.
+            value: The value.
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def upsert_bookmarks(self, bookmarks: Iterable[dict[str, Any]]) -> int:
+        """Insert or update bookmarks.
+
+        Args:
+            bookmarks: The bookmarks to store.
+
+        Returns:
+            The number of bookmarks stored.
+        """
+        rows = [
+            (
+                bookmark["id"],
+                bookmark["url"],
+                bookmark.get("title") or "",
+                bookmark.get("description") or "",
+                bookmark.get("notes") or "",
+                " ".join(bookmark.get("tag_names") or []),
+                int(bool(bookmark.get("is_archived"))),
+                bookmark.get("date_added"),
+                bookmark.get("date_modified"),
+                json.dumps(bookmark),
+            )
+            for bookmark in bookmarks
+        ]
+        with self._conn:
+            # An upsert (rather than INSERT OR REPLACE) ensures the UPDATE trigger that
+            # maintains the full-text index fires:
+            self._conn.executemany(
+                "INSERT INTO bookmarks (id, url, title, description, notes, "
+                "tag_names, is_archived, date_added, date_modified, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET url = excluded.url, "
+                "title = excluded.title, description = excluded.description, "
+                "notes = excluded.notes, tag_names = excluded.tag_names, "
+                "is_archived = excluded.is_archived, date_added = excluded.date_added, "
+                "date_modified = excluded.date_modified, data = excluded.data",
+                rows,
+            )
+        return len(rows)
+
+    def upsert_tags(self, tags: Iterable[dict[str, Any]]) -> int:
+        """Insert or update tags.
+
+        Args:
+            tags: The tags to store.
+
+        Returns:
+            The number of tags stored.
+        """
+        rows = [(tag["id"], tag["name"], json.dumps(tag)) for tag in tags]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tags (id, name, data) VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
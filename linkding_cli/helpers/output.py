@@ -0,0 +1,446 @@
+"""Define output writers."""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import cache, partial
+from typing import Any, TextIO, cast
+
+import typer
+
+from linkding_cli.errors import LinkDingCliError
+from linkding_cli.util import project_record
+
+OUTPUT_FORMAT_CSV = "csv"
+OUTPUT_FORMAT_JSON = "json"
+OUTPUT_FORMAT_NDJSON = "ndjson"
+OUTPUT_FORMAT_TSV = "tsv"
+
+OUTPUT_FORMATS = (
+    OUTPUT_FORMAT_CSV,
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_NDJSON,
+    OUTPUT_FORMAT_TSV,
+)
+
+# The amount of output to buffer before writing it to stdout:
+WRITE_BUFFER_SIZE = 64 * 1024
+
+FIELD_NAME_PATTERN = re.compile(r"\w+")
+
+OPTION_FIELDS = typer.Option(
+    None,
+    "--fields",
+    help="Only output these fields of each result (e.g., id,url,tag_names).",
+    metavar="FIELD,...",
+    show_default=False,
+)
+
+
+@cache
+def get_compact_json_encoder() -> Callable[[Any], str]:
+    """Get the fastest available encoder of compact JSON.
+
+    orjson and msgspec are used if either is installed; otherwise, the standard
+    library's encoder is used.
+
+    Returns:
+        A function that encodes an object as a JSON string.
+    """
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        return lambda obj: orjson.dumps(obj).decode()
+    except ImportError:
+        pass
+
+    try:
+        import msgspec  # pylint: disable=import-outside-toplevel
+
+        encoder = msgspec.json.Encoder()
+        return lambda obj: encoder.encode(obj).decode()
+    except ImportError:
+        pass
+
+    return partial(json.dumps, separators=(",", ":"))
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Parse a comma-separated list of fields (e.g., from `--fields`).
+
+    Args:
+        fields: A comma-separated list of fields (or None for every field).
+
+    Returns:
+        The fields (or None for every field).
+
+    Raises:
+        LinkDingCliError: Raised when a field name is invalid.
+    """
+    if fields is None:
+        return None
+
+    parsed = tuple(field for field in (f.strip() for f in fields.split(",")) if field)
+    for field in parsed:
+        if not FIELD_NAME_PATTERN.fullmatch(field):
+            raise LinkDingCliError(f"Invalid field: {field}")
+    return parsed or None
+
+
+def project_data(data: Any, fields: Sequence[str]) -> Any:
+    """Project every record in an API response payload down to a subset of fields.
+
+    Args:
+        data: An API response payload (paginated or not).
+        fields: The fields to keep.
+
+    Returns:
+        The projected payload.
+    """
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        return {
+            **data,
+            "results": [project_record(record, fields) for record in data["results"]],
+        }
+    if isinstance(data, list):
+        return [project_record(record, fields) for record in data]
+    return project_record(data, fields)
+
+
+def iter_records(data: Any) -> Iterator[Any]:
+    """Iterate over the records in an API response payload.
+
+    Args:
+        data: An API response payload (paginated or not).
+
+    Yields:
+        Each record (e.g., the results of a paginated payload).
+    """
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        yield from data["results"]
+    elif isinstance(data, list):
+        yield from data
+    else:
+        yield data
+
+
+class _WriteBuffer:
+    """Define a buffer that writes to a stream in large chunks."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize.
+
+        Args:
+            stream: The stream to write to.
+        """
+        self._chunks: list[str] = []
+        self._size = 0
+        self._stream = stream
+
+    def flush(self) -> None:
+        """Write everything that's buffered to the stream."""
+        if self._chunks:
+            self._stream.write("".join(self._chunks))
+            self._chunks.clear()
+            self._size = 0
+        self._stream.flush()
+
+    def write(self, text: str) -> None:
+        """Buffer text, writing it to the stream once the buffer is full.
+
+        Args:
+            text: The text to write.
+        """
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size >= WRITE_BUFFER_SIZE:
+            self.flush()
+
+
+class RecordWriter:
+    """Define a writer that outputs a stream of records, one at a time."""
+
+    def __init__(
+        self,
+        stream: TextIO,
+        fields: Sequence[str] | None = None,
+        *,
+        project: bool = False,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            stream: The stream to write to.
+            fields: The fields of each record to output (for formats that need them
+                up front); the first record's fields are used by default.
+            project: Whether to project each record down to `fields` before it's
+                serialized.
+        """
+        self._buffer = _WriteBuffer(stream)
+        self._fields = fields
+        self._project = project and fields is not None
+
+    def close(self) -> None:
+        """Finish the output."""
+        self._buffer.flush()
+
+    def flush(self) -> None:
+        """Write any buffered output (e.g., after each page of results)."""
+        self._buffer.flush()
+
+    def _write(self, record: Any) -> None:
+        """Serialize and buffer a record.
+
+        Args:
+            record: The record to write.
+
+        Raises:
+            NotImplementedError: Raised when not implemented by a subclass.
+        """
+        raise NotImplementedError
+
+    def write(self, record: Any) -> None:
+        """Write a record.
+
+        Args:
+            record: The record to write.
+        """
+        if self._project:
+            record = project_record(record, cast(Sequence[str], self._fields))
+        self._write(record)
+
+
+class DelimitedRecordWriter(RecordWriter):
+    """Define a writer that outputs records as CSV or TSV, with a header row."""
+
+    def __init__(
+        self,
+        stream: TextIO,
+        fields: Sequence[str] | None = None,
+        delimiter: str = ",",
+    ) -> None:
+        """Initialize.
+
+        Args:
+            stream: The stream to write to.
+            fields: The fields of each record to output; the first record's fields
+                are used by default.
+            delimiter: The character that separates fields.
+        """
+        super().__init__(stream, fields)
+        self._writer = csv.writer(
+            self._buffer, delimiter=delimiter, lineterminator="\n"
+        )
+        if fields is not None:
+            self._writer.writerow(fields)
+
+    @staticmethod
+    def _format_value(value: Any) -> Any:
+        """Format a value as a single cell.
+
+        Args:
+            value: The value to format.
+
+        Returns:
+            The formatted value.
+        """
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, list) and all(
+            isinstance(item, (int, float, str)) for item in value
+        ):
+            return ",".join(str(item) for item in value)
+        if isinstance(value, (dict, list)):
+            return get_compact_json_encoder()(value)
+        return value
+
+    def _write(self, record: Any) -> None:
+        """Write a record as a row.
+
+        Args:
+            record: The record to write.
+        """
+        if not isinstance(record, dict):
+            record = {"value": record}
+        if self._fields is None:
+            self._fields = list(record)
+            self._writer.writerow(self._fields)
+        self._writer.writerow(
+            [self._format_value(record.get(field)) for field in self._fields]
+        )
+
+
+class JsonArrayRecordWriter(RecordWriter):
+    """Define a writer that outputs records as a single JSON array."""
+
+    def __init__(
+        self,
+        stream: TextIO,
+        fields: Sequence[str] | None = None,
+        *,
+        project: bool = False,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            stream: The stream to write to.
+            fields: The fields to project each record down to (if `project` is set).
+            project: Whether to project each record down to `fields`.
+        """
+        super().__init__(stream, fields, project=project)
+        self._encode = get_compact_json_encoder()
+        self._separator = "["
+
+    def close(self) -> None:
+        """Finish the output."""
+        self._buffer.write("[]\n" if self._separator == "[" else "]\n")
+        super().close()
+
+    def _write(self, record: Any) -> None:
+        """Write a record as an item in the array.
+
+        Args:
+            record: The record to write.
+        """
+        self._buffer.write(self._separator)
+        self._buffer.write(self._encode(record))
+        self._separator = ",\n"
+
+
+class JsonLinesRecordWriter(RecordWriter):
+    """Define a writer that outputs records as newline-delimited JSON."""
+
+    def __init__(
+        self,
+        stream: TextIO,
+        fields: Sequence[str] | None = None,
+        *,
+        encode: Callable[[Any], str] = json.dumps,
+        project: bool = False,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            stream: The stream to write to.
+            fields: The fields to project each record down to (if `project` is set).
+            encode: The function to encode each record with.
+            project: Whether to project each record down to `fields`.
+        """
+        super().__init__(stream, fields, project=project)
+        self._encode = encode
+
+    def _write(self, record: Any) -> None:
+        """Write a record as a line of JSON.
+
+        Args:
+            record: The record to write.
+        """
+        self._buffer.write(self._encode(record))
+        self._buffer.write("\n")
+
+
+def _get_record_writer(
+    output_format: str | None,
+    stream: TextIO,
+    fields: Sequence[str] | None,
+    project: bool,
+) -> RecordWriter:
+    """Get a writer for records in an output format.
+
+    Args:
+        output_format: The output format (or None for the default).
+        stream: The stream to write to.
+        fields: The fields of each record to output (for formats that need them).
+        project: Whether to project each record down to `fields`.
+
+    Returns:
+        A RecordWriter object.
+    """
+    if output_format == OUTPUT_FORMAT_CSV:
+        return DelimitedRecordWriter(stream, fields)
+    if output_format == OUTPUT_FORMAT_TSV:
+        return DelimitedRecordWriter(stream, fields, delimiter="\t")
+    if output_format == OUTPUT_FORMAT_JSON:
+        return JsonArrayRecordWriter(stream, fields, project=project)
+    if output_format == OUTPUT_FORMAT_NDJSON:
+        return JsonLinesRecordWriter(
+            stream, fields, encode=get_compact_json_encoder(), project=project
+        )
+    return JsonLinesRecordWriter(stream, fields, project=project)
+
+
+@contextmanager
+def open_record_writer(
+    ctx: typer.Context, fields: Sequence[str] | None = None, *, project: bool = False
+) -> Iterator[RecordWriter]:
+    """Open a writer for a stream of records, in the configured output format.
+
+    By default, each record is output as a line of JSON.
+
+    Args:
+        ctx: A Typer Context object.
+        fields: The fields of each record to output (for formats that need them).
+        project: Whether to project each record down to `fields` before it's
+            serialized (e.g., for `--fields`).
+
+    Yields:
+        A RecordWriter object.
+    """
+    writer = _get_record_writer(ctx.obj.config.output, sys.stdout, fields, project)
+    try:
+        yield writer
+    finally:
+        writer.close()
+
+
+def echo_data(
+    ctx: typer.Context, data: Any, fields: Sequence[str] | None = None
+) -> None:
+    """Output an API response payload in the configured output format.
+
+    By default (and with `--output json`), the payload is output as is; other formats
+    output each of its records (e.g., the results of a paginated payload).
+
+    Args:
+        ctx: A Typer Context object.
+        data: An API response payload.
+        fields: The fields to project each record down to (or None for every field).
+    """
+    if fields is not None:
+        data = project_data(data, fields)
+
+    output_format = ctx.obj.config.output
+    if output_format is None:
+        typer.echo(json.dumps(data))
+    elif output_format == OUTPUT_FORMAT_JSON:
+        typer.echo(get_compact_json_encoder()(data))
+    else:
+        echo_records(ctx, iter_records(data), fields)
+
+
+def echo_records(
+    ctx: typer.Context,
+    records: Iterable[Any],
+    fields: Sequence[str] | None = None,
+    *,
+    project: bool = False,
+) -> None:
+    """Output a stream of records in the configured output format.
+
+    Args:
+        ctx: A Typer Context object.
+        records: The records to output.
+        fields: The fields of each record to output (for formats that need them).
+        project: Whether to project each record down to `fields` before it's
+            serialized.
+    """
+    with open_record_writer(ctx, fields, project=project) as writer:
+        for record in records:
+            writer.write(record)
@@ -0,0 +1,208 @@
+"""Define pagination helpers."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from linkding_cli.const import CONF_LIMIT, CONF_OFFSET
+from linkding_cli.helpers.concurrency import resolve_concurrency
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from linkding_cli.helpers.output import RecordWriter
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def generate_page_payload(
+    base_url: str,
+    endpoint: str,
+    results: list[dict[str, Any]],
+    count: int,
+    *,
+    limit: int,
+    offset: int,
+    params: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Generate a paginated payload shaped like the ones the linkding API returns.
+
+    Args:
+        base_url: The URL of the linkding instance.
+        endpoint: The API endpoint the payload represents.
+        results: The results on this page.
+        count: The total number of results across all pages.
+        limit: The number of results per page.
+        offset: The index of the first result on this page.
+        params: Any additional query parameters to include in page links.
+
+    Returns:
+        A paginated API response payload.
+    """
+
+    def page_url(page_offset: int) -> str:
+        """Generate the URL of another page.
+
+        Args:
+            page_offset: The index of the first result on the page.
+
+        Returns:
+            A URL.
+        """
+        query = urlencode(
+            {**(params or {}), CONF_LIMIT: limit, CONF_OFFSET: page_offset}
+        )
+        return f"{base_url}{endpoint}?{query}"
+
+    return {
+        "count": count,
+        "next": page_url(offset + limit) if offset + limit < count else None,
+        "previous": page_url(max(offset - limit, 0)) if offset > 0 else None,
+        "results": results,
+    }
+
+
+def _get_next_page_kwargs(data: dict[str, Any]) -> dict[str, int] | None:
+    """Get the limit/offset keyword arguments for the page after a response.
+
+    Args:
+        data: An API response payload.
+
+    Returns:
+        The limit/offset of the next page (or None if there isn't one).
+    """
+    if not (next_url := data.get("next")):
+        return None
+
+    next_params = parse_qs(urlsplit(next_url).query)
+    return {
+        key: int(next_params[key][0])
+        for key in (CONF_LIMIT, CONF_OFFSET)
+        if key in next_params
+    }
+
+
+async def _async_iter_remaining_pages_concurrently(
+    api_func: Callable[..., Awaitable[dict[str, Any]]],
+    first_page: dict[str, Any],
+    parallel: int,
+    api_kwargs: dict[str, Any],
+) -> AsyncIterator[dict[str, Any]]:
+    """Fetch every page after the first one concurrently, yielding them in order.
+
+    The total number of results in the first page is used to compute the remaining
+    offset windows up front. At most `parallel` requests are in flight at once, and
+    at most twice that many pages are buffered while waiting for an earlier page.
+
+    Args:
+        api_func: An aiolinkding coroutine function that returns a paginated payload.
+        first_page: The API response payload for the first page.
+        parallel: The maximum number of concurrent requests.
+        api_kwargs: The keyword arguments to pass to the coroutine function.
+
+    Yields:
+        An API response payload for each page.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    if (next_page_kwargs := _get_next_page_kwargs(first_page)) is None:
+        return
+
+    limit = next_page_kwargs.get(CONF_LIMIT, len(first_page["results"]))
+    start = next_page_kwargs.get(CONF_OFFSET, limit)
+    offsets = iter(range(start, first_page["count"], limit))
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def async_fetch(offset: int) -> dict[str, Any]:
+        """Fetch a single page.
+
+        Args:
+            offset: The index from which to return results.
+
+        Returns:
+            An API response payload.
+        """
+        async with semaphore:
+            return await api_func(
+                **{**api_kwargs, CONF_LIMIT: limit, CONF_OFFSET: offset}
+            )
+
+    pending: deque[asyncio.Task[dict[str, Any]]] = deque()
+
+    def schedule_next() -> None:
+        """Schedule the next offset window (if there is one)."""
+        if (offset := next(offsets, None)) is not None:
+            pending.append(asyncio.create_task(async_fetch(offset)))
+
+    try:
+        for _ in range(parallel * 2):
+            schedule_next()
+        while pending:
+            page = await pending.popleft()
+            schedule_next()
+            yield page
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def async_iter_pages(
+    api_func: Callable[..., Awaitable[dict[str, Any]]],
+    *,
+    parallel: int | None = 1,
+    **api_kwargs: Any,
+) -> AsyncIterator[dict[str, Any]]:
+    """Iterate over every page of a paginated API endpoint.
+
+    If `parallel` is one, pages are requested one at a time by following the `next`
+    link of each response, so only a single page is ever held in memory. Otherwise,
+    the remaining pages are prefetched concurrently instead.
+
+    Args:
+        api_func: An aiolinkding coroutine function that returns a paginated payload.
+        parallel: The maximum number of concurrent requests (or None to leave it to
+            the client's adaptive concurrency limit).
+        api_kwargs: The keyword arguments to pass to the coroutine function.
+
+    Yields:
+        An API response payload for each page.
+    """
+    data = await api_func(**api_kwargs)
+    yield data
+
+    if (parallel := resolve_concurrency(parallel)) > 1:
+        async for page in _async_iter_remaining_pages_concurrently(
+            api_func, data, parallel, api_kwargs
+        ):
+            yield page
+        return
+
+    while (next_page_kwargs := _get_next_page_kwargs(data)) is not None:
+        api_kwargs.update(next_page_kwargs)
+        data = await api_func(**api_kwargs)
+        yield data
+
+
+async def async_write_all_results(
+    writer: RecordWriter,
+    api_func: Callable[..., Awaitable[dict[str, Any]]],
+    *,
+    parallel: int | None = 1,
+    **api_kwargs: Any,
+) -> None:
+    """Write every result of a paginated API endpoint, a page at a time.
+
+    Args:
+        writer: The writer to write each result with.
+        api_func: An aiolinkding coroutine function that returns a paginated payload.
+        parallel: The maximum number of concurrent requests (or None to leave it to
+            the client's adaptive concurrency limit).
+        api_kwargs: The keyword arguments to pass to the coroutine function.
+    """
+    async for page in async_iter_pages(api_func, parallel=parallel, **api_kwargs):
+        for result in page["results"]:
+            writer.write(result)
+        writer.flush()
@@ -0,0 +1,239 @@
+"""Define helpers for profiling commands."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import typer
+
+# Profiles saved with these extensions are written as collapsed stacks (the input
+# format of flamegraph.pl, speedscope, and similar tools); any other as pstats:
+COLLAPSED_STACK_SUFFIXES = (".collapsed", ".folded")
+
+# Call paths that account for less than this fraction of the total time are left out
+# of collapsed stacks (they wouldn't be visible in a flame graph anyway):
+COLLAPSED_STACK_MIN_FRACTION = 0.001
+
+REPORT_ALLOCATION_COUNT = 10
+REPORT_FUNCTION_COUNT = 25
+
+
+def _format_function(func: tuple[str, int, str]) -> str:
+    """Format a profiled function as a frame of a collapsed stack.
+
+    Args:
+        func: The function's file name, line number, and name (as in pstats).
+
+    Returns:
+        A label like "client.py:150(_async_send)".
+    """
+    filename, lineno, name = func
+    if filename == "~":
+        # A built-in function:
+        return name.replace(";", ":")
+    return f"{Path(filename).name}:{lineno}({name})".replace(";", ":")
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: Path) -> None:
+    """Write a profile as collapsed stacks (one line per call path, with its time).
+
+    cProfile only records which function called which (not whole stacks), so each
+    function's time is split between the paths that lead to it in proportion to the
+    time it spent being called from each caller.
+
+    Args:
+        stats: The profile.
+        path: The file to write to.
+    """
+    # pylint: disable-next=no-member
+    raw_stats: dict[Any, Any] = stats.stats  # type: ignore[attr-defined]
+    callees: dict[Any, dict[Any, float]] = {func: {} for func in raw_stats}
+    roots = []
+    for func, (_, _, _, _, callers) in raw_stats.items():
+        # Functions that were only called by themselves (if at all) were called from
+        # outside the profile:
+        if not callers.keys() - {func}:
+            roots.append(func)
+        for caller, (_, _, _, cumulative_time) in callers.items():
+            callees.setdefault(caller, {})[func] = cumulative_time
+
+    total_time = sum(raw_stats[func][3] for func in roots)
+    min_time = total_time * COLLAPSED_STACK_MIN_FRACTION
+    lines: list[str] = []
+
+    def visit(func: Any, stack: list[Any], time: float) -> None:
+        """Add a function (and everything it called) to the collapsed stacks.
+
+        Args:
+            func: The function.
+            stack: The call path that led to it.
+            time: The time spent in the function along this path.
+        """
+        _, _, own_time, cumulative_time, _ = raw_stats[func]
+        share = time / cumulative_time if cumulative_time else 0.0
+        if (own_microseconds := round(own_time * share * 1_000_000)) > 0:
+            lines.append(
+                ";".join(_format_function(frame) for frame in stack)
+                + f" {own_microseconds}"
+            )
+        for callee, callee_time in callees.get(func, {}).items():
+            # Recursive calls are already counted in the outer call's time:
+            if callee in stack or (callee_time := callee_time * share) < min_time:
+                continue
+            visit(callee, [*stack, callee], callee_time)
+
+    for root in roots:
+        visit(root, [root], raw_stats[root][3])
+
+    path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+
+
+class Profiler:
+    """Define a profiler for the body of a command."""
+
+    def __init__(
+        self, *, cpu: bool = True, memory: bool = False, path: Path | None = None
+    ) -> None:
+        """Initialize.
+
+        Args:
+            cpu: Whether to profile CPU time.
+            memory: Whether to track memory allocations.
+            path: An optional file to save the CPU profile to.
+        """
+        self._active = False
+        self._cpu = cpu
+        self._lock = threading.Lock()
+        self._memory = memory
+        self._path = path
+        self._thread: int | None = None
+        self._thread_profiles: list[cProfile.Profile] = []
+
+    def _report_cpu(self, profiles: list[cProfile.Profile]) -> str:
+        """Report (or save) a CPU profile.
+
+        Args:
+            profiles: The CPU profiles of each profiled thread.
+
+        Returns:
+            The functions that took the most time (or where the profile was saved).
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(*profiles, stream=stream)
+
+        if self._path:
+            if self._path.suffix in COLLAPSED_STACK_SUFFIXES:
+                write_collapsed_stacks(stats, self._path)
+            else:
+                stats.dump_stats(self._path)
+            return f"Saved the profile to {self._path}"
+
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_FUNCTION_COUNT)
+        return stream.getvalue().strip("\n")
+
+    @staticmethod
+    def _report_memory(snapshot: tracemalloc.Snapshot, peak: int) -> str:
+        """Report memory allocations.
+
+        Args:
+            snapshot: A snapshot of the memory still allocated.
+            peak: The peak amount of memory allocated (in bytes).
+
+        Returns:
+            The peak, plus the lines that allocated the most memory still in use.
+        """
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            )
+        )
+        lines = [
+            f"Peak memory allocated: {peak / 1024:.1f} KiB",
+            "Top allocation sites (of memory still allocated at exit):",
+        ]
+        for stat in snapshot.statistics("lineno")[:REPORT_ALLOCATION_COUNT]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"  {frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB in "
+                f"{stat.count} blocks"
+            )
+        return "\n".join(lines)
+
+    @contextmanager
+    def profile(self) -> Iterator[None]:
+        """Profile everything run within the context and report it (to stderr).
+
+        Nested contexts (e.g., commands run by `batch`) are part of the outermost
+        profile.
+
+        Yields:
+            Nothing.
+        """
+        if self._active:
+            yield
+            return
+
+        self._active = True
+        self._thread = threading.get_ident()
+        cpu_profile = cProfile.Profile() if self._cpu else None
+        if self._memory:
+            tracemalloc.start()
+        if cpu_profile:
+            cpu_profile.enable()
+
+        try:
+            yield
+        finally:
+            if cpu_profile:
+                cpu_profile.disable()
+            reports = []
+            if self._memory:
+                _, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                reports.append(self._report_memory(snapshot, peak))
+            if cpu_profile:
+                with self._lock:
+                    profiles = [cpu_profile, *self._thread_profiles]
+                    self._thread_profiles.clear()
+                reports.insert(0, self._report_cpu(profiles))
+            self._active = False
+            self._thread = None
+            typer.echo("\n\n".join(reports), err=True)
+
+    @contextmanager
+    def profile_thread(self) -> Iterator[None]:
+        """Profile what the current thread runs within the context (if profiling).
+
+        cProfile only profiles the thread that enables it, so threads that run a
+        command's work for it (e.g., the thread of a persistent event loop, or the
+        threads batch runs commands on) are profiled separately and reported as part
+        of the command's profile.
+
+        Yields:
+            Nothing.
+        """
+        if not self._active or not self._cpu or threading.get_ident() == self._thread:
+            yield
+            return
+
+        cpu_profile = cProfile.Profile()
+        cpu_profile.enable()
+        try:
+            yield
+        finally:
+            cpu_profile.disable()
+            with self._lock:
+                # A thread that outlives the command's profile isn't part of it:
+                if self._active:
+                    self._thread_profiles.append(cpu_profile)
@@ -0,0 +1,119 @@
+"""Define a client-side rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+from linkding_cli.const import LOGGER
+
+if sys.platform != "win32":
+    import fcntl
+
+# A reservation further in the future than this many intervals (beyond the burst) can
+# only come from a clock that jumped backwards (or a corrupt state file):
+MAX_PENDING_INTERVALS = 64
+
+STATE_FORMAT = "d"
+
+
+class RateLimiter:
+    """Define a token-bucket limit on the rate of requests.
+
+    The bucket is implemented as a generic cell rate algorithm, which stores a single
+    number: the "theoretical arrival time" of the next request. Each request reserves
+    the next free slot and waits for it. That timestamp can live in a state file,
+    updated under an exclusive lock, so that every process using the same file shares
+    one bucket.
+
+    Each process has at most one reservation outstanding at once, so processes
+    competing for the same bucket take turns (each gets a fair share), while a process
+    on its own can use the bucket's full rate.
+    """
+
+    def __init__(
+        self, rate: float, burst: int = 1, *, state_path: Path | None = None
+    ) -> None:
+        """Initialize.
+
+        Args:
+            rate: The maximum sustained number of requests per second.
+            burst: The number of requests that can be made at once after a lull.
+            state_path: An optional file to share the bucket through.
+        """
+        self._interval = 1 / rate
+        self._pending_until = 0.0
+        self._tolerance = (max(burst, 1) - 1) * self._interval
+        self._theoretical_arrival = 0.0
+
+        if state_path and sys.platform == "win32":  # pragma: no cover
+            LOGGER.debug("File locks are unavailable; not sharing the rate limit")
+            state_path = None
+        self._state_path = state_path
+
+    def _reserve(self, now: float, theoretical_arrival: float) -> tuple[float, float]:
+        """Reserve the next free slot.
+
+        Args:
+            now: The current time.
+            theoretical_arrival: The theoretical arrival time of the next request.
+
+        Returns:
+            The time the slot starts and the new theoretical arrival time.
+        """
+        if (
+            theoretical_arrival - now
+            > self._tolerance + self._interval * MAX_PENDING_INTERVALS
+        ):
+            theoretical_arrival = now
+        start = max(now, theoretical_arrival - self._tolerance)
+        return start, max(theoretical_arrival, now) + self._interval
+
+    def _reserve_shared(self, state_path: Path, now: float) -> float:
+        """Reserve the next free slot in a bucket shared through a state file.
+
+        Args:
+            state_path: The file the bucket is shared through.
+            now: The current time.
+
+        Returns:
+            The time the slot starts.
+        """
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_size = struct.calcsize(STATE_FORMAT)
+        fd = os.open(state_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw_state = os.pread(fd, state_size, 0)
+            if len(raw_state) == state_size:
+                (theoretical_arrival,) = struct.unpack(STATE_FORMAT, raw_state)
+            else:
+                theoretical_arrival = 0.0
+            start, theoretical_arrival = self._reserve(now, theoretical_arrival)
+            os.pwrite(fd, struct.pack(STATE_FORMAT, theoretical_arrival), 0)
+        finally:
+            # Closing the file releases the lock:
+            os.close(fd)
+        return start
+
+    async def async_acquire(self) -> None:
+        """Wait until a request can be made."""
+        while (wait := self._pending_until - time.time()) > 0:
+            await asyncio.sleep(wait)
+
+        # Processes sharing a bucket need a clock they all agree on:
+        now = time.time()
+        if self._state_path:
+            start = self._reserve_shared(self._state_path, now)
+        else:
+            start, self._theoretical_arrival = self._reserve(
+                now, self._theoretical_arrival
+            )
+
+        if (wait := start - now) > 0:
+            self._pending_until = start
+            await asyncio.sleep(wait)
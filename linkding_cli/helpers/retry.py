@@ -0,0 +1,130 @@
+"""Define helpers for retrying failed API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+from aiohttp import ClientConnectionError, ClientConnectorError, ClientResponseError
+
+# The delay before the first retry (doubling with each one after it) and the most a
+# single backoff can wait:
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+# The most a server's Retry-After header can make us wait:
+RETRY_AFTER_MAX = 120.0
+
+# Responses that mean the server (or a proxy in front of it) is overloaded:
+CONGESTION_STATUSES = {
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+# linkding's PATCHes set fields (rather than applying deltas) and its archive/unarchive
+# actions are no-ops when repeated, so repeating any of these is harmless:
+IDEMPOTENT_METHODS = {"delete", "get", "head", "options", "patch", "put"}
+IDEMPOTENT_ENDPOINT_SUFFIXES = ("/archive/", "/unarchive/")
+
+
+def _get_response_error(err: BaseException) -> ClientResponseError | None:
+    """Get the HTTP error behind an exception (if there is one).
+
+    aiolinkding wraps HTTP errors in its own exceptions, keeping the original as the
+    cause.
+
+    Args:
+        err: An exception raised by a request.
+
+    Returns:
+        A ClientResponseError (or None).
+    """
+    if isinstance(err, ClientResponseError):
+        return err
+    if isinstance(err.__cause__, ClientResponseError):
+        return err.__cause__
+    return None
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (either a number of seconds or an HTTP date).
+
+    Args:
+        value: The value of the header.
+
+    Returns:
+        The number of seconds to wait (or None if the header is missing or invalid).
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def get_retry_delay(
+    err: BaseException, method: str, endpoint: str, attempt: int
+) -> float | None:
+    """Get how long to wait before retrying a failed request.
+
+    Idempotent requests are retried upon an overloaded response, a timeout, or a
+    dropped connection. Other requests are only retried when the server can't have
+    acted on them: upon a 429 or when a connection couldn't be established at all.
+
+    Args:
+        err: The exception raised by the request.
+        method: The request's HTTP method.
+        endpoint: The request's API endpoint.
+        attempt: The number of retries already made.
+
+    Returns:
+        The number of seconds to wait (or None if the request shouldn't be retried).
+    """
+    idempotent = method.lower() in IDEMPOTENT_METHODS or endpoint.endswith(
+        IDEMPOTENT_ENDPOINT_SUFFIXES
+    )
+
+    if response_error := _get_response_error(err):
+        if response_error.status not in CONGESTION_STATUSES or (
+            not idempotent and response_error.status != HTTPStatus.TOO_MANY_REQUESTS
+        ):
+            return None
+        headers = response_error.headers
+        retry_after = _parse_retry_after(
+            headers.get("Retry-After") if headers else None
+        )
+        if retry_after is not None:
+            return min(retry_after, RETRY_AFTER_MAX)
+    elif not isinstance(err, ClientConnectorError) and not (
+        idempotent and isinstance(err, (ClientConnectionError, asyncio.TimeoutError))
+    ):
+        return None
+
+    # Exponential backoff with "full jitter," so that clients don't retry in lockstep:
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))  # nosec
+
+
+def is_congestion_signal(err: BaseException) -> bool:
+    """Determine whether a failed request means the server is overloaded.
+
+    Args:
+        err: The exception raised by the request.
+
+    Returns:
+        Whether fewer requests should be made at once.
+    """
+    if response_error := _get_response_error(err):
+        return response_error.status in CONGESTION_STATUSES
+    return isinstance(err, asyncio.TimeoutError)
@@ -0,0 +1,227 @@
+"""Define helpers for tracing API requests."""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from collections import Counter
+from pathlib import Path
+from time import monotonic
+from typing import IO, Any
+
+# The phases of a request, in order (their durations add up to the whole request):
+SPAN_PHASES = ("dns", "connect", "ttfb", "body", "decode")
+
+SUMMARY_PERCENTILES = (50, 95, 99)
+
+
+def _format_bytes(size: float) -> str:
+    """Format a number of bytes for humans.
+
+    Args:
+        size: The number of bytes.
+
+    Returns:
+        A string like "1.5 MiB".
+    """
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Get a percentile of a list of values (by the nearest-rank method).
+
+    Args:
+        values: The values, sorted in ascending order.
+        pct: The percentile to get (0-100).
+
+    Returns:
+        The smallest value that's at least as large as pct percent of the values.
+    """
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class Span:  # pylint: disable=too-many-instance-attributes
+    """Define the timeline of a single HTTP request.
+
+    Timestamps are filled in by aiohttp's tracing hooks as the request progresses;
+    those for phases that didn't happen (e.g., connecting over a pooled connection)
+    stay None.
+    """
+
+    def __init__(self, method: str, path: str, attempt: int) -> None:
+        """Initialize.
+
+        Args:
+            method: The request's HTTP method.
+            path: The request's API endpoint.
+            attempt: The number of retries made before this request.
+        """
+        self.attempt = attempt
+        self.error: str | None = None
+        self.method = method.upper()
+        self.path = path
+        self.records = 0
+        self.size = 0
+        self.status: int | None = None
+        self.timestamp = time.time()
+
+        self.start = monotonic()
+        self.connect_end: float | None = None
+        self.connect_start: float | None = None
+        self.dns_end: float | None = None
+        self.dns_start: float | None = None
+        self.end: float | None = None
+        self.headers_received: float | None = None
+        self.body_received: float | None = None
+
+    def durations(self) -> dict[str, float | None]:
+        """Get how long (in seconds) each phase of the request took.
+
+        Returns:
+            A mapping of phases (plus the whole request) to durations.
+        """
+        end = self.end or monotonic()
+        dns = connect = None
+        if self.dns_start is not None and self.dns_end is not None:
+            dns = self.dns_end - self.dns_start
+        if self.connect_start is not None and self.connect_end is not None:
+            connect = self.connect_end - self.connect_start - (dns or 0)
+
+        ttfb = body = decode = None
+        if self.headers_received is not None:
+            ttfb = self.headers_received - (self.connect_end or self.start)
+            if self.body_received is not None:
+                body = self.body_received - self.headers_received
+                decode = end - self.body_received
+
+        return {
+            "dns": dns,
+            "connect": connect,
+            "ttfb": ttfb,
+            "body": body,
+            "decode": decode,
+            "total": end - self.start,
+        }
+
+    def to_record(self) -> dict[str, Any]:
+        """Get a JSON-serializable record of the request.
+
+        Returns:
+            The request's details, with durations in milliseconds.
+        """
+        return {
+            "timestamp": round(self.timestamp, 6),
+            "method": self.method,
+            "path": self.path,
+            "attempt": self.attempt,
+            "status": self.status,
+            "bytes": self.size,
+            "records": self.records,
+            "error": self.error,
+            **{
+                f"{phase}_ms": None if duration is None else round(duration * 1000, 3)
+                for phase, duration in self.durations().items()
+            },
+        }
+
+
+class SpanRecorder:  # pylint: disable=too-few-public-methods
+    """Define a base class for collectors of finished request spans."""
+
+    def record(self, span: Span) -> None:
+        """Record a finished span.
+
+        Args:
+            span: The span.
+
+        Raises:
+            NotImplementedError: Raised when not implemented by a subclass.
+        """
+        raise NotImplementedError
+
+
+class Tracer(SpanRecorder):
+    """Define a collector of request spans.
+
+    Only each phase's durations are kept in memory (for the summary); full spans are
+    written to an optional JSONL file as they finish.
+    """
+
+    def __init__(self, spans_path: Path | None = None) -> None:
+        """Initialize.
+
+        Args:
+            spans_path: An optional file to write every span to (as JSONL).
+        """
+        self._durations: dict[str, list[float]] = {
+            phase: [] for phase in (*SPAN_PHASES, "total")
+        }
+        self._size = 0
+        self._spans_file: IO[str] | None = None
+        self._start = monotonic()
+        self._statuses: Counter[str] = Counter()
+
+        if spans_path:
+            self._spans_file = spans_path.open("w", encoding="utf-8")
+
+    def close(self) -> None:
+        """Close the spans file (if there is one)."""
+        if self._spans_file:
+            self._spans_file.close()
+            self._spans_file = None
+
+    def record(self, span: Span) -> None:
+        """Record a finished span.
+
+        Args:
+            span: The span.
+        """
+        for phase, duration in span.durations().items():
+            if duration is not None:
+                self._durations[phase].append(duration)
+        self._size += span.size
+        self._statuses[str(span.status or "error")] += 1
+
+        if self._spans_file:
+            self._spans_file.write(json.dumps(span.to_record()) + "\n")
+
+    def summarize(self) -> str:
+        """Summarize every request recorded so far.
+
+        Returns:
+            A table of latency percentiles per phase, preceded by throughput.
+        """
+        elapsed = monotonic() - self._start
+        count = len(self._durations["total"])
+        statuses = ", ".join(
+            f"{status}: {status_count}"
+            for status, status_count in sorted(self._statuses.items())
+        )
+        lines = [
+            f"Trace: {count} requests"
+            + (f" ({statuses})" if statuses else "")
+            + f" in {elapsed:.2f}s: {count / elapsed:.1f} requests/s, "
+            f"{_format_bytes(self._size)} received "
+            f"({_format_bytes(self._size / elapsed)}/s)"
+        ]
+        if not count:
+            return lines[0]
+
+        headers = [f"p{pct}" for pct in SUMMARY_PERCENTILES] + ["max"]
+        lines.append(f"{'phase':<8}" + "".join(f"{header:>10}" for header in headers))
+        for phase, durations in self._durations.items():
+            if not durations:
+                continue
+            durations.sort()
+            values = [_percentile(durations, pct) for pct in SUMMARY_PERCENTILES]
+            values.append(durations[-1])
+            lines.append(
+                f"{phase:<8}" + "".join(f"{value * 1000:>8.1f}ms" for value in values)
+            )
+        return "\n".join(lines)
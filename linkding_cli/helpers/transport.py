@@ -0,0 +1,78 @@
+"""Define HTTP transport options."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any
+
+from linkding_cli.const import CONF_TRANSPORT
+from linkding_cli.errors import ConfigError
+
+
+@dataclass(frozen=True)
+class TransportOptions:
+    """Define how the HTTP session talks to the linkding instance.
+
+    Every option defaults to aiohttp's (or aiolinkding's) own default.
+    """
+
+    # Whether to ask for compressed responses (gzip and deflate, plus Brotli when the
+    # Brotli package is installed):
+    compression: bool = True
+    # The most time (in seconds) to spend establishing a connection:
+    connect_timeout: float | None = None
+    # How long (in seconds) to cache DNS lookups; 0 disables the cache:
+    dns_cache_ttl: int = 10
+    # How long (in seconds) to keep an idle connection open for reuse:
+    keepalive_timeout: float = 15.0
+    # The most connections to have open at once (in total and per host; 0 means no
+    # limit):
+    limit: int = 100
+    limit_per_host: int = 0
+    # The most time (in seconds) to wait between reads of a response:
+    read_timeout: float | None = None
+    # The most time (in seconds) a whole request can take; 0 means no limit (by
+    # default, aiolinkding's):
+    timeout: float | None = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> TransportOptions:
+        """Build transport options from the `transport` section of a config file.
+
+        Args:
+            config: The `transport` section (or None if there isn't one).
+
+        Returns:
+            A TransportOptions object.
+
+        Raises:
+            ConfigError: Raised upon an unknown or invalid option.
+        """
+        if config is None:
+            return cls()
+        if not isinstance(config, dict):
+            raise ConfigError(f"Invalid {CONF_TRANSPORT}: {config}")
+
+        types = {option.name: option.type for option in fields(cls)}
+        options: dict[str, Any] = {}
+        for key, value in config.items():
+            if key not in types:
+                raise ConfigError(f"Unknown {CONF_TRANSPORT} option: {key}")
+            if types[key] == "bool":
+                valid = isinstance(value, bool)
+            elif value is None:
+                valid = "None" in types[key]
+            else:
+                try:
+                    number = int(value) if types[key] == "int" else float(value)
+                except (TypeError, ValueError):
+                    number = -1
+                valid = not isinstance(value, bool) and number >= 0
+                value = number
+            if not valid:
+                raise ConfigError(
+                    f"Invalid {CONF_TRANSPORT} option {key}: {config[key]}"
+                )
+            options[key] = value
+
+        return cls(**options)
@@ -0,0 +1,112 @@
+"""Define URL helpers."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Callable, Sequence
+from fnmatch import translate
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_IGNORED_PARAMS = ("utm_*", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def build_url_normalizer(
+    *,
+    compare_scheme: bool = False,
+    compare_trailing_slash: bool = False,
+    compare_www: bool = False,
+    ignore_fragment: bool = False,
+    ignored_params: Sequence[str] = DEFAULT_IGNORED_PARAMS,
+) -> Callable[[str], str]:
+    """Build a function that normalizes URLs, so that near-duplicates compare equal.
+
+    The scheme and host are always lowercased, default ports are dropped, and query
+    parameters are sorted; everything else is configurable.
+
+    Args:
+        compare_scheme: Whether http:// and https:// URLs are different.
+        compare_trailing_slash: Whether URLs that differ by a trailing slash are
+            different.
+        compare_www: Whether URLs that differ by a `www.` prefix are different.
+        ignore_fragment: Whether URLs that differ by fragment are the same (fragments
+            are kept by default, since they may address different pages of an app).
+        ignored_params: Glob patterns of (case-insensitive) query parameters to drop.
+
+    Returns:
+        A function that normalizes a URL.
+    """
+    ignored_param_pattern = (
+        re.compile("|".join(translate(param) for param in ignored_params), re.I)
+        if ignored_params
+        else None
+    )
+
+    def normalize(url: str) -> str:
+        """Normalize a URL.
+
+        Args:
+            url: The URL to normalize.
+
+        Returns:
+            The normalized URL (or the stripped URL, if it can't be parsed).
+        """
+        url = url.strip()
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            return url
+
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        if not compare_www and host.startswith("www."):
+            host = host[4:]
+        if ":" in host:
+            host = f"[{host}]"
+        if port is not None and port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{port}"
+        userinfo, _, _ = parts.netloc.rpartition("@")
+        if userinfo:
+            host = f"{userinfo}@{host}"
+        if not compare_scheme and scheme == "http":
+            scheme = "https"
+
+        path = parts.path or ("/" if host else "")
+        if not compare_trailing_slash:
+            path = path.rstrip("/")
+
+        query = parts.query
+        if query:
+            params = parse_qsl(query, keep_blank_values=True)
+            if ignored_param_pattern:
+                params = [
+                    (key, value)
+                    for key, value in params
+                    if not ignored_param_pattern.match(key)
+                ]
+            query = urlencode(sorted(params))
+
+        fragment = "" if ignore_fragment else parts.fragment
+        return urlunsplit((scheme, host, path, query, fragment))
+
+    return normalize
+
+
+def hash_url(url: str) -> int:
+    """Hash a (normalized) URL into a compact key.
+
+    A 64-bit digest keeps an index of hundreds of thousands of URLs small, with a
+    negligible chance of a collision.
+
+    Args:
+        url: The URL to hash.
+
+    Returns:
+        A 64-bit key.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(url.encode(), digest_size=8).digest(), "little"
+    )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 
 
@@ -21,3 +22,21 @@ def generate_api_payload(param_pairs: tuple) -> dict[str, Any]:
             payload[key] = value
 
     return payload
+
+
+def project_record(record: Any, fields: Sequence[str]) -> Any:
+    """Project a record down to a subset of its fields.
+
+    Fields the record doesn't have are included with a value of None; anything other
+    than a dict is returned as is.
+
+    Args:
+        record: The record to project.
+        fields: The fields to keep (in the order to output them).
+
+    Returns:
+        The projected record.
+    """
+    if not isinstance(record, dict):
+        return record
+    return {field: record.get(field) for field in fields}
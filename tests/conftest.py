@@ -2,14 +2,41 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
+import typer
 from typer.testing import CliRunner
 
 from linkding_cli.const import ENV_TOKEN, ENV_URL
+from linkding_cli.helpers import retry
 
 from .common import TEST_RAW_JSON, TEST_TOKEN, TEST_URL
 
 
+@pytest.fixture(autouse=True)
+def app_dir_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Define a fixture to keep the app directory out of the user's home directory.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+        tmp_path: A temporary directory.
+    """
+    monkeypatch.setattr(
+        typer, "get_app_dir", lambda app_name: str(tmp_path / "app-dir" / app_name)
+    )
+
+
+@pytest.fixture(autouse=True)
+def retry_backoff_fixture(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Define a fixture to retry failed requests without waiting.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+    """
+    monkeypatch.setattr(retry, "BACKOFF_BASE", 0.0)
+
+
 @pytest.fixture(name="config", scope="session")
 def config_fixture() -> str:
     """Define a fixture to return raw configuration data.
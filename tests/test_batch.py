@@ -0,0 +1,155 @@
+"""Define tests for the batch command."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from aiolinkding.errors import RequestError
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+
+TAGS_SINGLE_RESPONSE = {
+    "id": 1,
+    "name": "example-tag",
+    "date_added": "2022-05-14T02:06:20.627370Z",
+}
+
+
+@pytest.mark.parametrize("concurrency", ["1", "4"])
+def test_batch(concurrency: str, runner: CliRunner) -> None:
+    """Test running a batch of commands over one session.
+
+    Args:
+        concurrency: The maximum number of commands to run at once.
+        runner: A Typer CliRunner object.
+    """
+    with (
+        patch(
+            "aiolinkding.tag.TagManager.async_get_single",
+            AsyncMock(return_value=TAGS_SINGLE_RESPONSE),
+        ) as mock_get_single,
+        patch("linkding_cli.client.ClientSession", MagicMock()) as mock_client_session,
+    ):
+        mock_client_session.return_value.__aenter__.return_value = Mock(closed=False)
+        result = runner.invoke(
+            APP,
+            ["batch", "--concurrency", concurrency],
+            input=(
+                "tags get 1\n"
+                "\n"
+                "# A comment\n"
+                '{"args": ["tags", "get", 2]}\n'
+                '{"command": "tags get 3"}\n'
+            ),
+        )
+
+    assert result.exit_code == 0
+    assert sorted(
+        (json.loads(line) for line in result.stdout.splitlines()),
+        key=lambda result: result["line"],
+    ) == [
+        {"line": line, "exit_code": 0, "output": [TAGS_SINGLE_RESPONSE]}
+        for line in (1, 4, 5)
+    ]
+    assert sorted(call.args[0] for call in mock_get_single.await_args_list) == [1, 2, 3]
+    # Every command shared one HTTP session:
+    assert mock_client_session.call_count == 1
+
+
+def test_batch_errors(caplog: pytest.LogCaptureFixture, runner: CliRunner) -> None:
+    """Test that failing commands are reported without stopping the batch.
+
+    Args:
+        caplog: A pytest LogCaptureFixture object.
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.tag.TagManager.async_get_single",
+        AsyncMock(side_effect=[RequestError("Not found"), TAGS_SINGLE_RESPONSE]),
+    ):
+        result = runner.invoke(
+            APP,
+            ["batch"],
+            input=(
+                "tags get 1\n"
+                "tags get abc\n"
+                "shell\n"
+                '{"args": "tags"}\n'
+                '"unterminated\n'
+                "tags get 2\n"
+            ),
+        )
+
+    assert result.exit_code == 1
+    results = [
+        json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")
+    ]
+    assert [(result["line"], result["exit_code"]) for result in results] == [
+        (1, 1),
+        (2, 2),
+        (3, 2),
+        (4, 2),
+        (5, 2),
+        (6, 0),
+    ]
+    assert results[0]["error"] == "Not found"
+    assert "'abc' is not a valid integer" in results[1]["error"]
+    assert results[2]["error"] == "No such command: shell"
+    assert results[3]["error"] == 'Expected an "args" list or a "command" string'
+    assert results[4]["error"] == "Invalid command: No closing quotation"
+    assert results[5]["output"] == [TAGS_SINGLE_RESPONSE]
+    assert "5 of 6 commands failed" in caplog.messages
+
+
+def test_batch_streaming_output(runner: CliRunner) -> None:
+    """Test that output written while paging through results is captured.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.tag.TagManager.async_get_all",
+        AsyncMock(
+            return_value={
+                "count": 1,
+                "next": None,
+                "previous": None,
+                "results": [TAGS_SINGLE_RESPONSE],
+            }
+        ),
+    ):
+        result = runner.invoke(APP, ["batch"], input="tags all --all\n")
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {
+        "line": 1,
+        "exit_code": 0,
+        "output": [TAGS_SINGLE_RESPONSE],
+    }
+
+
+def test_batch_compressed_export(runner: CliRunner) -> None:
+    """Test that a compressed export to stdout fails cleanly within a batch.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with patch("aiolinkding.bookmark.BookmarkManager.async_get_all") as mock_get_all:
+        result = runner.invoke(
+            APP, ["batch"], input="bookmarks export --gzip --format ndjson\n"
+        )
+
+    assert result.exit_code == 1
+    assert json.loads(result.stdout) == {
+        "line": 1,
+        "exit_code": 1,
+        "output": [],
+        "error": (
+            "Unable to write a compressed export to this output; export to a file "
+            "instead"
+        ),
+    }
+    mock_get_all.assert_not_called()
@@ -0,0 +1,41 @@
+"""Define tests for the benchmark suite."""
+
+from __future__ import annotations
+
+import json
+
+from benchmarks.suite import (
+    COMMAND_ARGS,
+    DEFAULT_THRESHOLDS_PATH,
+    _iter_command_names,
+    find_regressions,
+)
+
+
+def test_every_command_is_benchmarked() -> None:
+    """Test that the benchmark suite has arguments for every command."""
+    assert set(_iter_command_names()) == set(COMMAND_ARGS)
+
+
+def test_find_regressions() -> None:
+    """Test comparing benchmark results with a baseline."""
+    baseline = {
+        "benchmarks": {
+            "import": {"median_ms": 100.0},
+            "startup.bookmarks get": {"median_ms": 300.0},
+            "startup.tags get": {"median_ms": 300.0},
+        }
+    }
+    results = {
+        "benchmarks": {
+            "import": {"median_ms": 110.0},
+            "startup.bookmarks get": {"median_ms": 350.0},
+            "startup.tags get": {"median_ms": 310.0},
+            "startup.new": {"median_ms": 1000.0},
+        }
+    }
+    thresholds = json.loads(DEFAULT_THRESHOLDS_PATH.read_text())
+
+    assert find_regressions(results, baseline, thresholds) == [
+        "startup.bookmarks get: 300.00ms -> 350.00ms (+50.00ms, allowed +25.00ms)"
+    ]
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
+import io
 import json
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from aiolinkding.errors import RequestError
 from typer.testing import CliRunner
 
 from linkding_cli.cli import APP
+from linkding_cli.helpers.concurrency import MAX_CONCURRENCY
+from linkding_cli.helpers.importers import iter_bookmarks
 
 BOOKMARKS_ALL_RESPONSE = {
     "count": 123,
@@ -309,3 +315,677 @@ def test_bookmark_command_api_calls(  # pylint: disable=too-many-positional-argu
         result = runner.invoke(APP, args)
         mocked_api_call.assert_awaited_with(*api_coro_args, **api_coro_kwargs)
     assert stdout_output in result.stdout
+
+
+@pytest.mark.parametrize(
+    "args,api_coro_path",
+    [
+        (
+            ["bookmarks", "all", "--all"],
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+        ),
+        (
+            ["bookmarks", "all", "--all", "--archived"],
+            "aiolinkding.bookmark.BookmarkManager.async_get_archived",
+        ),
+    ],
+)
+def test_bookmark_get_all_pages(
+    api_coro_path: str, args: list[str], runner: CliRunner
+) -> None:
+    """Test paging through every bookmark.
+
+    Args:
+        api_coro_path: The module path to a coroutine function.
+        args: The arguments to pass to the command.
+        runner: A Typer CliRunner object.
+    """
+    last_page = {
+        **BOOKMARKS_ALL_RESPONSE,
+        "next": None,
+        "results": [{**BOOKMARKS_SINGLE_RESPONSE, "id": 2}],
+    }
+    with patch(
+        api_coro_path,
+        AsyncMock(side_effect=[BOOKMARKS_ALL_RESPONSE, last_page]),
+    ) as mocked_api_call:
+        result = runner.invoke(APP, args)
+        assert mocked_api_call.await_count == 2
+        mocked_api_call.assert_awaited_with(limit=100, offset=100)
+    assert result.stdout.splitlines() == [
+        json.dumps(BOOKMARKS_ALL_RESPONSE["results"][0]),
+        json.dumps(last_page["results"][0]),
+    ]
+
+
+def test_bookmark_get_all_pages_parallel(runner: CliRunner) -> None:
+    """Test prefetching every page of bookmarks concurrently.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+
+    async def async_get_page(**kwargs: int) -> dict[str, Any]:
+        """Return a page of a fake 350-bookmark library.
+
+        Args:
+            kwargs: The keyword arguments passed to the API.
+
+        Returns:
+            An API response payload.
+        """
+        offset = kwargs.get("offset", 0)
+        # Make earlier pages slower so that they complete out of order:
+        await asyncio.sleep((350 - offset) / 10000)
+        return {
+            **BOOKMARKS_ALL_RESPONSE,
+            "count": 350,
+            "results": [{"id": offset}],
+        }
+
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_get_all",
+        AsyncMock(side_effect=async_get_page),
+    ) as mocked_api_call:
+        result = runner.invoke(APP, ["bookmarks", "all", "--parallel", "3"])
+        assert mocked_api_call.await_count == 4
+    assert result.stdout.splitlines() == [
+        json.dumps({"id": offset}) for offset in (0, 100, 200, 300)
+    ]
+
+
+@pytest.mark.parametrize(
+    "args,api_coro_path,api_output,stdout_output",
+    [
+        (
+            ["bookmarks", "archive", "12", "13"],
+            "aiolinkding.bookmark.BookmarkManager.async_archive",
+            None,
+            ['{"id": 12, "status": "archived"}', '{"id": 13, "status": "archived"}'],
+        ),
+        (
+            ["bookmarks", "delete", "12", "13"],
+            "aiolinkding.bookmark.BookmarkManager.async_delete",
+            None,
+            ['{"id": 12, "status": "deleted"}', '{"id": 13, "status": "deleted"}'],
+        ),
+        (
+            ["bookmarks", "get", "12", "13"],
+            "aiolinkding.bookmark.BookmarkManager.async_get_single",
+            BOOKMARKS_SINGLE_RESPONSE,
+            [json.dumps(BOOKMARKS_SINGLE_RESPONSE)] * 2,
+        ),
+        (
+            ["bookmarks", "unarchive", "12", "13"],
+            "aiolinkding.bookmark.BookmarkManager.async_unarchive",
+            None,
+            [
+                '{"id": 12, "status": "unarchived"}',
+                '{"id": 13, "status": "unarchived"}',
+            ],
+        ),
+    ],
+)
+def test_bookmark_bulk_operations(
+    args: list[str],
+    api_coro_path: str,
+    api_output: dict[str, Any] | None,
+    runner: CliRunner,
+    stdout_output: list[str],
+) -> None:
+    """Test running bookmark operations against multiple IDs.
+
+    Args:
+        args: The arguments to pass to the command.
+        api_coro_path: The module path to a coroutine function.
+        api_output: An API response payload.
+        runner: A Typer CliRunner object.
+        stdout_output: The lines displayed on stdout.
+    """
+    with patch(api_coro_path, AsyncMock(return_value=api_output)) as mocked_api_call:
+        result = runner.invoke(APP, args)
+        assert sorted(call.args for call in mocked_api_call.await_args_list) == [
+            (12,),
+            (13,),
+        ]
+    assert result.exit_code == 0
+    assert sorted(result.stdout.splitlines()) == sorted(stdout_output)
+
+
+def test_bookmark_bulk_operations_from_stdin(runner: CliRunner) -> None:
+    """Test reading bookmark IDs from stdin.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_archive", AsyncMock()
+    ) as mocked_api_call:
+        result = runner.invoke(
+            APP,
+            ["bookmarks", "archive", "--ids-from", "-", "--concurrency", "2"],
+            input="1\n2\n\n3\n",
+        )
+        assert sorted(call.args for call in mocked_api_call.await_args_list) == [
+            (1,),
+            (2,),
+            (3,),
+        ]
+    assert result.exit_code == 0
+    assert len(result.stdout.splitlines()) == 3
+
+
+@pytest.mark.parametrize(
+    "args,expected_in_flight", [([], MAX_CONCURRENCY), (["--concurrency", "2"], 2)]
+)
+def test_bookmark_bulk_operations_concurrency(
+    args: list[str], expected_in_flight: int, runner: CliRunner
+) -> None:
+    """Test that only an explicit --concurrency caps a bulk operation's requests.
+
+    Otherwise, the client's adaptive concurrency limit decides (up to its maximum).
+
+    Args:
+        args: The arguments to pass to the command.
+        expected_in_flight: The expected peak number of requests in flight.
+        runner: A Typer CliRunner object.
+    """
+    in_flight = peak_in_flight = 0
+
+    async def async_archive(_: int) -> None:
+        """Archive a bookmark, tracking how many archive requests are in flight."""
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_archive",
+        AsyncMock(side_effect=async_archive),
+    ):
+        result = runner.invoke(
+            APP,
+            ["bookmarks", "archive", "--ids-from", "-", *args],
+            input="".join(f"{bookmark_id}\n" for bookmark_id in range(100)),
+        )
+    assert result.exit_code == 0
+    assert peak_in_flight == expected_in_flight
+
+
+def test_bookmark_bulk_operations_failure(caplog: Any, runner: CliRunner) -> None:
+    """Test that a failed operation doesn't abort the others.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+
+    async def async_delete(bookmark_id: int) -> None:
+        """Fail to delete one particular bookmark.
+
+        Args:
+            bookmark_id: The ID of the bookmark to delete.
+
+        Raises:
+            RequestError: Raised for bookmark 13.
+        """
+        if bookmark_id == 13:
+            raise RequestError("Error while requesting /api/bookmarks/13/")
+
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_delete",
+        AsyncMock(side_effect=async_delete),
+    ):
+        result = runner.invoke(APP, ["bookmarks", "delete", "12", "13", "14"])
+    assert result.exit_code == 1
+    assert (
+        '{"id": 13, "error": "Error while requesting /api/bookmarks/13/"}'
+        in result.stdout
+    )
+    assert '{"id": 14, "status": "deleted"}' in result.stdout
+    assert "1 of 3 bookmark operations failed" in caplog.messages
+
+
+@pytest.mark.parametrize(
+    "args,stdin,error",
+    [
+        (["bookmarks", "archive"], None, "No bookmark IDs provided"),
+        (
+            ["bookmarks", "archive", "--ids-from", "-"],
+            "12\nabc\n",
+            "Invalid bookmark ID: abc",
+        ),
+    ],
+)
+def test_bookmark_bulk_operations_invalid_ids(
+    args: list[str], caplog: Any, error: str, runner: CliRunner, stdin: str | None
+) -> None:
+    """Test missing and invalid bookmark IDs.
+
+    Args:
+        args: The arguments to pass to the command.
+        caplog: A mock logging utility.
+        error: The expected error message.
+        runner: A Typer CliRunner object.
+        stdin: The data to pass on stdin.
+    """
+    with patch("aiolinkding.bookmark.BookmarkManager.async_archive", AsyncMock()):
+        result = runner.invoke(APP, args, input=stdin)
+    assert result.exit_code == 1
+    assert error in caplog.messages
+
+
+IMPORT_FILE_CONTENTS = {
+    "bookmarks.ndjson": (
+        '{"url": "https://example.com", "title": "Existing"}\n'
+        "\n"
+        '{"url": "https://new.example.com", "title": "New", "tags": "a,b", '
+        '"unread": true}\n'
+        '{"url": "https://new.example.com", "title": "Duplicate"}\n'
+    ),
+    "bookmarks.csv": (
+        "url,title,description,tag_names,unread\n"
+        "https://example.com,Existing,,,\n"
+        'https://new.example.com,New,,"a,b",true\n'
+        "https://new.example.com,Duplicate,,,\n"
+    ),
+    "bookmarks.html": (
+        "<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+        "<TITLE>Bookmarks</TITLE>\n"
+        "<DL><p>\n"
+        '<DT><A HREF="https://example.com" PRIVATE="1">Existing</A>\n'
+        '<DT><A HREF="https://new.example.com" TAGS="a,b" TOREAD="1" '
+        'PRIVATE="1">New</A>\n'
+        '<DT><A HREF="https://new.example.com">Duplicate</A>\n'
+        "<DD>A description\n"
+        "</DL><p>\n"
+    ),
+}
+
+
+@pytest.mark.parametrize("filename", IMPORT_FILE_CONTENTS)
+def test_bookmark_import(filename: str, runner: CliRunner, tmp_path: Any) -> None:
+    """Test importing bookmarks from a file.
+
+    Args:
+        filename: The name of the import file.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    import_filepath = tmp_path / filename
+    import_filepath.write_text(IMPORT_FILE_CONTENTS[filename], encoding="utf-8")
+
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            AsyncMock(return_value={**BOOKMARKS_ALL_RESPONSE, "next": None}),
+        ),
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_archived",
+            AsyncMock(return_value={**BOOKMARKS_ALL_RESPONSE, "next": None}),
+        ),
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_create",
+            AsyncMock(return_value={**BOOKMARKS_SINGLE_RESPONSE, "id": 2}),
+        ) as mocked_create,
+    ):
+        result = runner.invoke(APP, ["bookmarks", "import", str(import_filepath)])
+        mocked_create.assert_awaited_once_with(
+            "https://new.example.com",
+            is_archived=False,
+            shared=False,
+            tag_names=["a", "b"],
+            title="New",
+            unread=True,
+        )
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == [
+        '{"url": "https://example.com", "status": "skipped"}',
+        '{"url": "https://new.example.com", "status": "skipped"}',
+        '{"url": "https://new.example.com", "id": 2, "status": "created"}',
+    ]
+
+
+def test_bookmark_import_no_skip_existing(runner: CliRunner) -> None:
+    """Test importing bookmarks from stdin without skipping existing URLs.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all", AsyncMock()
+        ) as mocked_get_all,
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_create",
+            AsyncMock(side_effect=[BOOKMARKS_SINGLE_RESPONSE, RequestError("Bad URL")]),
+        ) as mocked_create,
+    ):
+        result = runner.invoke(
+            APP,
+            [
+                "bookmarks",
+                "import",
+                "-",
+                "--format",
+                "ndjson",
+                "--no-skip-existing",
+                "--concurrency",
+                "1",
+            ],
+            input='{"url": "https://example.com"}\n{"url": "https://example.com"}\n',
+        )
+        mocked_get_all.assert_not_awaited()
+        assert mocked_create.await_count == 2
+    assert result.exit_code == 1
+    assert result.stdout.splitlines() == [
+        '{"url": "https://example.com", "id": 1, "status": "created"}',
+        '{"url": "https://example.com", "error": "Bad URL"}',
+    ]
+
+
+@pytest.mark.parametrize(
+    "args,stdin,error",
+    [
+        (["-"], "", "Unable to detect the format of <stdin>; use --format"),
+        (["-", "--format", "xml"], "", "Unknown import format: xml"),
+    ],
+)
+def test_bookmark_import_errors(
+    args: list[str], caplog: Any, error: str, runner: CliRunner, stdin: str
+) -> None:
+    """Test invalid import files.
+
+    Args:
+        args: The arguments to pass to the command.
+        caplog: A mock logging utility.
+        error: The expected error message.
+        runner: A Typer CliRunner object.
+        stdin: The data to pass on stdin.
+    """
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            AsyncMock(return_value={**BOOKMARKS_ALL_RESPONSE, "next": None}),
+        ),
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_archived",
+            AsyncMock(return_value={**BOOKMARKS_ALL_RESPONSE, "next": None}),
+        ),
+    ):
+        result = runner.invoke(
+            APP, ["bookmarks", "import", "--no-skip-existing", *args], input=stdin
+        )
+    assert result.exit_code == 1
+    assert any(error in message for message in caplog.messages)
+
+
+@pytest.mark.parametrize(
+    "file_format,stdin,expected_output",
+    [
+        (
+            "csv",
+            "url,title\n,Example\nhttps://example.com,Example\n",
+            [
+                '{"line": 2, "error": "Bookmark is missing a URL"}',
+                '{"url": "https://example.com", "id": 1, "status": "created"}',
+            ],
+        ),
+        (
+            "ndjson",
+            (
+                '{]\n[]\n"x"\n{"title": "Example"}\n{"url": 1}\n'
+                '{"url": "https://example.com", "tags": 1}\n'
+                '{"url": "https://example.com", "title": 1}\n'
+                '\n{"url": "https://example.com"}\n'
+            ),
+            [
+                '{"line": 1, "error": "Invalid JSON"}',
+                '{"line": 2, "error": "Bookmark isn\'t a JSON object"}',
+                '{"line": 3, "error": "Bookmark isn\'t a JSON object"}',
+                '{"line": 4, "error": "Bookmark is missing a URL"}',
+                '{"line": 5, "error": "Bookmark URL isn\'t a string"}',
+                '{"line": 6, "error": "Bookmark tags aren\'t a list or a string"}',
+                '{"line": 7, "error": "Bookmark title isn\'t a string"}',
+                '{"url": "https://example.com", "id": 1, "status": "created"}',
+            ],
+        ),
+    ],
+)
+def test_bookmark_import_invalid_records(
+    caplog: Any,
+    expected_output: list[str],
+    file_format: str,
+    runner: CliRunner,
+    stdin: str,
+) -> None:
+    """Test that invalid records are reported and skipped, failing the import.
+
+    Args:
+        caplog: A mock logging utility.
+        expected_output: The expected lines of output.
+        file_format: The format of the import file.
+        runner: A Typer CliRunner object.
+        stdin: The data to pass on stdin.
+    """
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_create",
+        AsyncMock(return_value=BOOKMARKS_SINGLE_RESPONSE),
+    ) as mocked_create:
+        result = runner.invoke(
+            APP,
+            [
+                "bookmarks",
+                "import",
+                "-",
+                "--format",
+                file_format,
+                "--no-skip-existing",
+            ],
+            input=stdin,
+        )
+        assert mocked_create.await_count == 1
+    assert result.exit_code == 1
+    assert result.stdout.splitlines() == expected_output
+    invalid = len(expected_output) - 1
+    assert (
+        f"{invalid} of {invalid + 1} bookmarks failed to import" in caplog.messages[-1]
+    )
+
+
+BOOKMARKS_ARCHIVED_RESPONSE = {
+    **BOOKMARKS_ALL_RESPONSE,
+    "count": 1,
+    "next": None,
+    "results": [
+        {
+            **BOOKMARKS_SINGLE_RESPONSE,
+            "id": 2,
+            "url": "https://example.com/?a=1&b=<2>",
+            "title": "",
+            "description": "",
+            "notes": "A <note>\nover two lines",
+            "is_archived": True,
+            "unread": True,
+            "shared": True,
+            "tag_names": [],
+        }
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "filename,args",
+    [
+        ("bookmarks.html", []),
+        ("bookmarks.json.gz", []),
+        ("bookmarks.ndjson", ["--gzip"]),
+        ("bookmarks.txt", ["--format", "json"]),
+    ],
+)
+def test_bookmark_export(
+    args: list[str], filename: str, runner: CliRunner, tmp_path: Any
+) -> None:
+    """Test exporting every bookmark to a file.
+
+    Args:
+        args: The arguments to pass to the command.
+        filename: The name of the export file.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    export_filepath = tmp_path / filename
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            AsyncMock(return_value={**BOOKMARKS_ALL_RESPONSE, "next": None}),
+        ) as mocked_get_all,
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_archived",
+            AsyncMock(return_value=BOOKMARKS_ARCHIVED_RESPONSE),
+        ),
+    ):
+        result = runner.invoke(
+            APP, ["bookmarks", "export", str(export_filepath), *args]
+        )
+        mocked_get_all.assert_awaited_once_with(limit=1000)
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {"path": str(export_filepath), "bookmarks": 2}
+    assert list(tmp_path.iterdir()) == [export_filepath]
+
+    if filename.endswith(".gz") or "--gzip" in args:
+        contents = gzip.decompress(export_filepath.read_bytes()).decode()
+    else:
+        contents = export_filepath.read_text(encoding="utf-8")
+    bookmarks = [
+        BOOKMARKS_ALL_RESPONSE["results"][0],  # type: ignore[index]
+        BOOKMARKS_ARCHIVED_RESPONSE["results"][0],  # type: ignore[index]
+    ]
+
+    if filename.endswith(".html"):
+        assert contents.startswith("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n")
+        assert (
+            '<DT><A HREF="https://example.com" ADD_DATE="1601113583" PRIVATE="1" '
+            'TOREAD="0" TAGS="tag1,tag2">Example title</A>\n'
+            "<DD>Example description[linkding-notes]Example notes[/linkding-notes]\n"
+        ) in contents
+        # Exports round-trip through imports:
+        assert [
+            {
+                key: record[key]
+                for key in (
+                    "url",
+                    "title",
+                    "description",
+                    "notes",
+                    "tag_names",
+                    "is_archived",
+                    "unread",
+                    "shared",
+                )
+            }
+            for _, record, _ in iter_bookmarks(io.StringIO(contents), "html")
+            if record is not None
+        ] == [
+            {
+                "url": "https://example.com",
+                "title": "Example title",
+                "description": "Example description",
+                "notes": "Example notes",
+                "tag_names": ["tag1", "tag2"],
+                "is_archived": False,
+                "unread": False,
+                "shared": False,
+            },
+            {
+                "url": "https://example.com/?a=1&b=<2>",
+                "title": "Website title",
+                "description": "Website description",
+                "notes": "A <note>\nover two lines",
+                "tag_names": None,
+                "is_archived": True,
+                "unread": True,
+                "shared": True,
+            },
+        ]
+    elif filename.endswith(".ndjson"):
+        assert [json.loads(line) for line in contents.splitlines()] == bookmarks
+    else:
+        assert json.loads(contents) == bookmarks
+
+
+def test_bookmark_export_stdout(runner: CliRunner) -> None:
+    """Test exporting every bookmark to stdout.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            AsyncMock(return_value={**BOOKMARKS_ALL_RESPONSE, "next": None}),
+        ),
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_archived",
+            AsyncMock(return_value=BOOKMARKS_ARCHIVED_RESPONSE),
+        ),
+    ):
+        result = runner.invoke(APP, ["bookmarks", "export"])
+        assert result.exit_code == 0
+        assert [json.loads(line)["id"] for line in result.stdout.splitlines()] == [
+            1,
+            2,
+        ]
+
+        result = runner.invoke(APP, ["bookmarks", "export", "--gzip", "-f", "html"])
+        assert result.exit_code == 0
+        assert gzip.decompress(result.stdout_bytes).decode().endswith("</DL><p>\n")
+
+
+@pytest.mark.parametrize(
+    "filename,args,error",
+    [
+        ("bookmarks.txt", [], "Unable to detect the format of"),
+        ("bookmarks.ndjson", ["--format", "xml"], "Unknown export format: xml"),
+        ("bookmarks.ndjson", [], "Server error"),
+    ],
+)
+def test_bookmark_export_errors(  # pylint: disable=too-many-positional-arguments
+    args: list[str],
+    caplog: Any,
+    error: str,
+    filename: str,
+    runner: CliRunner,
+    tmp_path: Any,
+) -> None:
+    """Test failed exports, which should leave an existing export untouched.
+
+    Args:
+        args: The arguments to pass to the command.
+        caplog: A mock logging utility.
+        error: The expected error message.
+        filename: The name of the export file.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    export_filepath = tmp_path / filename
+    export_filepath.write_text("A previous export\n", encoding="utf-8")
+
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            AsyncMock(return_value={**BOOKMARKS_ALL_RESPONSE, "next": None}),
+        ),
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_archived",
+            AsyncMock(side_effect=RequestError("Server error")),
+        ),
+    ):
+        result = runner.invoke(
+            APP, ["bookmarks", "export", str(export_filepath), *args]
+        )
+    assert result.exit_code == 1
+    assert any(error in message for message in caplog.messages)
+    assert list(tmp_path.iterdir()) == [export_filepath]
+    assert export_filepath.read_text(encoding="utf-8") == "A previous export\n"
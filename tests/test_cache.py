@@ -0,0 +1,127 @@
+"""Define tests for the API response cache."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+from linkding_cli.helpers.cache import ResponseCache
+
+TAGS_SINGLE_RESPONSE = {
+    "id": 1,
+    "name": "example-tag",
+    "date_added": "2022-05-14T02:06:20.627370Z",
+}
+
+
+@pytest.mark.parametrize(
+    "cache_args,expected_request_count",
+    [
+        (["--cache"], 1),
+        (["--no-cache"], 3),
+        ([], 3),
+    ],
+)
+def test_cached_reads(
+    cache_args: list[str],
+    expected_request_count: int,
+    runner: CliRunner,
+    tmp_path: Any,
+) -> None:
+    """Test that repeated reads are answered from the cache when it's enabled.
+
+    Args:
+        cache_args: The cache-related arguments to pass to the CLI.
+        expected_request_count: The expected number of API requests.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    with patch(
+        "aiolinkding.client.Client.async_request",
+        AsyncMock(return_value=TAGS_SINGLE_RESPONSE),
+    ) as mock_request:
+        for _ in range(3):
+            result = runner.invoke(
+                APP, ["--data-dir", str(tmp_path), *cache_args, "tags", "get", "1"]
+            )
+            assert json.loads(result.stdout) == TAGS_SINGLE_RESPONSE
+    assert mock_request.await_count == expected_request_count
+
+
+@pytest.mark.parametrize(
+    "mutation_args",
+    [
+        ["bookmarks", "archive", "12"],
+        ["bookmarks", "create", "https://example.com"],
+        ["tags", "create", "sample-tag"],
+    ],
+)
+def test_mutations_invalidate_cache(
+    mutation_args: list[str], runner: CliRunner, tmp_path: Any
+) -> None:
+    """Test that mutating commands invalidate the cached responses they affect.
+
+    Args:
+        mutation_args: The arguments of a mutating command.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    base_args = ["--data-dir", str(tmp_path), "--cache"]
+    with patch(
+        "aiolinkding.client.Client.async_request",
+        AsyncMock(return_value=TAGS_SINGLE_RESPONSE),
+    ) as mock_request:
+        runner.invoke(APP, [*base_args, "tags", "get", "1"])
+        runner.invoke(APP, [*base_args, "user", "profile"])
+        runner.invoke(APP, [*base_args, *mutation_args])
+        mock_request.reset_mock()
+
+        runner.invoke(APP, [*base_args, "tags", "get", "1"])
+        runner.invoke(APP, [*base_args, "user", "profile"])
+    assert [call.args[1] for call in mock_request.await_args_list] == ["/api/tags/1/"]
+
+
+def test_lru_eviction(tmp_path: Any) -> None:
+    """Test that the least recently used responses are evicted first.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_size=100)
+    payload = {"value": "x" * 30}
+
+    cache.set("/api/tags/1/", None, payload)
+    cache.set("/api/tags/2/", None, payload)
+    cache.get("/api/tags/1/", None)
+    cache.set("/api/tags/3/", None, payload)
+
+    assert cache.get("/api/tags/1/", None)
+    assert cache.get("/api/tags/2/", None) is None
+    assert cache.get("/api/tags/3/", None)
+
+
+def test_ttls(tmp_path: Any) -> None:
+    """Test per-endpoint TTLs and freshness.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    cache = ResponseCache(
+        tmp_path / "cache.sqlite3", ttls={"/api/tags/": 0, "/api/tags/1/": 60}
+    )
+    assert cache.ttl("/api/bookmarks/") == 0
+    assert cache.ttl("/api/tags/2/") == 0
+    assert cache.ttl("/api/tags/1/") == 60
+    assert cache.ttl("/api/user/profile/") == 3600
+
+    cache.set("/api/tags/", {"limit": 10}, {}, etag='"abc"')
+    entry = cache.get("/api/tags/", {"limit": 10})
+    assert entry
+    assert not entry.fresh
+    assert entry.etag == '"abc"'
+    assert cache.get("/api/tags/", {"limit": 20}) is None
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import logging
-from unittest.mock import Mock
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
 
 import pytest
 from typer.testing import CliRunner
 
 from linkding_cli.cli import APP
+from linkding_cli.config import _parse_config_file
 from linkding_cli.const import CONF_TOKEN, CONF_URL, ENV_TOKEN
 from linkding_cli.helpers.logging import TyperLoggerHandler
 
@@ -113,6 +117,24 @@ def test_config_file_unparsable(
     assert "Unable to parse config file" in caplog.messages[3]
 
 
+@pytest.mark.parametrize("module", ["aiohttp", "asyncio", "ruamel.yaml", "sqlite3"])
+def test_lazy_imports(module: str) -> None:
+    """Test that heavy dependencies aren't imported just to build the CLI.
+
+    Args:
+        module: A module that shouldn't be imported.
+    """
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            f"import sys, linkding_cli.cli; assert {module!r} not in sys.modules",
+        ],
+        check=False,
+    )
+    assert result.returncode == 0
+
+
 def test_missing_command(runner: CliRunner) -> None:
     """Test a missing command.
 
@@ -238,3 +260,70 @@ def test_verbose_logging(args: list[str], caplog: Mock, runner: CliRunner) -> No
 
     # There should be more DEBUG-level logs than INFO-level logs:
     assert len(debug_log_messages) > len(info_log_messages)
+
+
+@pytest.mark.parametrize("runner", [CliRunner()])
+@pytest.mark.parametrize(
+    "filename,config",
+    [
+        ("config.json", TEST_RAW_JSON),
+        pytest.param(
+            "config.toml",
+            f'{CONF_TOKEN} = "{TEST_TOKEN}"\n{CONF_URL} = "{TEST_URL}"\n',
+            marks=pytest.mark.skipif(
+                sys.version_info < (3, 11), reason="tomllib requires Python 3.11"
+            ),
+        ),
+        ("config.yaml", TEST_RAW_YAML),
+    ],
+)
+def test_config_file_cache(
+    caplog: Mock, config: str, filename: str, runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test that config files are only parsed again once they change.
+
+    Args:
+        caplog: A mock logging utility.
+        config: The contents of the config file.
+        filename: The name of the config file.
+        runner: A Typer CliRunner object
+        tmp_path: A temporary directory.
+    """
+    caplog.set_level(logging.DEBUG)
+    config_filepath = tmp_path / filename
+    config_filepath.write_text(config, encoding="utf-8")
+
+    with patch(
+        "linkding_cli.config._parse_config_file", side_effect=_parse_config_file
+    ) as mock_parse_config_file:
+        for _ in range(2):
+            runner.invoke(APP, ["-v", "-c", str(config_filepath), "bookmarks"])
+        assert mock_parse_config_file.call_count == 1
+
+        config_filepath.write_text(
+            config.replace(TEST_TOKEN, "NEW_TOKEN"), encoding="utf-8"
+        )
+        runner.invoke(APP, ["-v", "-c", str(config_filepath), "bookmarks"])
+        assert mock_parse_config_file.call_count == 2
+
+    assert (
+        f"Loaded Config: <Config token=NEW_TOKEN url={TEST_URL} verbose=True>"
+        in caplog.messages
+    )
+
+
+def test_config_file_cache_skips_ruamel(
+    config_filepath: str, runner: CliRunner
+) -> None:
+    """Test that loading a cached YAML config doesn't import ruamel.yaml.
+
+    Args:
+        config_filepath: A path to a config file.
+        runner: A Typer CliRunner object
+    """
+    Path(config_filepath).write_text(TEST_RAW_YAML, encoding="utf-8")
+    runner.invoke(APP, ["-c", config_filepath, "bookmarks"])
+
+    with patch.dict(sys.modules, {"ruamel.yaml": None}):
+        result = runner.invoke(APP, ["-c", config_filepath, "user", "--help"])
+    assert result.exit_code == 0
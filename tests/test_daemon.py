@@ -0,0 +1,275 @@
+"""Define tests for the daemon and its thin client."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from click.testing import Result
+from typer.testing import CliRunner
+
+from benchmarks.stub_server import StubServer
+from linkding_cli.cli import APP
+from linkding_cli.const import ENV_URL
+from linkding_cli.helpers.daemon import (
+    ENV_DAEMON_SOCKET,
+    forward,
+    get_environment_digest,
+    request,
+)
+
+USER_PROFILE_RESPONSE = {
+    "theme": "auto",
+    "bookmark_date_display": "relative",
+    "enable_sharing": True,
+}
+
+
+@pytest.fixture(name="socket_path")
+def socket_path_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Define a fixture to return the path to the daemon's socket.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+        tmp_path: A temporary directory.
+
+    Returns:
+        The path to the socket.
+    """
+    path = tmp_path / "daemon" / "daemon.sock"
+    monkeypatch.setenv(ENV_DAEMON_SOCKET, str(path))
+    return path
+
+
+def _request(argv: list[str]) -> tuple[int | None, str, str]:
+    """Ask the daemon to run a command.
+
+    Args:
+        argv: The command's arguments.
+
+    Returns:
+        The command's exit code (or None if it should run in-process), stdout, and
+        stderr.
+    """
+    stderr, stdout = io.StringIO(), io.StringIO()
+    exit_code = request(argv, stdout, stderr)
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+def _start_daemon(
+    runner: CliRunner, socket_path: Path
+) -> tuple[threading.Thread, list[Result]]:
+    """Start the daemon in a background thread, waiting for it to listen.
+
+    Args:
+        runner: A Typer CliRunner object.
+        socket_path: The path to the daemon's socket.
+
+    Returns:
+        The daemon's thread and a list that will hold its result once it stops.
+    """
+    results: list[Result] = []
+    thread = threading.Thread(
+        target=lambda: results.append(
+            runner.invoke(APP, ["daemon", "--idle-timeout", "0.5"])
+        )
+    )
+    thread.start()
+    for _ in range(100):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            if sock.connect_ex(str(socket_path)) == 0:
+                break
+        time.sleep(0.05)
+    return thread, results
+
+
+def test_daemon(
+    monkeypatch: pytest.MonkeyPatch, runner: CliRunner, socket_path: Path
+) -> None:
+    """Test running commands in the daemon.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+        runner: A Typer CliRunner object.
+        socket_path: The path to the daemon's socket.
+    """
+    # A daemon that stopped without cleaning up leaves its socket behind:
+    socket_path.parent.mkdir(mode=0o700)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+        stale_socket.bind(str(socket_path))
+
+    with patch(
+        "aiolinkding.client.Client.async_request",
+        AsyncMock(return_value=USER_PROFILE_RESPONSE),
+    ) as mock_request:
+        thread, results = _start_daemon(runner, socket_path)
+
+        for _ in range(2):
+            exit_code, stdout, _ = _request(["user", "profile"])
+            assert exit_code == 0
+            assert stdout.startswith('{"theme": "auto"')
+        # The second read was answered from the daemon's in-memory cache:
+        assert mock_request.await_count == 1
+
+        exit_code, _, stderr = _request(["tags", "get", "abc"])
+        assert exit_code == 2
+        assert "'abc' is not a valid integer" in stderr
+
+        # Commands the daemon can't run for the client are run in-process:
+        assert _request(["shell"]) == (None, "", "")
+        assert _request(["bookmarks", "import", "-"]) == (None, "", "")
+        assert _request(["bookmarks", "export", "backup.html"]) == (None, "", "")
+        assert _request(["--verbose", "user", "profile"]) == (None, "", "")
+        monkeypatch.setenv(ENV_URL, "https://other.example.com")
+        assert _request(["user", "profile"]) == (None, "", "")
+
+        thread.join()
+
+    assert results[0].exit_code == 0
+    assert f"Listening on {socket_path}" in results[0].stdout
+    assert not socket_path.exists()
+
+
+def test_daemon_already_running(
+    caplog: pytest.LogCaptureFixture, runner: CliRunner, socket_path: Path
+) -> None:
+    """Test that only one daemon can listen on a socket.
+
+    Args:
+        caplog: A pytest LogCaptureFixture object.
+        runner: A Typer CliRunner object.
+        socket_path: The path to the daemon's socket.
+    """
+    socket_path.parent.mkdir(mode=0o700)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as other_daemon:
+        other_daemon.bind(str(socket_path))
+        other_daemon.listen()
+        result = runner.invoke(APP, ["daemon"])
+
+    assert result.exit_code == 1
+    assert f"A daemon is already listening on {socket_path}" in caplog.messages
+
+
+def test_daemon_streams_output(runner: CliRunner, socket_path: Path) -> None:
+    """Test that a command's output is sent to the client in chunks as it runs.
+
+    Args:
+        runner: A Typer CliRunner object.
+        socket_path: The path to the daemon's socket.
+    """
+    with StubServer(bookmark_count=2000).serve_in_thread() as server:
+        runner.env = {**runner.env, ENV_URL: server.url}
+        with patch.dict(os.environ, {ENV_URL: server.url}):
+            thread, _ = _start_daemon(runner, socket_path)
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(str(socket_path))
+                sock.sendall(
+                    json.dumps(
+                        {
+                            "argv": ["bookmarks", "all", "--all"],
+                            "environment": get_environment_digest(),
+                        }
+                    ).encode()
+                    + b"\n"
+                )
+                sock.shutdown(socket.SHUT_WR)
+                with sock.makefile("rb") as response:
+                    messages = [json.loads(line) for line in response]
+            thread.join()
+
+    assert messages[-1] == {"exit_code": 0}
+    chunks = [message["stdout"] for message in messages[:-1]]
+    assert len(chunks) > 1
+    assert len("".join(chunks).splitlines()) == 2000
+
+
+def test_daemon_binary_output(runner: CliRunner, socket_path: Path) -> None:
+    """Test that binary output (e.g., a compressed export) reaches the client intact.
+
+    Args:
+        runner: A Typer CliRunner object.
+        socket_path: The path to the daemon's socket.
+    """
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    with StubServer(bookmark_count=100).serve_in_thread() as server:
+        runner.env = {**runner.env, ENV_URL: server.url}
+        with patch.dict(os.environ, {ENV_URL: server.url}):
+            thread, _ = _start_daemon(runner, socket_path)
+            exit_code = request(
+                ["bookmarks", "export", "--gzip", "--format", "ndjson"],
+                stdout,
+                io.StringIO(),
+            )
+            thread.join()
+
+    assert exit_code == 0
+    stdout.flush()
+    export = gzip.decompress(stdout.buffer.getvalue()).decode()
+    assert len(export.splitlines()) == 100
+
+
+def test_daemon_socket_not_private(
+    caplog: pytest.LogCaptureFixture, runner: CliRunner, socket_path: Path
+) -> None:
+    """Test that neither the daemon nor its clients use a socket others can access.
+
+    Args:
+        caplog: A pytest LogCaptureFixture object.
+        runner: A Typer CliRunner object.
+        socket_path: The path to the daemon's socket.
+    """
+    socket_path.parent.mkdir(mode=0o700)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as impostor:
+        impostor.bind(str(socket_path))
+        impostor.listen()
+        os.chmod(socket_path.parent, 0o755)
+
+        result = runner.invoke(APP, ["daemon"])
+        assert result.exit_code == 1
+        assert (
+            f"{socket_path.parent} must be a directory that only you can access "
+            "(mode 0700)"
+        ) in caplog.messages
+
+        # The client runs commands in-process rather than send them to the socket:
+        assert _request(["user", "profile"]) == (None, "", "")
+        os.chmod(socket_path.parent, 0o700)
+        os.chmod(socket_path, 0o666)
+        assert _request(["user", "profile"]) == (None, "", "")
+
+
+def test_no_daemon(capsys: Any, socket_path: Path) -> None:
+    """Test that commands run in-process when no daemon is running.
+
+    Args:
+        capsys: A pytest CaptureFixture object.
+        socket_path: The path to the daemon's socket.
+    """
+    assert not socket_path.exists()
+    assert forward(["user", "profile"]) is None
+    assert capsys.readouterr().out == ""
+
+
+def test_thin_client_imports() -> None:
+    """Test that the thin client doesn't import anything slow to import."""
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            "import sys, linkding_cli.__main__; "
+            "assert not {'click', 'logging', 'typer'} & set(sys.modules)",
+        ],
+        check=False,
+    )
+    assert result.returncode == 0
@@ -0,0 +1,297 @@
+"""Define tests for finding duplicate bookmarks."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiolinkding.errors import RequestError
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+from linkding_cli.helpers.urls import build_url_normalizer
+
+URLS = {
+    1: "https://example.com/article",
+    2: "http://www.example.com/article/?utm_source=newsletter",
+    3: "https://example.com/article#comments",
+    4: "https://example.com/other",
+    5: "https://Example.com/other/?fbclid=abc",
+    6: "https://example.com/search?q=python&page=2",
+    7: "https://example.com/search?page=2&q=python",
+    8: "https://example.com/search?q=rust",
+}
+
+
+def _generate_pages(page_size: int) -> list[dict[str, Any]]:
+    """Generate pages of bookmarks (newest first, like the API).
+
+    Args:
+        page_size: The number of bookmarks per page.
+
+    Returns:
+        API response payloads.
+    """
+    bookmarks = [
+        {"id": bookmark_id, "url": url, "title": "Example title"}
+        for bookmark_id, url in sorted(URLS.items(), reverse=True)
+    ]
+    return [
+        {
+            "count": len(bookmarks),
+            "next": (
+                f"http://127.0.0.1:8000/api/bookmarks/?limit={page_size}"
+                f"&offset={offset + page_size}"
+                if offset + page_size < len(bookmarks)
+                else None
+            ),
+            "previous": None,
+            "results": bookmarks[offset : offset + page_size],
+        }
+        for offset in range(0, len(bookmarks), page_size)
+    ]
+
+
+@pytest.mark.parametrize(
+    "normalizer_kwargs,url,expected_url",
+    [
+        (
+            {},
+            "HTTP://WWW.Example.com:80/a/b/?utm_medium=x&b=2&a=1#top",
+            "https://example.com/a/b?a=1&b=2#top",
+        ),
+        ({}, "https://example.com:8443/", "https://example.com:8443"),
+        ({}, "https://user@[::1]/", "https://user@[::1]"),
+        ({}, "https://example.com/?gclid=1", "https://example.com"),
+        ({}, "http://[::1", "http://[::1"),
+        (
+            {"compare_scheme": True},
+            "http://example.com/#top",
+            "http://example.com#top",
+        ),
+        (
+            {"ignore_fragment": True},
+            "https://example.com/app/#/settings",
+            "https://example.com/app",
+        ),
+        (
+            {"compare_trailing_slash": True, "compare_www": True},
+            "https://www.example.com",
+            "https://www.example.com/",
+        ),
+        (
+            {"ignored_params": ["ref"]},
+            "https://example.com/?utm_source=x&REF=y",
+            "https://example.com?utm_source=x",
+        ),
+    ],
+)
+def test_normalize_url(
+    expected_url: str, normalizer_kwargs: dict[str, Any], url: str
+) -> None:
+    """Test normalizing URLs.
+
+    Args:
+        expected_url: The expected normalized URL.
+        normalizer_kwargs: The keyword arguments to build the normalizer with.
+        url: The URL to normalize.
+    """
+    assert build_url_normalizer(**normalizer_kwargs)(url) == expected_url
+
+
+@pytest.mark.parametrize(
+    "args,expected_groups",
+    [
+        (
+            [],
+            [
+                {"url": "https://example.com/search?page=2&q=python", "keep": 6},
+                {"url": "https://example.com/other", "keep": 4},
+                {"url": "https://example.com/article", "keep": 1},
+            ],
+        ),
+        (
+            ["--keep", "newest"],
+            [
+                {"url": "https://example.com/search?page=2&q=python", "keep": 7},
+                {"url": "https://example.com/other", "keep": 5},
+                {"url": "https://example.com/article", "keep": 2},
+            ],
+        ),
+        (
+            ["--keep", "newest", "--ignore-fragment"],
+            [
+                {"url": "https://example.com/search?page=2&q=python", "keep": 7},
+                {"url": "https://example.com/other", "keep": 5},
+                {"url": "https://example.com/article", "keep": 3},
+            ],
+        ),
+        (
+            ["--compare-scheme", "--ignore-fragment", "--ignore-params", "utm_*"],
+            [
+                {"url": "https://example.com/search?page=2&q=python", "keep": 6},
+                {"url": "https://example.com/article", "keep": 1},
+            ],
+        ),
+    ],
+)
+def test_dedupe(
+    args: list[str], expected_groups: list[dict[str, Any]], runner: CliRunner
+) -> None:
+    """Test reporting groups of duplicate bookmarks.
+
+    Args:
+        args: The arguments to pass to the command.
+        expected_groups: The URL and kept bookmark of each expected group.
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_get_all",
+        AsyncMock(side_effect=_generate_pages(3)),
+    ) as mock_get_all:
+        result = runner.invoke(APP, ["bookmarks", "dedupe", *args])
+
+    assert result.exit_code == 0
+    groups = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [{"url": group["url"], "keep": group["keep"]} for group in groups] == (
+        expected_groups
+    )
+    for group in groups:
+        assert group["keep"] not in group["duplicates"]
+    assert mock_get_all.await_args_list[0].kwargs == {"limit": 1000}
+
+
+@pytest.mark.parametrize(
+    "args,expected_groups",
+    [
+        ([], []),
+        (
+            ["--ignore-fragment"],
+            [{"url": "https://example.com/app", "duplicates": [2]}],
+        ),
+    ],
+)
+def test_dedupe_fragments(
+    args: list[str], expected_groups: list[dict[str, Any]], runner: CliRunner
+) -> None:
+    """Test that URLs that only differ by fragment are only duplicates on request.
+
+    Args:
+        args: The arguments to pass to the command.
+        expected_groups: The URL and duplicates of each expected group.
+        runner: A Typer CliRunner object.
+    """
+    bookmarks = [
+        {"id": 2, "url": "https://example.com/app/#/b"},
+        {"id": 1, "url": "https://example.com/app/#/a"},
+    ]
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_get_all",
+        AsyncMock(return_value={"count": 2, "next": None, "results": bookmarks}),
+    ):
+        result = runner.invoke(APP, ["bookmarks", "dedupe", *args])
+
+    assert result.exit_code == 0
+    assert [
+        {"url": group["url"], "duplicates": group["duplicates"]}
+        for group in map(json.loads, result.stdout.splitlines())
+    ] == expected_groups
+
+
+@pytest.mark.parametrize("action", ["archive", "delete"])
+def test_dedupe_action(action: str, runner: CliRunner) -> None:
+    """Test archiving or deleting duplicate bookmarks.
+
+    Args:
+        action: The action to take.
+        runner: A Typer CliRunner object.
+    """
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            AsyncMock(side_effect=_generate_pages(100)),
+        ),
+        patch(
+            f"aiolinkding.bookmark.BookmarkManager.async_{action}",
+            AsyncMock(side_effect=[None, None, None, RequestError("Not found")]),
+        ) as mock_action,
+    ):
+        result = runner.invoke(
+            APP,
+            [
+                "bookmarks",
+                "dedupe",
+                "--action",
+                action,
+                "--concurrency",
+                "1",
+                "--ignore-fragment",
+            ],
+        )
+
+    assert result.exit_code == 1
+    assert [call.args[0] for call in mock_action.await_args_list] == [7, 5, 2, 3]
+    assert [json.loads(line) for line in result.stdout.splitlines()] == [
+        {"id": 7, "keep": 6, "status": f"{action}d"},
+        {"id": 5, "keep": 4, "status": f"{action}d"},
+        {"id": 2, "keep": 1, "status": f"{action}d"},
+        {"id": 3, "error": "Not found"},
+    ]
+
+
+def test_dedupe_errors(caplog: Any, runner: CliRunner) -> None:
+    """Test invalid dedupe options.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+    result = runner.invoke(APP, ["bookmarks", "dedupe", "--action", "tag"])
+    assert result.exit_code == 1
+    assert "Unknown dedupe action: tag" in caplog.messages
+
+    result = runner.invoke(APP, ["bookmarks", "dedupe", "--keep", "first"])
+    assert result.exit_code == 1
+    assert "Unknown bookmark to keep: first" in caplog.messages
+
+
+def test_dedupe_local(runner: CliRunner, tmp_path: Any) -> None:
+    """Test finding duplicates in the local mirror.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    with (
+        patch(
+            "aiolinkding.client.Client.async_request",
+            AsyncMock(
+                side_effect=lambda _, endpoint, **kwargs: {
+                    "count": 0,
+                    "next": None,
+                    "previous": None,
+                    "results": (
+                        _generate_pages(100)[0]["results"]
+                        if endpoint == "/api/bookmarks/"
+                        else []
+                    ),
+                }
+            ),
+        ),
+    ):
+        runner.invoke(APP, ["--data-dir", str(tmp_path), "sync"])
+
+    with patch("aiolinkding.client.Client.async_request") as mock_request:
+        result = runner.invoke(
+            APP, ["--data-dir", str(tmp_path), "bookmarks", "dedupe", "--local"]
+        )
+
+    assert result.exit_code == 0
+    assert [json.loads(line)["keep"] for line in result.stdout.splitlines()] == [
+        1,
+        4,
+        6,
+    ]
+    mock_request.assert_not_called()
@@ -0,0 +1,235 @@
+"""Define tests for writing metrics about a command's run."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiohttp import ClientResponseError
+from aiolinkding.errors import RequestError
+from typer.testing import CliRunner
+
+from benchmarks.stub_server import StubServer
+from linkding_cli.cli import APP
+
+
+def _parse_metrics(metrics_path: Path) -> dict[str, float]:
+    """Parse a metrics file into its samples.
+
+    Args:
+        metrics_path: The metrics file.
+
+    Returns:
+        A dictionary of each sample (with its labels) to its value.
+    """
+    samples = {}
+    for line in metrics_path.read_text().splitlines():
+        if not line.startswith("#"):
+            sample, value = line.rsplit(" ", 1)
+            samples[sample] = float(value)
+    return samples
+
+
+def test_metrics(runner: CliRunner, tmp_path: Path) -> None:
+    """Test writing metrics about a run against a (stub) linkding server.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    metrics_path = tmp_path / "textfile" / "linkding.prom"
+    with StubServer(bookmark_count=250).serve_in_thread() as server:
+        for args in (["bookmarks", "get", "5"], ["bookmarks", "all", "--all"]):
+            result = runner.invoke(
+                APP,
+                [
+                    "--url",
+                    server.url,
+                    "--data-dir",
+                    str(tmp_path),
+                    "--metrics-file",
+                    str(metrics_path),
+                    *args,
+                ],
+            )
+            assert result.exit_code == 0
+
+    # Each run replaces the previous run's metrics (atomically):
+    assert [path.name for path in metrics_path.parent.iterdir()] == ["linkding.prom"]
+    samples = _parse_metrics(metrics_path)
+    labels = 'command="bookmarks all"'
+    endpoint_labels = f'{labels},endpoint="/api/bookmarks/"'
+    assert samples[f"linkding_cli_last_run_success{{{labels}}}"] == 1
+    assert samples[f"linkding_cli_last_run_duration_seconds{{{labels}}}"] > 0
+    assert (
+        samples[
+            f'linkding_cli_last_run_requests{{{endpoint_labels},method="GET",'
+            'status="200"}'
+        ]
+        == 3
+    )
+    assert samples[f"linkding_cli_last_run_records{{{labels}}}"] == 250
+    assert samples[f"linkding_cli_last_run_response_bytes{{{labels}}}"] > 0
+    assert samples[f"linkding_cli_last_run_retries{{{labels}}}"] == 0
+    assert (
+        samples[
+            f"linkding_cli_last_run_request_duration_seconds_bucket{{{endpoint_labels},"
+            'le="+Inf"}'
+        ]
+        == 3
+    )
+    assert (
+        samples[
+            "linkding_cli_last_run_request_duration_seconds_count"
+            f"{{{endpoint_labels}}}"
+        ]
+        == 3
+    )
+    assert not any("/api/bookmarks/5/" in sample for sample in samples)
+
+
+def test_metrics_endpoint_ids(runner: CliRunner, tmp_path: Path) -> None:
+    """Test that IDs are left out of the endpoints requests are labeled with.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    metrics_path = tmp_path / "linkding.prom"
+    with StubServer(bookmark_count=10).serve_in_thread() as server:
+        result = runner.invoke(
+            APP,
+            [
+                "--url",
+                server.url,
+                "--metrics-file",
+                str(metrics_path),
+                "bookmarks",
+                "get",
+                "5",
+            ],
+        )
+    assert result.exit_code == 0
+    samples = _parse_metrics(metrics_path)
+    assert (
+        samples[
+            'linkding_cli_last_run_requests{command="bookmarks get",'
+            'endpoint="/api/bookmarks/{id}/",method="GET",status="200"}'
+        ]
+        == 1
+    )
+    assert samples['linkding_cli_last_run_records{command="bookmarks get"}'] == 1
+
+
+def test_metrics_failure(caplog: Any, runner: CliRunner, tmp_path: Path) -> None:
+    """Test that metrics are written for a run that fails (after retrying).
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    err = RequestError("Error 503")
+    err.__cause__ = ClientResponseError(Mock(), (), status=503)
+    metrics_path = tmp_path / "linkding.prom"
+    with patch(
+        "aiolinkding.client.Client.async_request", AsyncMock(side_effect=[err] * 4)
+    ):
+        result = runner.invoke(
+            APP, ["--metrics-file", str(metrics_path), "user", "profile"]
+        )
+    assert result.exit_code == 1
+    assert "Error 503" in caplog.messages
+
+    samples = _parse_metrics(metrics_path)
+    labels = 'command="user profile"'
+    assert samples[f"linkding_cli_last_run_success{{{labels}}}"] == 0
+    assert samples[f"linkding_cli_last_run_retries{{{labels}}}"] == 3
+    assert (
+        samples[
+            f'linkding_cli_last_run_requests{{{labels},endpoint="/api/user/profile/",'
+            'method="GET",status="error"}'
+        ]
+        == 4
+    )
+
+
+@pytest.mark.parametrize(
+    "args,expected_command",
+    [
+        (["--rate", "0", "user", "profile"], "user profile"),
+        (["tags", "get", "abc"], "tags get"),
+    ],
+)
+def test_metrics_failure_before_command(
+    args: list[str], expected_command: str, runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test that metrics are written for a run that fails before its command runs.
+
+    Args:
+        args: The arguments to pass to the CLI.
+        expected_command: The command the metrics should be labeled with.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    metrics_path = tmp_path / "linkding.prom"
+    result = runner.invoke(APP, ["--metrics-file", str(metrics_path), *args])
+    assert result.exit_code != 0
+
+    samples = _parse_metrics(metrics_path)
+    labels = f'command="{expected_command}"'
+    assert samples[f"linkding_cli_last_run_success{{{labels}}}"] == 0
+    assert samples[f"linkding_cli_last_run_retries{{{labels}}}"] == 0
+
+
+@pytest.mark.parametrize(
+    "side_effect,expected_exit_code", [(None, 0), (RequestError("Error 500"), 1)]
+)
+def test_metrics_unwritable(
+    caplog: Any,
+    expected_exit_code: int,
+    runner: CliRunner,
+    side_effect: Exception | None,
+    tmp_path: Path,
+) -> None:
+    """Test that failing to write metrics doesn't change a command's outcome.
+
+    Args:
+        caplog: A mock logging utility.
+        expected_exit_code: The expected exit code.
+        runner: A Typer CliRunner object.
+        side_effect: What the API request raises (if anything).
+        tmp_path: A temporary directory.
+    """
+    not_a_directory = tmp_path / "file"
+    not_a_directory.touch()
+    metrics_path = not_a_directory / "linkding.prom"
+    with patch(
+        "aiolinkding.client.Client.async_request",
+        AsyncMock(return_value={}, side_effect=side_effect),
+    ):
+        result = runner.invoke(
+            APP, ["--metrics-file", str(metrics_path), "user", "profile"]
+        )
+    assert result.exit_code == expected_exit_code
+    assert any(
+        message.startswith(f"Unable to write metrics to {metrics_path}")
+        for message in caplog.messages
+    )
+    if side_effect:
+        assert "Error 500" in caplog.messages
+
+
+def test_metrics_disabled(runner: CliRunner, tmp_path: Path) -> None:
+    """Test that metrics aren't written by default.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    with patch("aiolinkding.client.Client.async_request", AsyncMock(return_value={})):
+        result = runner.invoke(APP, ["--data-dir", str(tmp_path), "user", "profile"])
+    assert result.exit_code == 0
+    assert not list(tmp_path.glob("**/*.prom"))
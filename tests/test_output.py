@@ -0,0 +1,308 @@
+"""Define tests for output formats."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiolinkding.errors import RequestError
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+
+BOOKMARKS_PAGES = [
+    {
+        "count": 3,
+        "next": "http://127.0.0.1:8000/api/bookmarks/?limit=2&offset=2",
+        "previous": None,
+        "results": [
+            {
+                "id": 1,
+                "url": "https://example.com",
+                "title": 'An "example", with a comma',
+                "tag_names": ["tag1", "tag2"],
+                "unread": False,
+                "website_description": None,
+            },
+            {
+                "id": 2,
+                "url": "https://example.org",
+                "title": "Another example",
+                "tag_names": [],
+                "unread": True,
+                "website_description": "A\tdescription",
+            },
+        ],
+    },
+    {
+        "count": 3,
+        "next": None,
+        "previous": "http://127.0.0.1:8000/api/bookmarks/?limit=2",
+        "results": [
+            {
+                "id": 3,
+                "url": "https://example.net",
+                "title": "A third example",
+                "tag_names": ["tag3"],
+                "unread": False,
+                "website_description": None,
+            }
+        ],
+    },
+]
+BOOKMARKS = [bookmark for page in BOOKMARKS_PAGES for bookmark in page["results"]]
+
+
+@pytest.mark.parametrize(
+    "output_args,expected_stdout",
+    [
+        (
+            ["--output", "csv"],
+            "id,url,title,tag_names,unread,website_description\n"
+            '1,https://example.com,"An ""example"", with a comma","tag1,tag2",false,\n'
+            "2,https://example.org,Another example,,true,A\tdescription\n"
+            "3,https://example.net,A third example,tag3,false,\n",
+        ),
+        (
+            ["--output", "json"],
+            "["
+            + ",\n".join(json.dumps(b, separators=(",", ":")) for b in BOOKMARKS)
+            + "]\n",
+        ),
+        (
+            ["--output", "ndjson"],
+            "".join(f"{json.dumps(b, separators=(',', ':'))}\n" for b in BOOKMARKS),
+        ),
+        (
+            ["--output", "tsv"],
+            "id\turl\ttitle\ttag_names\tunread\twebsite_description\n"
+            '1\thttps://example.com\t"An ""example"", with a comma"\ttag1,tag2\tfalse\t\n'
+            "2\thttps://example.org\tAnother example\t\ttrue\t"
+            '"A\tdescription"\n'
+            "3\thttps://example.net\tA third example\ttag3\tfalse\t\n",
+        ),
+        ([], "".join(f"{json.dumps(b)}\n" for b in BOOKMARKS)),
+    ],
+)
+def test_output_formats(
+    expected_stdout: str, output_args: list[str], runner: CliRunner
+) -> None:
+    """Test streaming every bookmark in each output format.
+
+    Args:
+        expected_stdout: The expected output.
+        output_args: The output-related arguments to pass to the CLI.
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_get_all",
+        AsyncMock(side_effect=BOOKMARKS_PAGES),
+    ):
+        result = runner.invoke(APP, [*output_args, "bookmarks", "all", "--all"])
+    assert result.exit_code == 0
+    assert result.stdout == expected_stdout
+
+
+@pytest.mark.parametrize(
+    "output_format,expected_stdout",
+    [
+        ("csv", "id,name\n1,example-tag\n"),
+        ("json", '{"id":1,"name":"example-tag"}\n'),
+        ("ndjson", '{"id":1,"name":"example-tag"}\n'),
+    ],
+)
+def test_output_formats_single_result(
+    expected_stdout: str, output_format: str, runner: CliRunner
+) -> None:
+    """Test outputting a single result in various output formats.
+
+    Args:
+        expected_stdout: The expected output.
+        output_format: The output format.
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.tag.TagManager.async_get_single",
+        AsyncMock(return_value={"id": 1, "name": "example-tag"}),
+    ):
+        result = runner.invoke(APP, ["--output", output_format, "tags", "get", "1"])
+    assert result.stdout == expected_stdout
+
+
+def test_output_format_bulk_operations(runner: CliRunner) -> None:
+    """Test that bulk operations output a consistent set of columns.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+
+    async def async_archive(bookmark_id: int) -> None:
+        """Archive a bookmark, failing for one of them.
+
+        Args:
+            bookmark_id: The ID of a bookmark.
+
+        Raises:
+            RequestError: Raised for bookmark 13.
+        """
+        if bookmark_id == 13:
+            raise RequestError("Not found")
+
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_archive",
+        AsyncMock(side_effect=async_archive),
+    ):
+        result = runner.invoke(
+            APP,
+            [
+                "--output",
+                "csv",
+                "bookmarks",
+                "archive",
+                "12",
+                "13",
+                "--concurrency",
+                "1",
+            ],
+        )
+    assert result.stdout.splitlines()[:3] == [
+        "id,status,error",
+        "12,archived,",
+        "13,,Not found",
+    ]
+
+
+@pytest.mark.parametrize(
+    "output_args,expected_stdout",
+    [
+        (
+            ["--output", "csv"],
+            'id,tag_names\n1,"tag1,tag2"\n2,\n3,tag3\n',
+        ),
+        (
+            [],
+            "".join(
+                f"{json.dumps({'id': b['id'], 'tag_names': b['tag_names']})}\n"
+                for b in BOOKMARKS
+            ),
+        ),
+    ],
+)
+def test_fields(
+    expected_stdout: str, output_args: list[str], runner: CliRunner
+) -> None:
+    """Test projecting a stream of bookmarks onto a subset of fields.
+
+    Args:
+        expected_stdout: The expected output.
+        output_args: The output-related arguments to pass to the CLI.
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.bookmark.BookmarkManager.async_get_all",
+        AsyncMock(side_effect=BOOKMARKS_PAGES),
+    ):
+        result = runner.invoke(
+            APP,
+            [*output_args, "bookmarks", "all", "--all", "--fields", "id, tag_names"],
+        )
+    assert result.exit_code == 0
+    assert result.stdout == expected_stdout
+
+
+@pytest.mark.parametrize(
+    "args,patch_target,response,expected_output",
+    [
+        (
+            ["bookmarks", "all"],
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            BOOKMARKS_PAGES[1],
+            {**BOOKMARKS_PAGES[1], "results": [{"url": "https://example.net"}]},
+        ),
+        (
+            ["bookmarks", "get", "3"],
+            "aiolinkding.bookmark.BookmarkManager.async_get_single",
+            BOOKMARKS[2],
+            {"url": "https://example.net"},
+        ),
+        (
+            ["user", "profile"],
+            "aiolinkding.user.UserManager.async_get_profile",
+            {"theme": "auto", "url": None},
+            {"url": None},
+        ),
+    ],
+)
+def test_fields_payloads(
+    args: list[str],
+    expected_output: dict[str, Any],
+    patch_target: str,
+    response: dict[str, Any],
+    runner: CliRunner,
+) -> None:
+    """Test projecting API response payloads onto a subset of fields.
+
+    Args:
+        args: The arguments to pass to the CLI.
+        expected_output: The expected (JSON) output.
+        patch_target: The aiolinkding method to patch.
+        response: The API response payload.
+        runner: A Typer CliRunner object.
+    """
+    with patch(patch_target, AsyncMock(return_value=response)):
+        result = runner.invoke(APP, [*args, "--fields", "url"])
+    assert result.stdout == f"{json.dumps(expected_output)}\n"
+
+
+def test_fields_invalid(caplog: Mock, runner: CliRunner) -> None:
+    """Test an invalid field.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+    result = runner.invoke(APP, ["tags", "get", "1", "--fields", "id,$.name"])
+    assert result.exit_code == 1
+    assert "Invalid field: $.name" in caplog.messages
+
+
+def test_output_format_invalid(caplog: Mock, runner: CliRunner) -> None:
+    """Test an invalid output format.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+    result = runner.invoke(APP, ["--output", "xml", "tags", "get", "1"])
+    assert result.exit_code == 1
+    assert "Invalid output format: xml" in caplog.messages
+
+
+@pytest.mark.parametrize(
+    "encoder_module,unavailable",
+    [
+        ("msgspec", ["orjson"]),
+        ("json", ["msgspec", "orjson"]),
+    ],
+)
+def test_json_backends(encoder_module: str, unavailable: list[str]) -> None:
+    """Test that every JSON backend produces the same output.
+
+    Args:
+        encoder_module: The module that should be used to encode JSON.
+        unavailable: The modules to make unavailable.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from linkding_cli.helpers.output import get_compact_json_encoder
+
+    data: dict[str, Any] = {"id": 1, "tag_names": ["a", "b"], "notes": "Café"}
+    get_compact_json_encoder.cache_clear()
+    try:
+        with patch.dict("sys.modules", dict.fromkeys(unavailable)):
+            if encoder_module != "json":
+                pytest.importorskip(encoder_module)
+            assert json.loads(get_compact_json_encoder()(data)) == data
+    finally:
+        get_compact_json_encoder.cache_clear()
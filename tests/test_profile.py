@@ -0,0 +1,164 @@
+"""Define tests for profiling commands."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiolinkding.errors import RequestError
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+from linkding_cli.helpers.profiling import write_collapsed_stacks
+
+
+def _fibonacci(number: int) -> int:
+    """Calculate a Fibonacci number (recursively, to profile recursion).
+
+    Args:
+        number: The index of the Fibonacci number.
+
+    Returns:
+        The Fibonacci number.
+    """
+    if number < 2:
+        return number
+    return _fibonacci(number - 1) + _fibonacci(number - 2)
+
+
+@pytest.mark.parametrize(
+    "args,expected_output",
+    [
+        (["--profile"], "Ordered by: internal time"),
+        (["--profile-memory"], "Top allocation sites"),
+    ],
+)
+def test_profile(args: list[str], expected_output: str, runner: CliRunner) -> None:
+    """Test printing a profile of a command.
+
+    Args:
+        args: The arguments to pass to the CLI.
+        expected_output: Output the profile should contain.
+        runner: A Typer CliRunner object.
+    """
+    with patch("aiolinkding.client.Client.async_request", AsyncMock(return_value={})):
+        result = runner.invoke(APP, [*args, "user", "profile"])
+    assert result.exit_code == 0
+    # Only the command is profiled (not the "user" group's callback):
+    assert result.output.count(expected_output) == 1
+
+
+def test_profile_failure(caplog: Any, runner: CliRunner) -> None:
+    """Test that a command that fails is still profiled.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.client.Client.async_request",
+        AsyncMock(side_effect=RequestError("Error 500")),
+    ):
+        result = runner.invoke(APP, ["--profile", "user", "profile"])
+    assert result.exit_code == 1
+    assert "Error 500" in caplog.messages
+    assert "Ordered by: internal time" in result.output
+
+
+@pytest.mark.parametrize("filename", ["profile.pstats", "profile.folded"])
+def test_profile_file(filename: str, runner: CliRunner, tmp_path: Path) -> None:
+    """Test saving a profile of a command.
+
+    Args:
+        filename: The name of the profile file.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    profile_path = tmp_path / filename
+    with patch("aiolinkding.client.Client.async_request", AsyncMock(return_value={})):
+        result = runner.invoke(
+            APP, ["--profile-file", str(profile_path), "user", "profile"]
+        )
+    assert result.exit_code == 0
+    assert f"Saved the profile to {profile_path}" in result.output
+
+    if profile_path.suffix == ".pstats":
+        stats = pstats.Stats(str(profile_path))
+        assert any(
+            name == "get_profile_info"
+            for _, _, name in stats.stats  # type: ignore[attr-defined]
+        )
+    else:
+        stacks = dict(
+            line.rsplit(" ", 1) for line in profile_path.read_text().splitlines()
+        )
+        command_microseconds = sum(
+            int(value)
+            for stack, value in stacks.items()
+            if stack.split(";")[0].endswith("(get_profile_info)")
+        )
+        assert command_microseconds / sum(map(int, stacks.values())) > 0.9
+
+
+def test_write_collapsed_stacks(tmp_path: Path) -> None:
+    """Test writing collapsed stacks for a profile with recursive calls.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    profile = cProfile.Profile()
+    profile.runcall(_fibonacci, 18)
+    stacks_path = tmp_path / "profile.folded"
+    write_collapsed_stacks(pstats.Stats(profile), stacks_path)
+
+    stacks = dict(line.rsplit(" ", 1) for line in stacks_path.read_text().splitlines())
+    [stack] = [stack for stack in stacks if "_fibonacci" in stack]
+    # The recursion is folded into a single frame:
+    assert stack.count("_fibonacci") == 1
+    total_microseconds = sum(int(value) for value in stacks.values())
+    assert int(stacks[stack]) / total_microseconds > 0.9
+
+
+def test_profile_persistent_loop(runner: CliRunner, tmp_path: Path) -> None:
+    """Test that coroutines run on a persistent event loop's thread are profiled.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    profile_path = tmp_path / "profile.pstats"
+    bookmarks = [
+        {"id": bookmark_id, "url": "https://example.com"} for bookmark_id in (1, 2)
+    ]
+    with (
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_get_all",
+            AsyncMock(return_value={"count": 2, "next": None, "results": bookmarks}),
+        ),
+        patch(
+            "aiolinkding.bookmark.BookmarkManager.async_archive", AsyncMock()
+        ) as mock_archive,
+    ):
+        result = runner.invoke(
+            APP,
+            [
+                "--profile-file",
+                str(profile_path),
+                "bookmarks",
+                "dedupe",
+                "--action",
+                "archive",
+            ],
+        )
+    assert result.exit_code == 0
+    mock_archive.assert_awaited_once_with(2)
+
+    names = {
+        name
+        for _, _, name in pstats.Stats(str(profile_path)).stats  # type: ignore[attr-defined]
+    }
+    assert {"async_index", "async_run"} <= names
@@ -0,0 +1,201 @@
+"""Define tests for the client-side rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+from linkding_cli.helpers.ratelimit import STATE_FORMAT, RateLimiter
+
+
+@pytest.fixture(name="clock")
+def clock_fixture() -> Any:
+    """Define a fixture to make time stand still, except while sleeping.
+
+    Yields:
+        A list of every (simulated) sleep.
+    """
+    now = [1000.0]
+    sleeps: list[float] = []
+
+    async def async_sleep(delay: float) -> None:
+        """Simulate sleeping.
+
+        Args:
+            delay: The number of seconds to sleep.
+        """
+        sleeps.append(round(delay, 6))
+        now[0] += delay
+
+    with (
+        patch("linkding_cli.helpers.ratelimit.time.time", lambda: now[0]),
+        patch("linkding_cli.helpers.ratelimit.asyncio.sleep", async_sleep),
+    ):
+        yield sleeps
+
+
+def test_burst(clock: list[float]) -> None:
+    """Test that a burst of requests is allowed, then the sustained rate is enforced.
+
+    Args:
+        clock: The simulated sleeps.
+    """
+    limiter = RateLimiter(10, 3)
+
+    async def async_run() -> None:
+        """Make several requests."""
+        for _ in range(6):
+            await limiter.async_acquire()
+
+    asyncio.run(async_run())
+    assert clock == [0.1, 0.1, 0.1]
+
+
+def test_concurrent_requests(clock: list[float]) -> None:
+    """Test that concurrent requests within a process are spaced out.
+
+    Args:
+        clock: The simulated sleeps.
+    """
+    limiter = RateLimiter(4)
+
+    async def async_run() -> None:
+        """Make several requests at once."""
+        await asyncio.gather(*(limiter.async_acquire() for _ in range(3)))
+
+    asyncio.run(async_run())
+    assert sum(clock) == pytest.approx(0.5)
+
+
+def test_shared_state(clock: list[float], tmp_path: Path) -> None:
+    """Test that limiters sharing a state file share one bucket.
+
+    Args:
+        clock: The simulated sleeps.
+        tmp_path: A temporary directory.
+    """
+    state_path = tmp_path / "data" / "ratelimit"
+    first_limiter = RateLimiter(10, state_path=state_path)
+    second_limiter = RateLimiter(10, state_path=state_path)
+
+    async def async_run() -> None:
+        """Make requests from two "processes"."""
+        await first_limiter.async_acquire()
+        await second_limiter.async_acquire()
+        await first_limiter.async_acquire()
+
+    asyncio.run(async_run())
+    assert clock == [0.1, 0.1]
+    assert struct.unpack(STATE_FORMAT, state_path.read_bytes()) == (
+        pytest.approx(1000.3),
+    )
+
+
+def test_stale_shared_state(clock: list[float], tmp_path: Path) -> None:
+    """Test that a reservation far in the future (e.g., from a clock jump) is reset.
+
+    Args:
+        clock: The simulated sleeps.
+        tmp_path: A temporary directory.
+    """
+    state_path = tmp_path / "ratelimit"
+    state_path.write_bytes(struct.pack(STATE_FORMAT, 999999.0))
+    asyncio.run(RateLimiter(10, state_path=state_path).async_acquire())
+    assert not clock
+
+
+@pytest.mark.parametrize(
+    "args,config,expected_burst,expected_shared",
+    [
+        (["--rate", "2.5"], {}, 2, True),
+        ([], {"rate": 20, "rate_burst": 5, "rate_shared": False}, 5, False),
+    ],
+)
+def test_rate_config(  # pylint: disable=too-many-positional-arguments
+    args: list[str],
+    config: dict[str, Any],
+    expected_burst: int,
+    expected_shared: bool,
+    runner: CliRunner,
+    tmp_path: Path,
+) -> None:
+    """Test configuring the rate limit.
+
+    Args:
+        args: The arguments to pass to the CLI.
+        config: The configuration file's contents.
+        expected_burst: The expected burst size.
+        expected_shared: Whether the rate limit should be shared.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    config_filepath = tmp_path / "config.json"
+    config_filepath.write_text(json.dumps(config), encoding="utf-8")
+
+    with (
+        patch("aiolinkding.client.Client.async_request", AsyncMock(return_value={})),
+        patch(
+            "linkding_cli.helpers.ratelimit.RateLimiter.async_acquire", AsyncMock()
+        ) as mock_acquire,
+        patch(
+            "linkding_cli.helpers.ratelimit.RateLimiter", Mock(wraps=RateLimiter)
+        ) as mock_rate_limiter,
+    ):
+        result = runner.invoke(
+            APP,
+            [
+                "--config",
+                str(config_filepath),
+                "--data-dir",
+                str(tmp_path),
+                *args,
+                "user",
+                "profile",
+            ],
+        )
+    assert result.exit_code == 0
+    _, burst = mock_rate_limiter.call_args.args
+    assert burst == expected_burst
+    assert (mock_rate_limiter.call_args.kwargs["state_path"] is not None) is (
+        expected_shared
+    )
+    mock_acquire.assert_awaited_once()
+
+
+def test_rate_invalid(caplog: Any, runner: CliRunner) -> None:
+    """Test an invalid rate.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+    result = runner.invoke(APP, ["--rate", "0", "user", "profile"])
+    assert result.exit_code == 1
+    assert "Invalid rate: 0.0" in caplog.messages
+
+
+@pytest.mark.parametrize("rate", ["fast", [1], "nan"])
+def test_rate_invalid_config(
+    caplog: Any, rate: Any, runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test an invalid rate in a config file.
+
+    Args:
+        caplog: A mock logging utility.
+        rate: The rate in the config file.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"rate": rate}))
+    result = runner.invoke(APP, ["-c", str(config_path), "user", "profile"])
+    assert result.exit_code == 1
+    assert f"Invalid rate: {rate}" in caplog.messages
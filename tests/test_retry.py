@@ -0,0 +1,291 @@
+"""Define tests for retrying requests and adapting concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiohttp import ClientConnectorError, ClientResponseError, ServerDisconnectedError
+from aiolinkding.errors import RequestError
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+from linkding_cli.helpers import concurrency
+from linkding_cli.helpers.concurrency import AdaptiveConcurrencyLimiter
+from linkding_cli.helpers.retry import get_retry_delay
+
+RESPONSE = {"id": 1, "name": "example"}
+
+
+def _generate_response_error(
+    status: int, headers: dict[str, str] | None = None
+) -> RequestError:
+    """Generate an aiolinkding error for an HTTP error response.
+
+    Args:
+        status: The HTTP status of the response.
+        headers: The headers of the response.
+
+    Returns:
+        A RequestError (caused by a ClientResponseError, like aiolinkding's).
+    """
+    err = RequestError(f"Error {status}")
+    err.__cause__ = ClientResponseError(Mock(), (), status=status, headers=headers)
+    return err
+
+
+CONNECTOR_ERROR = ClientConnectorError(Mock(), OSError("Connection refused"))
+
+
+@pytest.mark.parametrize(
+    "args,errors,expected_calls,expected_exit_code",
+    [
+        (["user", "profile"], [_generate_response_error(503)] * 2, 3, 0),
+        (["user", "profile"], [_generate_response_error(503)] * 4, 4, 1),
+        (
+            ["--retries", "1", "user", "profile"],
+            [_generate_response_error(502)] * 2,
+            2,
+            1,
+        ),
+        (["--retries", "0", "user", "profile"], [_generate_response_error(503)], 1, 1),
+        (["user", "profile"], [_generate_response_error(400)], 1, 1),
+        (
+            ["user", "profile"],
+            [ServerDisconnectedError(), asyncio.TimeoutError()],
+            3,
+            0,
+        ),
+        (["bookmarks", "archive", "1"], [_generate_response_error(504)], 2, 0),
+        (["tags", "create", "example"], [_generate_response_error(503)], 1, 1),
+        (["tags", "create", "example"], [_generate_response_error(429)], 2, 0),
+        (["tags", "create", "example"], [ServerDisconnectedError()], 1, 1),
+        (["tags", "create", "example"], [CONNECTOR_ERROR], 2, 0),
+    ],
+)
+def test_retries(
+    args: list[str],
+    errors: list[Exception],
+    expected_calls: int,
+    expected_exit_code: int,
+    runner: CliRunner,
+) -> None:
+    """Test which failed requests are retried (and how many times).
+
+    Args:
+        args: The arguments to pass to the CLI.
+        errors: The errors the first requests fail with.
+        expected_calls: The expected number of requests.
+        expected_exit_code: The expected exit code.
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.client.Client.async_request",
+        AsyncMock(side_effect=[*errors, RESPONSE]),
+    ) as mock_request:
+        result = runner.invoke(APP, args)
+    assert mock_request.await_count == expected_calls
+    assert result.exit_code == expected_exit_code
+
+
+@pytest.mark.parametrize(
+    "retry_after,expected_delay",
+    [
+        ("2", 2.0),
+        ("1000", 120.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ],
+)
+def test_retry_after(
+    expected_delay: float, retry_after: str, runner: CliRunner
+) -> None:
+    """Test that the server's Retry-After header is honored.
+
+    Args:
+        expected_delay: The expected delay before retrying (in seconds).
+        retry_after: The value of the Retry-After header.
+        runner: A Typer CliRunner object.
+    """
+    with (
+        patch(
+            "aiolinkding.client.Client.async_request",
+            AsyncMock(
+                side_effect=[
+                    _generate_response_error(429, {"Retry-After": retry_after}),
+                    RESPONSE,
+                ]
+            ),
+        ),
+        patch("linkding_cli.client.asyncio.sleep", AsyncMock()) as mock_sleep,
+    ):
+        result = runner.invoke(APP, ["user", "profile"])
+    assert result.exit_code == 0
+    mock_sleep.assert_awaited_once_with(expected_delay)
+
+
+def test_retry_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that retries back off exponentially (with jitter), up to a maximum.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from linkding_cli.helpers import retry
+
+    monkeypatch.setattr(retry, "BACKOFF_BASE", 0.5)
+    with patch("linkding_cli.helpers.retry.random.uniform", lambda _, b: b):
+        assert [
+            get_retry_delay(asyncio.TimeoutError(), "get", "/api/tags/", attempt)
+            for attempt in range(8)
+        ] == [0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+
+
+def test_limiter_aimd(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the concurrency limit grows while healthy and shrinks on congestion.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+    """
+    clock = [100.0]
+    monkeypatch.setattr(concurrency, "monotonic", lambda: clock[0])
+    limiter = AdaptiveConcurrencyLimiter(4)
+
+    async def async_fill(count: int) -> None:
+        """Take slots.
+
+        Args:
+            count: The number of slots to take.
+        """
+        for _ in range(count):
+            await limiter.async_acquire()
+
+    # The limit only grows while every slot is in use, by one per response at first:
+    asyncio.run(async_fill(2))
+    limiter.record_latency(0.1)
+    assert limiter.limit == 4
+    asyncio.run(async_fill(2))
+    for _ in range(4):
+        limiter.record_latency(0.1)
+        asyncio.run(async_fill(1))
+    assert limiter.limit == 8
+
+    # Congestion halves the limit, but only once per (average) response time:
+    limiter.record_congestion()
+    limiter.record_congestion()
+    assert limiter.limit == 4
+    clock[0] += 1
+    limiter.record_congestion()
+    assert limiter.limit == 2
+
+    # Afterwards, the limit grows by about one per limit's worth of responses:
+    for _ in range(3):
+        limiter.record_latency(0.1)
+    assert limiter.limit == 3
+
+    # Nor does it ever shrink below the minimum:
+    for _ in range(4):
+        clock[0] += 1
+        limiter.record_congestion()
+    assert limiter.limit == 1
+
+
+def test_limiter_maximum(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the concurrency limit stops growing at its maximum.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+    """
+    monkeypatch.setattr(concurrency, "monotonic", lambda: 100.0)
+    limiter = AdaptiveConcurrencyLimiter(2, maximum=3)
+
+    async def async_fill() -> None:
+        """Take every free slot."""
+        while limiter.limit > limiter._in_flight:  # pylint: disable=protected-access
+            await limiter.async_acquire()
+
+    for _ in range(5):
+        asyncio.run(async_fill())
+        limiter.record_latency(0.1)
+    assert limiter.limit == 3
+
+
+def test_limiter_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that responses much slower than usual shrink the concurrency limit.
+
+    Args:
+        monkeypatch: A pytest MonkeyPatch object.
+    """
+    monkeypatch.setattr(concurrency, "monotonic", lambda: 100.0)
+    limiter = AdaptiveConcurrencyLimiter(16)
+    for _ in range(concurrency.LATENCY_MIN_SAMPLES):
+        limiter.record_latency(0.1)
+    assert limiter.limit == 16
+    for _ in range(3):
+        limiter.record_latency(1.0)
+    assert limiter.limit == 8
+
+
+def test_limiter_waiters() -> None:
+    """Test that requests wait for a free slot, in order."""
+
+    async def async_run() -> list[int]:
+        """Run more requests than there are slots.
+
+        Returns:
+            The order in which requests started.
+        """
+        limiter = AdaptiveConcurrencyLimiter(2)
+        started: list[int] = []
+
+        async def async_request(index: int) -> None:
+            """Make a fake request.
+
+            Args:
+                index: The index of the request.
+            """
+            await limiter.async_acquire()
+            started.append(index)
+            await asyncio.sleep(0)
+            limiter.release()
+
+        await limiter.async_acquire()
+        await limiter.async_acquire()
+        cancelled_waiter = asyncio.create_task(limiter.async_acquire())
+        await asyncio.sleep(0)
+        cancelled_waiter.cancel()
+        requests = [asyncio.create_task(async_request(index)) for index in range(4)]
+        await asyncio.sleep(0)
+        assert not started
+
+        limiter.release()
+        limiter.release()
+        await asyncio.gather(*requests)
+        assert limiter._in_flight == 0  # pylint: disable=protected-access
+        return started
+
+    assert asyncio.run(async_run()) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "method,endpoint,error,retried",
+    [
+        ("get", "/api/tags/", CONNECTOR_ERROR, True),
+        ("patch", "/api/bookmarks/1/", _generate_response_error(503), True),
+        ("post", "/api/bookmarks/", _generate_response_error(503), False),
+        ("post", "/api/bookmarks/1/unarchive/", ServerDisconnectedError(), True),
+        ("get", "/api/tags/", ValueError("Not a request error"), False),
+    ],
+)
+def test_retry_policy(
+    endpoint: str, error: Exception, method: str, retried: bool
+) -> None:
+    """Test which requests are considered safe to retry.
+
+    Args:
+        endpoint: The API endpoint.
+        error: The error the request failed with.
+        method: The HTTP method.
+        retried: Whether the request should be retried.
+    """
+    assert (get_retry_delay(error, method, endpoint, 0) is not None) is retried
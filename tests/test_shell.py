@@ -0,0 +1,89 @@
+"""Define tests for the interactive shell."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+
+USER_PROFILE_RESPONSE = {
+    "theme": "auto",
+    "bookmark_date_display": "relative",
+    "bookmark_link_target": "_blank",
+    "web_archive_integration": "enabled",
+    "tag_search": "lax",
+    "enable_sharing": True,
+    "enable_public_sharing": True,
+    "enable_favicons": False,
+    "display_url": False,
+    "permanent_notes": False,
+    "search_preferences": {"sort": "title_asc", "shared": "off", "unread": "off"},
+}
+
+
+def _get_json_lines(output: str) -> list[Any]:
+    """Get the JSON objects in a command's output.
+
+    Args:
+        output: The command's output.
+
+    Returns:
+        The JSON objects.
+    """
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+
+
+def test_shell(runner: CliRunner) -> None:
+    """Test running several commands in one shell session.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with (
+        patch(
+            "aiolinkding.user.UserManager.async_get_profile",
+            AsyncMock(return_value=USER_PROFILE_RESPONSE),
+        ) as mock_get_profile,
+        patch("linkding_cli.client.ClientSession", MagicMock()) as mock_client_session,
+    ):
+        mock_client_session.return_value.__aenter__.return_value = Mock(closed=False)
+        result = runner.invoke(
+            APP, ["shell"], input="user profile\n\n'user' profile\nexit\nuser profile\n"
+        )
+
+    assert result.exit_code == 0
+    assert _get_json_lines(result.stdout) == [USER_PROFILE_RESPONSE] * 2
+    assert mock_get_profile.await_count == 2
+    # Both commands shared one HTTP session:
+    assert mock_client_session.call_count == 1
+    assert "exit code 0]" in result.stdout
+
+
+def test_shell_errors(runner: CliRunner) -> None:
+    """Test that failing commands don't end the shell session.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with patch(
+        "aiolinkding.user.UserManager.async_get_profile",
+        AsyncMock(return_value=USER_PROFILE_RESPONSE),
+    ):
+        result = runner.invoke(
+            APP,
+            ["shell", "--no-timing"],
+            input='shell\nfake\nbookmarks get abc\n"unterminated\nhelp\nuser profile\n',
+        )
+
+    assert result.exit_code == 0
+    assert "No such command: shell" in result.stdout
+    assert "No such command: fake" in result.stdout
+    assert "'abc' is not a valid integer" in result.stdout
+    assert "No closing quotation" in result.stdout
+    assert "  bookmarks  Work with bookmarks." in result.stdout
+    assert _get_json_lines(result.stdout) == [USER_PROFILE_RESPONSE]
+    assert "exit code" not in result.stdout
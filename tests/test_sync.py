@@ -0,0 +1,562 @@
+"""Define tests for the local mirror."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+from linkding_cli.helpers.mirror import Mirror
+
+from .common import TEST_URL
+
+
+def _generate_bookmark(
+    bookmark_id: int, date_modified: str, **kwargs: Any
+) -> dict[str, Any]:
+    """Generate a fake bookmark.
+
+    Args:
+        bookmark_id: The ID of the bookmark.
+        date_modified: The bookmark's modification timestamp.
+        kwargs: Any additional fields.
+
+    Returns:
+        A bookmark payload.
+    """
+    return {
+        "id": bookmark_id,
+        "url": f"https://example.com/{bookmark_id}",
+        "title": f"Example title {bookmark_id}",
+        "description": "",
+        "notes": "",
+        "is_archived": False,
+        "tag_names": [],
+        "date_added": f"2020-09-26T09:46:2{bookmark_id}Z",
+        "date_modified": date_modified,
+        **kwargs,
+    }
+
+
+class FakeServer:
+    """Define a fake linkding server that answers raw API requests."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.bookmarks = {
+            1: _generate_bookmark(1, "2024-01-01T00:00:00Z", tag_names=["python"]),
+            2: _generate_bookmark(2, "2024-01-02T00:00:00Z"),
+            3: _generate_bookmark(3, "2024-01-03T00:00:00Z", is_archived=True),
+        }
+        self.tags = [
+            {"id": 1, "name": "python", "date_added": "2020-09-26T09:46:23Z"},
+            {"id": 2, "name": "rust", "date_added": "2020-09-26T09:46:23Z"},
+        ]
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+
+    async def async_request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Answer an API request.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            kwargs: Additional request kwargs.
+
+        Returns:
+            An API response payload.
+        """
+        assert method == "get"
+        params = kwargs.get("params", {})
+        self.requests.append((endpoint, params))
+
+        if endpoint == "/api/tags/":
+            items = self.tags
+        else:
+            archived = endpoint.endswith("archived/")
+            items = [
+                bookmark
+                for bookmark in self.bookmarks.values()
+                if bookmark["is_archived"] == archived
+                and bookmark["date_modified"] >= params.get("modified_since", "")
+            ]
+
+        limit = params.get("limit", 100)
+        offset = params.get("offset", 0)
+        next_url = None
+        if offset + limit < len(items):
+            next_url = f"{TEST_URL}{endpoint}?limit={limit}&offset={offset + limit}"
+        return {
+            "count": len(items),
+            "next": next_url,
+            "previous": None,
+            "results": items[offset : offset + limit],
+        }
+
+
+@pytest.fixture(name="server")
+def server_fixture() -> FakeServer:
+    """Define a fixture to return a fake linkding server.
+
+    Returns:
+        A FakeServer object.
+    """
+    return FakeServer()
+
+
+def _invoke(runner: CliRunner, server: FakeServer, tmp_path: Any, *args: str) -> Any:
+    """Invoke the CLI against a fake server with a temporary data directory.
+
+    Args:
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        tmp_path: A temporary directory.
+        args: The arguments to pass to the CLI.
+
+    Returns:
+        A Click Result object.
+    """
+    with patch("aiolinkding.client.Client.async_request", Mock()) as mock_request:
+        mock_request.side_effect = server.async_request
+        return runner.invoke(APP, ["--data-dir", str(tmp_path), *args])
+
+
+def test_sync_full_and_incremental(
+    runner: CliRunner, server: FakeServer, tmp_path: Any
+) -> None:
+    """Test a full sync followed by an incremental one.
+
+    Args:
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        tmp_path: A temporary directory.
+    """
+    result = _invoke(runner, server, tmp_path, "sync")
+    assert json.loads(result.stdout) == {
+        "full": True,
+        "bookmarks": {"upserted": 2, "deleted": 0, "total": 2},
+        "archived": {"upserted": 1, "deleted": 0, "total": 1},
+        "tags": {"total": 2},
+    }
+
+    # Modify one bookmark and delete another:
+    server.bookmarks[2]["title"] = "Updated title"
+    server.bookmarks[2]["date_modified"] = "2024-02-01T00:00:00Z"
+    server.bookmarks.pop(1)
+    server.requests.clear()
+
+    result = _invoke(runner, server, tmp_path, "sync")
+    assert json.loads(result.stdout) == {
+        "full": False,
+        "bookmarks": {"upserted": 1, "deleted": 1, "total": 1},
+        "archived": {"upserted": 1, "deleted": 0, "total": 1},
+        "tags": {"total": 2},
+    }
+    assert (
+        "/api/bookmarks/",
+        {"limit": 1000, "modified_since": "2024-01-03T00:00:00Z"},
+    ) in server.requests
+
+    result = _invoke(runner, server, tmp_path, "bookmarks", "get", "2", "--local")
+    assert json.loads(result.stdout)["title"] == "Updated title"
+
+    result = _invoke(runner, server, tmp_path, "bookmarks", "get", "1", "--local")
+    assert result.exit_code == 1
+
+    # Nothing has changed, so no ID sweep should be necessary:
+    server.requests.clear()
+    _invoke(runner, server, tmp_path, "sync")
+    assert ("/api/bookmarks/", {"limit": 1000}) not in server.requests
+
+
+@pytest.mark.parametrize(
+    "args,stdout_output",
+    [
+        (
+            ["bookmarks", "all", "--local", "-l", "1"],
+            {
+                "count": 2,
+                "next": f"{TEST_URL}/api/bookmarks/?limit=1&offset=1",
+                "previous": None,
+                "results": [
+                    _generate_bookmark(2, "2024-01-02T00:00:00Z"),
+                ],
+            },
+        ),
+        (
+            ["bookmarks", "all", "--local", "--archived"],
+            {
+                "count": 1,
+                "next": None,
+                "previous": None,
+                "results": [
+                    _generate_bookmark(3, "2024-01-03T00:00:00Z", is_archived=True),
+                ],
+            },
+        ),
+        (
+            ["bookmarks", "all", "--local", "-q", "#python example"],
+            {
+                "count": 1,
+                "next": None,
+                "previous": None,
+                "results": [
+                    _generate_bookmark(1, "2024-01-01T00:00:00Z", tag_names=["python"]),
+                ],
+            },
+        ),
+        (
+            ["bookmarks", "get", "3", "--local"],
+            _generate_bookmark(3, "2024-01-03T00:00:00Z", is_archived=True),
+        ),
+        (
+            ["tags", "all", "--local", "-o", "1"],
+            {
+                "count": 2,
+                "next": None,
+                "previous": f"{TEST_URL}/api/tags/?limit=100&offset=0",
+                "results": [
+                    {"id": 2, "name": "rust", "date_added": "2020-09-26T09:46:23Z"}
+                ],
+            },
+        ),
+        (
+            ["tags", "get", "1", "--local"],
+            {"id": 1, "name": "python", "date_added": "2020-09-26T09:46:23Z"},
+        ),
+    ],
+)
+def test_local_reads(
+    args: list[str],
+    runner: CliRunner,
+    server: FakeServer,
+    stdout_output: dict[str, Any],
+    tmp_path: Any,
+) -> None:
+    """Test answering read commands from the local mirror.
+
+    Args:
+        args: The arguments to pass to the command.
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        stdout_output: The JSON output displayed on stdout.
+        tmp_path: A temporary directory.
+    """
+    _invoke(runner, server, tmp_path, "sync")
+    server.requests.clear()
+
+    result = _invoke(runner, server, tmp_path, *args)
+    assert json.loads(result.stdout) == stdout_output
+    assert not server.requests
+
+
+@pytest.mark.parametrize(
+    "args,stdout_output",
+    [
+        (["bookmarks", "all", "--local", "--all"], [2, 1]),
+        (["tags", "all", "--local", "--all"], [1, 2]),
+    ],
+)
+def test_local_reads_all(
+    args: list[str],
+    runner: CliRunner,
+    server: FakeServer,
+    stdout_output: list[int],
+    tmp_path: Any,
+) -> None:
+    """Test streaming every result from the local mirror.
+
+    Args:
+        args: The arguments to pass to the command.
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        stdout_output: The IDs of the results displayed on stdout.
+        tmp_path: A temporary directory.
+    """
+    _invoke(runner, server, tmp_path, "sync")
+    result = _invoke(runner, server, tmp_path, *args)
+    assert [json.loads(line)["id"] for line in result.stdout.splitlines()] == (
+        stdout_output
+    )
+
+
+def test_local_tag_missing(
+    caplog: Any, runner: CliRunner, server: FakeServer, tmp_path: Any
+) -> None:
+    """Test getting a tag that isn't in the local mirror.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        tmp_path: A temporary directory.
+    """
+    _invoke(runner, server, tmp_path, "sync")
+    result = _invoke(runner, server, tmp_path, "tags", "get", "99", "--local")
+    assert result.exit_code == 1
+    assert "Tag 99 isn't in the local mirror" in caplog.messages
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["bookmarks", "all", "--local"],
+        ["bookmarks", "dedupe", "--local"],
+        ["bookmarks", "get", "1", "--local"],
+        ["bookmarks", "search", "example"],
+        ["tags", "all", "--local"],
+    ],
+)
+def test_local_reads_no_mirror(
+    args: list[str],
+    caplog: Any,
+    runner: CliRunner,
+    server: FakeServer,
+    tmp_path: Any,
+) -> None:
+    """Test answering from a local mirror that has never been synced.
+
+    Args:
+        args: The arguments to pass to the CLI.
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        tmp_path: A temporary directory.
+    """
+    result = _invoke(runner, server, tmp_path, *args)
+    assert result.exit_code == 1
+    assert "There's no local mirror yet; run `linkding sync` first" in caplog.messages
+    # An empty mirror isn't created in its place:
+    assert not list(tmp_path.iterdir())
+
+
+def test_local_get_without_client(
+    runner: CliRunner, server: FakeServer, tmp_path: Any
+) -> None:
+    """Test that getting bookmarks from the local mirror doesn't use the API client.
+
+    Args:
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        tmp_path: A temporary directory.
+    """
+    _invoke(runner, server, tmp_path, "sync")
+    with patch("linkding_cli.core.LinkDing.run") as mock_run:
+        result = _invoke(
+            runner, server, tmp_path, "bookmarks", "get", "1", "2", "99", "--local"
+        )
+    assert result.exit_code == 1
+    mock_run.assert_not_called()
+    assert [json.loads(line).get("id") for line in result.stdout.splitlines()] == [
+        1,
+        2,
+        99,
+    ]
+    assert '"error": "Bookmark 99 isn\'t in the local mirror"' in result.stdout
+
+
+@pytest.mark.parametrize(
+    "query,stdout_output",
+    [
+        ("example", [2, 1]),
+        ("exam", [2, 1]),
+        ("asyncio", [2, 1]),
+        ('"title 1"', [1]),
+        ("#python", [1]),
+        ("#python title", [1]),
+        ("!untagged", [2]),
+        ("example !untagged", [2]),
+        ("nonexistent", []),
+    ],
+)
+def test_search(
+    query: str,
+    runner: CliRunner,
+    server: FakeServer,
+    stdout_output: list[int],
+    tmp_path: Any,
+) -> None:
+    """Test searching the local mirror.
+
+    Args:
+        query: The search query.
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        stdout_output: The IDs of the results displayed on stdout (in rank order).
+        tmp_path: A temporary directory.
+    """
+    server.bookmarks[1]["notes"] = "Some notes about asyncio"
+    server.bookmarks[2]["title"] = "Asyncio example"
+    _invoke(runner, server, tmp_path, "sync")
+
+    result = _invoke(runner, server, tmp_path, "bookmarks", "search", query)
+    assert [json.loads(line)["id"] for line in result.stdout.splitlines()] == (
+        stdout_output
+    )
+
+
+def test_search_index_follows_sync(
+    runner: CliRunner, server: FakeServer, tmp_path: Any
+) -> None:
+    """Test that the search index is kept up to date by incremental syncs.
+
+    Args:
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        tmp_path: A temporary directory.
+    """
+    _invoke(runner, server, tmp_path, "sync")
+
+    server.bookmarks[2]["title"] = "Renamed"
+    server.bookmarks[2]["date_modified"] = "2024-02-01T00:00:00Z"
+    server.bookmarks.pop(1)
+    _invoke(runner, server, tmp_path, "sync")
+
+    result = _invoke(runner, server, tmp_path, "bookmarks", "search", "title")
+    assert result.stdout == ""
+
+    result = _invoke(runner, server, tmp_path, "bookmarks", "search", "renamed")
+    assert json.loads(result.stdout)["id"] == 2
+
+    result = _invoke(
+        runner, server, tmp_path, "bookmarks", "search", "title", "--archived"
+    )
+    assert json.loads(result.stdout)["id"] == 3
+
+
+def test_search_ranks_every_match(tmp_path: Any) -> None:
+    """Test that an old match outranks newer ones, however broad the query.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    mirror = Mirror(tmp_path / "mirror.db")
+    mirror.upsert_bookmarks(
+        _generate_bookmark(
+            bookmark_id,
+            "2024-01-01T00:00:00Z",
+            title="Common" if bookmark_id == 1 else "Other",
+            description="" if bookmark_id == 1 else "A common word",
+        )
+        for bookmark_id in range(1, 3001)
+    )
+    [best_match] = mirror.search_bookmarks("common", archived=False, limit=1)
+    mirror.close()
+    assert best_match["id"] == 1
+
+
+@pytest.mark.parametrize(
+    "query,expected_ids",
+    [
+        ("100%", [1]),
+        ("a_b", [2]),
+        ("#c_", []),
+        ("#c%", []),
+    ],
+)
+def test_filter_escapes_wildcards(
+    expected_ids: list[int], query: str, tmp_path: Any
+) -> None:
+    """Test that LIKE wildcards in a query match only themselves.
+
+    Args:
+        expected_ids: The IDs of the bookmarks the query should match.
+        query: The query.
+        tmp_path: A temporary directory.
+    """
+    mirror = Mirror(tmp_path / "mirror.db")
+    mirror.upsert_bookmarks(
+        [
+            _generate_bookmark(
+                1, "2024-01-01T00:00:00Z", title="100% done", tag_names=["c++"]
+            ),
+            _generate_bookmark(2, "2024-01-01T00:00:00Z", title="a_b 1000"),
+            _generate_bookmark(
+                3, "2024-01-01T00:00:00Z", title="aXb", tag_names=["cx"]
+            ),
+        ]
+    )
+    bookmarks = mirror.iter_bookmarks(archived=False, query=query)
+    assert [bookmark["id"] for bookmark in bookmarks] == expected_ids
+    mirror.close()
+
+
+@pytest.mark.parametrize("sql_projection", [False, True])
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["bookmarks", "all", "--local"],
+        ["bookmarks", "all", "--local", "--all"],
+        ["bookmarks", "get", "1", "2", "--local"],
+        ["bookmarks", "search", "example"],
+    ],
+)
+def test_local_reads_fields(
+    args: list[str],
+    runner: CliRunner,
+    server: FakeServer,
+    sql_projection: bool,
+    tmp_path: Any,
+) -> None:
+    """Test projecting bookmarks from the local mirror onto a subset of fields.
+
+    Args:
+        args: The arguments to pass to the command.
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        sql_projection: Whether SQLite should project each bookmark.
+        tmp_path: A temporary directory.
+    """
+    _invoke(runner, server, tmp_path, "sync")
+    with patch("linkding_cli.helpers.mirror.SQL_PROJECTION", sql_projection):
+        result = _invoke(
+            runner, server, tmp_path, *args, "--fields", "id,is_archived,tag_names,x"
+        )
+
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    if "results" in records[0]:
+        records = records[0]["results"]
+    assert sorted(records, key=lambda record: record["id"]) == [
+        {"id": 1, "is_archived": False, "tag_names": ["python"], "x": None},
+        {"id": 2, "is_archived": False, "tag_names": [], "x": None},
+    ]
+
+
+@pytest.mark.parametrize("sql_projection", [False, True])
+def test_local_tag_fields(
+    runner: CliRunner, server: FakeServer, sql_projection: bool, tmp_path: Any
+) -> None:
+    """Test projecting tags from the local mirror onto a subset of fields.
+
+    Args:
+        runner: A Typer CliRunner object.
+        server: A fake linkding server.
+        sql_projection: Whether SQLite should project each tag.
+        tmp_path: A temporary directory.
+    """
+    _invoke(runner, server, tmp_path, "sync")
+    with patch("linkding_cli.helpers.mirror.SQL_PROJECTION", sql_projection):
+        single = _invoke(
+            runner, server, tmp_path, "tags", "get", "2", "--local", "--fields", "name"
+        )
+        streamed = _invoke(
+            runner,
+            server,
+            tmp_path,
+            "--output",
+            "csv",
+            "tags",
+            "all",
+            "--local",
+            "--all",
+            "--fields",
+            "name,id",
+        )
+
+    assert json.loads(single.stdout) == {"name": "rust"}
+    assert streamed.stdout == "name,id\npython,1\nrust,2\n"
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from aiolinkding.errors import RequestError
 from typer.testing import CliRunner
 
 from linkding_cli.cli import APP
@@ -99,3 +101,446 @@ def test_tag_command_api_calls(  # pylint: disable=too-many-positional-arguments
         result = runner.invoke(APP, args)
         mocked_api_call.assert_awaited_with(*api_coro_args, **api_coro_kwargs)
     assert stdout_output in result.stdout
+
+
+def test_tag_get_all_pages(runner: CliRunner) -> None:
+    """Test paging through every tag.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    last_page = {
+        **TAGS_ALL_RESPONSE,
+        "next": None,
+        "results": [{**TAGS_SINGLE_RESPONSE, "id": 2}],
+    }
+    with patch(
+        "aiolinkding.tag.TagManager.async_get_all",
+        AsyncMock(side_effect=[TAGS_ALL_RESPONSE, last_page]),
+    ) as mocked_api_call:
+        result = runner.invoke(APP, ["tags", "all", "--all", "-l", "100"])
+        assert mocked_api_call.await_count == 2
+        mocked_api_call.assert_awaited_with(limit=100, offset=100)
+    assert result.stdout.splitlines() == [
+        json.dumps(TAGS_ALL_RESPONSE["results"][0]),
+        json.dumps(last_page["results"][0]),
+    ]
+
+
+class FakeBookmarkServer:
+    """Define a fake linkding server that filters bookmarks by tag and retags them."""
+
+    def __init__(self, bookmark_count: int) -> None:
+        """Initialize.
+
+        Args:
+            bookmark_count: The number of bookmarks in the library.
+        """
+        self.bookmarks = {
+            bookmark_id: {
+                "id": bookmark_id,
+                "is_archived": bookmark_id % 5 == 0,
+                "shared": bookmark_id % 2 == 0,
+                "tag_names": ["Old", "keep"] if bookmark_id % 3 else ["keep"],
+                "unread": bookmark_id % 2 == 1,
+            }
+            for bookmark_id in range(1, bookmark_count + 1)
+        }
+        self.patches: list[tuple[int, dict[str, Any]]] = []
+
+    async def async_request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Answer an API request.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            kwargs: Additional request kwargs.
+
+        Returns:
+            An API response payload.
+        """
+        if method == "patch":
+            bookmark_id = int(endpoint.split("/")[3])
+            self.patches.append((bookmark_id, kwargs["json"]))
+            self.bookmarks[bookmark_id].update(kwargs["json"])
+            return self.bookmarks[bookmark_id]
+
+        params = kwargs.get("params", {})
+        archived = endpoint.endswith("archived/")
+        query = params.get("q", "")
+        items = [
+            bookmark
+            for bookmark in self.bookmarks.values()
+            if bookmark["is_archived"] == archived
+            and (
+                not query.startswith("#")
+                or query[1:].casefold()
+                in [tag.casefold() for tag in bookmark["tag_names"]]
+            )
+        ]
+        limit = params.get("limit", 100)
+        offset = params.get("offset", 0)
+        next_url = None
+        if offset + limit < len(items):
+            next_url = f"{endpoint}?limit={limit}&offset={offset + limit}"
+        return {
+            "count": len(items),
+            "next": next_url,
+            "previous": None,
+            "results": items[offset : offset + limit],
+        }
+
+
+def test_merge(runner: CliRunner) -> None:
+    """Test merging a tag into another across every page of bookmarks.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    server = FakeBookmarkServer(250)
+    expected_ids = {
+        bookmark_id
+        for bookmark_id, bookmark in server.bookmarks.items()
+        if "Old" in bookmark["tag_names"]
+    }
+    original = {
+        bookmark_id: (bookmark["shared"], bookmark["unread"])
+        for bookmark_id, bookmark in server.bookmarks.items()
+    }
+
+    with patch("aiolinkding.client.Client.async_request", AsyncMock()) as mock_request:
+        mock_request.side_effect = server.async_request
+        result = runner.invoke(
+            APP, ["tags", "merge", "old", "new", "--concurrency", "4"]
+        )
+
+    assert result.exit_code == 0
+    # Merged bookmarks drop out of the query's results as they're updated, which
+    # shifts later pages; every one is still updated (exactly once):
+    assert sorted(bookmark_id for bookmark_id, _ in server.patches) == sorted(
+        expected_ids
+    )
+    assert {json.loads(line)["id"] for line in result.stdout.splitlines()} == (
+        expected_ids
+    )
+    for bookmark_id, payload in server.patches:
+        assert payload == {
+            "tag_names": ["keep", "new"],
+            "shared": original[bookmark_id][0],
+            "unread": original[bookmark_id][1],
+        }
+
+
+@pytest.mark.parametrize(
+    "args,expected_patches",
+    [
+        (
+            ["--add", "keep,extra"],
+            {
+                1: ["Old", "keep", "extra"],
+                2: ["Old", "keep", "extra"],
+                3: ["keep", "extra"],
+                4: ["Old", "keep", "extra"],
+            },
+        ),
+        (["--remove", "OLD", "--add", "Keep"], {1: ["keep"], 2: ["keep"], 4: ["keep"]}),
+    ],
+)
+def test_retag(
+    args: list[str], expected_patches: dict[int, list[str]], runner: CliRunner
+) -> None:
+    """Test adding and removing tags across every matching bookmark.
+
+    Args:
+        args: The arguments to pass to the command.
+        expected_patches: The new tags of each bookmark that should be updated.
+        runner: A Typer CliRunner object.
+    """
+    server = FakeBookmarkServer(5)
+
+    with patch("aiolinkding.client.Client.async_request", AsyncMock()) as mock_request:
+        mock_request.side_effect = server.async_request
+        result = runner.invoke(APP, ["tags", "retag", *args])
+
+    assert result.exit_code == 0
+    # Bookmarks whose tags wouldn't change aren't updated, and archived bookmarks
+    # (ID 5) are left alone:
+    assert {
+        bookmark_id: payload["tag_names"] for bookmark_id, payload in server.patches
+    } == expected_patches
+
+
+def test_retag_errors(caplog: Any, runner: CliRunner) -> None:
+    """Test retag and merge errors.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+    result = runner.invoke(APP, ["tags", "retag", "--query", "example"])
+    assert result.exit_code == 1
+    assert "No tags to add or remove" in caplog.messages
+
+    result = runner.invoke(APP, ["tags", "merge", "example", "example"])
+    assert result.exit_code == 1
+    assert "Can't merge a tag into itself" in caplog.messages
+
+    server = FakeBookmarkServer(3)
+
+    async def async_request(method: str, endpoint: str, **kwargs: Any) -> Any:
+        """Fail to update bookmark 2.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            kwargs: Additional request kwargs.
+
+        Returns:
+            An API response payload.
+
+        Raises:
+            RequestError: Raised when updating bookmark 2.
+        """
+        if method == "patch" and endpoint == "/api/bookmarks/2/":
+            raise RequestError("Server error")
+        return await server.async_request(method, endpoint, **kwargs)
+
+    with patch("aiolinkding.client.Client.async_request", AsyncMock()) as mock_request:
+        mock_request.side_effect = async_request
+        result = runner.invoke(APP, ["tags", "merge", "old", "new"])
+
+    assert result.exit_code == 1
+    assert {"id": 2, "error": "Server error"} in [
+        json.loads(line) for line in result.stdout.splitlines()
+    ]
+    assert "1 of 2 bookmark updates failed" in caplog.messages
+
+
+class FakeTagServer:
+    """Define a fake linkding server that lists, gets, and creates tags."""
+
+    def __init__(self, tag_count: int) -> None:
+        """Initialize.
+
+        Args:
+            tag_count: The number of tags to start with.
+        """
+        self.tags = {
+            tag_id: {"id": tag_id, "name": f"Tag{tag_id}"}
+            for tag_id in range(1, tag_count + 1)
+        }
+        self.requests: list[tuple[str, str, dict[str, Any]]] = []
+
+    async def async_request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Answer an API request.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            kwargs: Additional request kwargs.
+
+        Returns:
+            An API response payload.
+        """
+        params = kwargs.get("params", {})
+        self.requests.append((method, endpoint, params))
+
+        if method == "post":
+            tag_id = max(self.tags) + 1
+            [tag_name] = kwargs["json"].values()
+            self.tags[tag_id] = {"id": tag_id, "name": tag_name}
+            return self.tags[tag_id]
+
+        if endpoint != "/api/tags/":
+            return self.tags[int(endpoint.split("/")[3])]
+
+        items = list(self.tags.values())
+        limit = params.get("limit", 100)
+        offset = params.get("offset", 0)
+        next_url = None
+        if offset + limit < len(items):
+            next_url = f"{endpoint}?limit={limit}&offset={offset + limit}"
+        return {
+            "count": len(items),
+            "next": next_url,
+            "previous": None,
+            "results": items[offset : offset + limit],
+        }
+
+    @property
+    def list_requests(self) -> list[dict[str, Any]]:
+        """Return the parameters of every request to list tags.
+
+        Returns:
+            Query parameters.
+        """
+        return [
+            params
+            for method, endpoint, params in self.requests
+            if method == "get" and endpoint == "/api/tags/"
+        ]
+
+
+def test_get_by_name(runner: CliRunner) -> None:
+    """Test getting tags by name via the persisted tag name index.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    server = FakeTagServer(2500)
+
+    def get_by_name(tag_name: str) -> Any:
+        """Get a tag by name.
+
+        Args:
+            tag_name: The name of a tag.
+
+        Returns:
+            A Click Result object.
+        """
+        server.requests.clear()
+        with patch(
+            "aiolinkding.client.Client.async_request", AsyncMock()
+        ) as mock_request:
+            mock_request.side_effect = server.async_request
+            return runner.invoke(APP, ["tags", "get", "--name", tag_name])
+
+    # The index is built the first time:
+    result = get_by_name("tag1234")
+    assert json.loads(result.stdout) == {"id": 1234, "name": "Tag1234"}
+    assert len(server.list_requests) == 3
+
+    # After that, indexed tags are resolved without listing any tags:
+    result = get_by_name("TAG42")
+    assert json.loads(result.stdout) == {"id": 42, "name": "Tag42"}
+    assert server.requests == [("get", "/api/tags/42/", {})]
+
+    # New tags are pulled incrementally (starting with the last indexed tag):
+    server.tags[2501] = {"id": 2501, "name": "New"}
+    result = get_by_name("new")
+    assert json.loads(result.stdout) == {"id": 2501, "name": "New"}
+    assert server.list_requests == [{"limit": 1000, "offset": 2499}]
+
+    # Deleted tags shift the last indexed tag, so the index is rebuilt:
+    del server.tags[1]
+    server.tags[2502] = {"id": 2502, "name": "Newer"}
+    server.tags[2503] = {"id": 2503, "name": "Newest"}
+    result = get_by_name("newest")
+    assert json.loads(result.stdout) == {"id": 2503, "name": "Newest"}
+    assert len(server.list_requests) == 1 + 3
+
+    result = get_by_name("Tag1")
+    assert result.exit_code == 1
+
+
+def test_get_by_name_errors(caplog: Any, runner: CliRunner) -> None:
+    """Test errors when getting a tag by name.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+    """
+    result = runner.invoke(APP, ["tags", "get"])
+    assert result.exit_code == 1
+    assert "Provide either a tag ID or a --name" in caplog.messages
+
+    result = runner.invoke(APP, ["tags", "get", "1", "--name", "example"])
+    assert result.exit_code == 1
+
+    result = runner.invoke(APP, ["tags", "get", "--name", "example", "--local"])
+    assert result.exit_code == 1
+    assert "There's no local mirror yet; run `linkding sync` first" in caplog.messages
+
+    server = FakeTagServer(3)
+    with patch("aiolinkding.client.Client.async_request", AsyncMock()) as mock_request:
+        mock_request.side_effect = server.async_request
+        result = runner.invoke(APP, ["tags", "get", "--name", "example"])
+    assert result.exit_code == 1
+    assert "There is no tag named example" in caplog.messages
+
+
+def test_create_many(runner: CliRunner, tmp_path: Path) -> None:
+    """Test creating many tags, skipping the ones that already exist.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    server = FakeTagServer(3)
+
+    with patch("aiolinkding.client.Client.async_request", AsyncMock()) as mock_request:
+        mock_request.side_effect = server.async_request
+        result = runner.invoke(
+            APP,
+            [
+                "--data-dir",
+                str(tmp_path),
+                "tags",
+                "create",
+                "tag2",
+                "New",
+                "TAG3",
+                "new",
+                "Newer",
+            ],
+        )
+        assert result.exit_code == 0
+        assert sorted(
+            (json.loads(line) for line in result.stdout.splitlines()),
+            key=lambda record: record["id"],
+        ) == [
+            {"id": 2, "name": "Tag2", "status": "exists"},
+            {"id": 3, "name": "Tag3", "status": "exists"},
+            {"id": 4, "name": "New", "status": "created"},
+            {"id": 5, "name": "Newer", "status": "created"},
+        ]
+        # Without a local mirror, creating tags doesn't create one:
+        assert not list(tmp_path.iterdir())
+
+        # Once there's a mirror, created tags are added to its index:
+        runner.invoke(
+            APP, ["--data-dir", str(tmp_path), "tags", "get", "--name", "new"]
+        )
+        result = runner.invoke(
+            APP, ["--data-dir", str(tmp_path), "tags", "create", "Newest"]
+        )
+        assert result.exit_code == 0
+        result = runner.invoke(
+            APP,
+            ["--data-dir", str(tmp_path), "tags", "get", "--name", "newest", "--local"],
+        )
+        assert json.loads(result.stdout) == {"id": 6, "name": "Newest"}
+        server.requests.clear()
+        result = runner.invoke(
+            APP, ["--data-dir", str(tmp_path), "tags", "create", "tag1", "newest"]
+        )
+        assert result.exit_code == 0
+        assert server.requests == [("get", "/api/tags/", {"limit": 1000, "offset": 5})]
+
+
+def test_tag_index_out_of_order(runner: CliRunner) -> None:
+    """Test that the tag name index is rebuilt if tags aren't listed by ascending ID.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    server = FakeTagServer(3)
+
+    with patch("aiolinkding.client.Client.async_request", AsyncMock()) as mock_request:
+        mock_request.side_effect = server.async_request
+        runner.invoke(APP, ["tags", "get", "--name", "tag1"])
+
+        # New tags are listed, but not in ascending ID order:
+        server.tags[5] = {"id": 5, "name": "Newer"}
+        server.tags[4] = {"id": 4, "name": "New"}
+        server.requests.clear()
+        result = runner.invoke(APP, ["tags", "get", "--name", "new"])
+        assert json.loads(result.stdout) == {"id": 4, "name": "New"}
+        assert server.list_requests == [
+            {"limit": 1000, "offset": 2},
+            {"limit": 1000},
+        ]
@@ -0,0 +1,95 @@
+"""Define tests for tracing API requests."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from aiolinkding.errors import RequestError
+from typer.testing import CliRunner
+
+from benchmarks.stub_server import StubServer
+from linkding_cli.cli import APP
+from linkding_cli.helpers.tracing import SPAN_PHASES
+
+
+def test_trace(runner: CliRunner, tmp_path: Path) -> None:
+    """Test tracing requests to a (stub) linkding server.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    spans_path = tmp_path / "spans.jsonl"
+    with StubServer(bookmark_count=250).serve_in_thread() as server:
+        result = runner.invoke(
+            APP,
+            [
+                "--url",
+                server.url,
+                "--data-dir",
+                str(tmp_path),
+                "--trace-file",
+                str(spans_path),
+                "bookmarks",
+                "all",
+                "--all",
+                "--parallel",
+                "1",
+            ],
+        )
+    assert result.exit_code == 0
+    assert "Trace: 3 requests (200: 3)" in result.output
+    assert "phase          p50       p95       p99       max" in result.output
+
+    spans = [json.loads(line) for line in spans_path.read_text().splitlines()]
+    assert [span["path"] for span in spans] == ["/api/bookmarks/"] * 3
+    assert all(span["status"] == 200 and span["bytes"] > 0 for span in spans)
+    for span in spans:
+        phases_ms = span["ttfb_ms"] + span["body_ms"] + span["decode_ms"]
+        # Durations are rounded to the microsecond:
+        assert phases_ms <= span["total_ms"] + 0.01
+    # Only the first request opens a connection; the rest (one at a time) reuse it:
+    assert spans[0]["connect_ms"] is not None
+    assert all(span["connect_ms"] is None for span in spans[1:])
+    assert {f"{phase}_ms" for phase in SPAN_PHASES} < set(spans[0])
+
+
+def test_trace_errors(caplog: Any, runner: CliRunner, tmp_path: Path) -> None:
+    """Test that failed requests are traced.
+
+    Args:
+        caplog: A mock logging utility.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    spans_path = tmp_path / "spans.jsonl"
+    with patch(
+        "aiolinkding.client.Client.async_request",
+        AsyncMock(side_effect=RequestError("Error 500")),
+    ):
+        result = runner.invoke(
+            APP, ["--trace-file", str(spans_path), "user", "profile"]
+        )
+    assert result.exit_code == 1
+    assert "Error 500" in caplog.messages
+    assert "Trace: 1 requests (error: 1)" in result.output
+
+    [span] = [json.loads(line) for line in spans_path.read_text().splitlines()]
+    assert span["error"] == "Error 500"
+    assert span["status"] is None
+    assert span["ttfb_ms"] is None
+
+
+def test_trace_disabled(runner: CliRunner) -> None:
+    """Test that requests aren't traced by default.
+
+    Args:
+        runner: A Typer CliRunner object.
+    """
+    with patch("aiolinkding.client.Client.async_request", AsyncMock(return_value={})):
+        result = runner.invoke(APP, ["user", "profile"])
+    assert result.exit_code == 0
+    assert "Trace:" not in result.output
@@ -0,0 +1,178 @@
+"""Define tests for tuning the HTTP transport."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiohttp import ClientSession
+from typer.testing import CliRunner
+
+from linkding_cli.cli import APP
+
+
+def _write_config(tmp_path: Path, transport: Any) -> str:
+    """Write a config file with a transport section.
+
+    Args:
+        tmp_path: A temporary directory.
+        transport: The contents of the transport section.
+
+    Returns:
+        The path to the config file.
+    """
+    config_filepath = tmp_path / "config.json"
+    config_filepath.write_text(
+        json.dumps(
+            {
+                "url": "http://127.0.0.1:8000",
+                "token": "abcde_1234",
+                "transport": transport,
+            }
+        ),
+        encoding="utf-8",
+    )
+    return str(config_filepath)
+
+
+@pytest.mark.parametrize(
+    "transport,expected_connector,expected_timeout,expected_headers",
+    [
+        (
+            {},
+            {"limit": 100, "limit_per_host": 0, "use_dns_cache": True},
+            {"total": 10, "sock_connect": None, "sock_read": None},
+            None,
+        ),
+        (
+            {
+                "compression": False,
+                "connect_timeout": 2,
+                "dns_cache_ttl": 0,
+                "keepalive_timeout": 60,
+                "limit": "8",
+                "limit_per_host": 4,
+                "read_timeout": 5.5,
+                "timeout": 0,
+            },
+            {"limit": 8, "limit_per_host": 4, "use_dns_cache": False},
+            {"total": None, "sock_connect": 2, "sock_read": 5.5},
+            {"Accept-Encoding": "identity"},
+        ),
+    ],
+)
+def test_transport_options(  # pylint: disable=too-many-positional-arguments
+    expected_connector: dict[str, Any],
+    expected_headers: dict[str, str] | None,
+    expected_timeout: dict[str, Any],
+    runner: CliRunner,
+    tmp_path: Path,
+    transport: dict[str, Any],
+) -> None:
+    """Test that transport options configure the HTTP session.
+
+    Args:
+        expected_connector: The expected connector attributes.
+        expected_headers: The expected default headers of the session.
+        expected_timeout: The expected timeout attributes.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+        transport: The contents of the transport section.
+    """
+    with (
+        patch("aiolinkding.client.Client.async_request", AsyncMock(return_value={})),
+        patch(
+            "linkding_cli.client.ClientSession", Mock(wraps=ClientSession)
+        ) as mock_session,
+    ):
+        result = runner.invoke(
+            APP,
+            ["--config", _write_config(tmp_path, transport), "user", "profile"],
+        )
+    assert result.exit_code == 0
+
+    kwargs = mock_session.call_args.kwargs
+    connector = kwargs["connector"]
+    for attr, value in expected_connector.items():
+        assert getattr(connector, attr) == value
+    for attr, value in expected_timeout.items():
+        assert getattr(kwargs["timeout"], attr) == value
+    assert kwargs["headers"] == expected_headers
+
+
+@pytest.mark.parametrize(
+    "transport,expected_message",
+    [
+        ([1, 2], "Invalid transport: [1, 2]"),
+        ({"pool_size": 8}, "Unknown transport option: pool_size"),
+        ({"limit": -1}, "Invalid transport option limit: -1"),
+        ({"limit": None}, "Invalid transport option limit: None"),
+        ({"timeout": "soon"}, "Invalid transport option timeout: soon"),
+        ({"compression": "yes"}, "Invalid transport option compression: yes"),
+    ],
+)
+def test_transport_options_invalid(
+    caplog: Any,
+    expected_message: str,
+    runner: CliRunner,
+    tmp_path: Path,
+    transport: Any,
+) -> None:
+    """Test invalid transport options.
+
+    Args:
+        caplog: A mock logging utility.
+        expected_message: The expected error message.
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+        transport: The contents of the transport section.
+    """
+    result = runner.invoke(
+        APP, ["--config", _write_config(tmp_path, transport), "user", "profile"]
+    )
+    assert result.exit_code == 1
+    assert expected_message in caplog.messages
+
+
+def test_one_session_per_command(runner: CliRunner, tmp_path: Path) -> None:
+    """Test that a command making requests in several steps uses one session.
+
+    Args:
+        runner: A Typer CliRunner object.
+        tmp_path: A temporary directory.
+    """
+    bookmarks = {
+        "count": 2,
+        "next": None,
+        "previous": None,
+        "results": [
+            {"id": 1, "url": "https://example.com/"},
+            {"id": 2, "url": "https://example.com"},
+        ],
+    }
+    with (
+        patch(
+            "aiolinkding.client.Client.async_request",
+            AsyncMock(side_effect=[bookmarks, None]),
+        ) as mock_request,
+        patch(
+            "linkding_cli.client.ClientSession", Mock(wraps=ClientSession)
+        ) as mock_session,
+    ):
+        result = runner.invoke(
+            APP,
+            [
+                "--config",
+                _write_config(tmp_path, {}),
+                "bookmarks",
+                "dedupe",
+                "--action",
+                "delete",
+            ],
+        )
+    assert result.exit_code == 0
+    assert mock_request.await_count == 2
+    mock_session.assert_called_once()